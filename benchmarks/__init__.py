@@ -0,0 +1,19 @@
+"""Micro-benchmarks for cStrafe UI.
+
+Run a benchmark from the project root, e.g.::
+
+    python -m benchmarks.bench_key_dispatch
+
+``python -m benchmarks.suite`` runs the whole classifier suite, saves it as
+JSON (``--out``) and checks a run against a saved baseline (``--compare``).
+``python -m benchmarks.bench_pipeline`` measures the whole live pipeline
+headless, with pynput and the overlay replaced by the fakes in ``tests/``.
+"""
+
+import sys
+from pathlib import Path
+
+# Same src-layout bootstrap as tests/conftest.py.
+SRC = Path(__file__).resolve().parents[1] / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
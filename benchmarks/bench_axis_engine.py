@@ -0,0 +1,78 @@
+"""
+Throughput of the table-driven AxisEngine against the pre-engine AxisState
+implementations (tests/legacy_axis_state.py) on the same event stream.
+
+Usage::
+
+    python -m benchmarks.bench_axis_engine [--events N] [--seed S]
+
+Legacy axes are driven by key name; engine axes through the integer
+``press``/``release`` entry points the classifiers use.
+"""
+
+import argparse
+import time
+
+import benchmarks  # noqa: F401  (puts src/ on sys.path)
+import synthetic
+from classifier.cs2KitchenClassifier import AxisState as CS2KitchenAxisState
+from classifier.events import EVENT_PRESS, EVENT_RELEASE, EVENT_SHOT
+from classifier.ppClassifier import AxisState as PPAxisState
+from tests.legacy_axis_state import LegacyCS2KitchenAxisState, LegacyPPAxisState
+
+KEYS = ("A", "D")
+OP_PRESS, OP_RELEASE, OP_SHOT = EVENT_PRESS, EVENT_RELEASE, EVENT_SHOT
+
+
+def make_stream(events: int, seed: int) -> list[tuple[int, int, int]]:
+    """A horizontal-only ``synthetic`` session as (op, side, t)."""
+    model = synthetic.DEFAULT_MODEL._replace(vertical=0.0, shift=0.0, ctrl=0.0)
+    return [(kind, key & 1, t) for kind, key, t in synthetic.generate(events, seed, model)]
+
+
+def run_legacy(ax, stream) -> float:
+    press, release, shot = ax.on_press, ax.on_release, ax.classify_shot
+    start = time.perf_counter()
+    for op, side, t in stream:
+        if op == OP_PRESS:
+            press(KEYS[side], t)
+        elif op == OP_RELEASE:
+            release(KEYS[side], t)
+        else:
+            shot(t)
+    return time.perf_counter() - start
+
+
+def run_engine(ax, stream) -> float:
+    press, release, shot = ax.press, ax.release, ax.classify_shot
+    start = time.perf_counter()
+    for op, side, t in stream:
+        if op == OP_PRESS:
+            press(side, t)
+        elif op == OP_RELEASE:
+            release(side, t)
+        else:
+            shot(t)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="AxisEngine throughput benchmark")
+    parser.add_argument("--events", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    stream = make_stream(args.events, args.seed)
+    for name, legacy_cls, engine_cls in (
+        ("cs2kitchen", LegacyCS2KitchenAxisState, CS2KitchenAxisState),
+        ("pp", LegacyPPAxisState, PPAxisState),
+    ):
+        legacy = min(run_legacy(legacy_cls(KEYS), stream) for _ in range(3))
+        engine = min(run_engine(engine_cls(KEYS), stream) for _ in range(3))
+        print(
+            f"{name:<10} legacy {args.events / legacy / 1e6:6.2f} M events/s   "
+            f"engine {args.events / engine / 1e6:6.2f} M events/s   ({legacy / engine:.2f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
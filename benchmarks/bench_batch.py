@@ -0,0 +1,74 @@
+"""
+Throughput of the NumPy batch classifiers against the per-event path
+(``on_press`` / ``on_release`` / ``classify_shot`` followed by the shot
+filter) on the same recorded session.
+
+Usage::
+
+    python -m benchmarks.bench_batch [--events N] [--seed S]
+"""
+
+import argparse
+import time
+
+import benchmarks  # noqa: F401  (puts src/ on sys.path)
+from benchmarks.bench_feed import make_stream
+from classifier import (
+    CS2KitchenMovementClassifier,
+    CS2KitchenShotFilter,
+    PPMovementClassifier,
+)
+from classifier.batch import classify_cs2kitchen, classify_pp, unpack_events
+from classifier.events import EVENT_PRESS, EVENT_RELEASE, pack_events
+
+
+def run_per_event(mc, sf, stream) -> float:
+    press, release, classify = mc.on_press, mc.on_release, mc.classify_shot
+    if sf is None:
+        shot = classify
+    else:
+        apply = sf.apply
+
+        def shot(t):
+            return apply(classify(t))
+
+    start = time.perf_counter()
+    for kind, key, t in stream:
+        if kind == EVENT_PRESS:
+            press(key, t)
+        elif kind == EVENT_RELEASE:
+            release(key, t)
+        else:
+            shot(t)
+    return time.perf_counter() - start
+
+
+def run_batch(classify, columns) -> float:
+    start = time.perf_counter()
+    classify(*columns)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Batch classifier throughput benchmark")
+    parser.add_argument("--events", type=int, default=10_000_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    stream = make_stream(args.events, args.seed)
+    columns = unpack_events(pack_events(stream))
+    pairs = (
+        ("cs2kitchen", CS2KitchenMovementClassifier, CS2KitchenShotFilter, classify_cs2kitchen),
+        # ppClassifier applies its own ShotFilter inside classify_shot.
+        ("pp", PPMovementClassifier, None, classify_pp),
+    )
+    for name, mc_cls, sf_cls, classify in pairs:
+        per_event = run_per_event(mc_cls(), sf_cls and sf_cls(), stream)
+        batch = min(run_batch(classify, columns) for _ in range(3))
+        print(
+            f"{name:<10} per-event {args.events / per_event / 1e6:6.2f} M events/s   "
+            f"batch {args.events / batch / 1e6:6.2f} M events/s   ({per_event / batch:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Throughput of MovementClassifier.feed against per-event calls on the same
+packed event stream (a ``synthetic`` mixed session).
+
+Usage::
+
+    python -m benchmarks.bench_feed [--events N] [--seed S]
+"""
+
+import argparse
+import time
+
+import benchmarks  # noqa: F401  (puts src/ on sys.path)
+import synthetic
+from classifier import CS2KitchenMovementClassifier, PPMovementClassifier
+from classifier.events import EVENT_PRESS, EVENT_RELEASE, pack_events
+
+
+def make_stream(events: int, seed: int) -> list[tuple[int, int, int]]:
+    return list(synthetic.generate(events, seed))
+
+
+def run_per_event(mc, stream) -> float:
+    press, release, shot = mc.on_press, mc.on_release, mc.classify_shot
+    start = time.perf_counter()
+    for kind, key, t in stream:
+        if kind == EVENT_PRESS:
+            press(key, t)
+        elif kind == EVENT_RELEASE:
+            release(key, t)
+        else:
+            shot(t)
+    return time.perf_counter() - start
+
+
+def run_feed(mc, buf) -> float:
+    start = time.perf_counter()
+    mc.feed(buf)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Batched feed throughput benchmark")
+    parser.add_argument("--events", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    stream = make_stream(args.events, args.seed)
+    buf = pack_events(stream)
+    for name, cls in (("cs2kitchen", CS2KitchenMovementClassifier), ("pp", PPMovementClassifier)):
+        per_event = min(run_per_event(cls(), stream) for _ in range(3))
+        fed = min(run_feed(cls(), buf) for _ in range(3))
+        print(
+            f"{name:<10} per-event {args.events / per_event / 1e6:6.2f} M events/s   "
+            f"feed {args.events / fed / 1e6:6.2f} M events/s   ({per_event / fed:.2f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
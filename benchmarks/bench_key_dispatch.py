@@ -0,0 +1,109 @@
+"""
+Per-event cost of resolving a pynput key: precomputed dispatch table vs the
+original try/except + tuple-membership chain from InputListener.
+
+Usage::
+
+    python -m benchmarks.bench_key_dispatch [--events N]
+
+pynput needs a display on Linux; on a headless box run with
+``PYNPUT_BACKEND=dummy`` (special keys then alias each other, which only
+affects which branch the legacy path takes, not the lookup cost).
+"""
+
+import argparse
+import timeit
+from typing import Optional
+
+from pynput import keyboard
+
+import benchmarks  # noqa: F401  (puts src/ on sys.path)
+from input_backends import ACTION_IGNORE
+from input_backends.pynput_backend import build_dispatch_table
+
+MOVEMENT_KEYS = ("W", "S", "A", "D")
+_SHIFTS = (keyboard.Key.shift, keyboard.Key.shift_l, keyboard.Key.shift_r)
+_CTRLS = (keyboard.Key.ctrl, keyboard.Key.ctrl_l, keyboard.Key.ctrl_r)
+_MOVEMENT_SET = frozenset(MOVEMENT_KEYS)
+
+
+def legacy_resolve(key) -> Optional[str]:
+    """The pre-table InputListener._on_key_press classification, minus side effects."""
+    if key == keyboard.Key.f6 or key == keyboard.Key.f8:
+        return None
+    try:
+        char_key = key.char
+    except AttributeError:
+        char_key = None
+    if char_key == "=" or char_key == "-":
+        return None
+    try:
+        char = key.char
+    except AttributeError:
+        char = None
+    if char is None:
+        try:
+            vk = key.vk
+            if vk is not None and 65 <= vk <= 90:
+                char = chr(vk)
+        except AttributeError:
+            pass
+    if key in _SHIFTS:
+        return "SHIFT"
+    if key in _CTRLS:
+        return "CTRL"
+    if char:
+        upper_char = char.upper()
+        if upper_char in _MOVEMENT_SET:
+            return upper_char
+    return None
+
+
+def make_table_resolve():
+    table = build_dispatch_table(MOVEMENT_KEYS)
+    key_cls = keyboard.Key
+    get = table.get
+
+    def table_resolve(key) -> int:
+        return get(key if key.__class__ is key_cls else (key.char or key.vk), ACTION_IGNORE)
+
+    return table_resolve
+
+
+def workload() -> list:
+    """Autorepeat-heavy mix: mostly movement letters, some modifiers and noise."""
+    kc = keyboard.KeyCode
+    return (
+        [kc.from_char("a"), kc.from_char("d"), kc.from_char("w"), kc.from_char("s")] * 4
+        + [kc.from_vk(65), kc.from_vk(68)]          # char-less Windows quirk
+        + [keyboard.Key.shift, keyboard.Key.ctrl_l]
+        + [kc.from_char("x"), keyboard.Key.space]
+    )
+
+
+def bench(resolve, events: list, total: int) -> float:
+    """Return mean nanoseconds per event over ``total`` events."""
+    rounds = max(1, total // len(events))
+
+    def run() -> None:
+        for key in events:
+            resolve(key)
+
+    best = min(timeit.repeat(run, number=rounds, repeat=5))
+    return best / (rounds * len(events)) * 1e9
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--events", type=int, default=200_000)
+    args = parser.parse_args()
+    events = workload()
+    legacy_ns = bench(legacy_resolve, events, args.events)
+    table_ns = bench(make_table_resolve(), events, args.events)
+    print(f"legacy chain   : {legacy_ns:8.1f} ns/event")
+    print(f"dispatch table : {table_ns:8.1f} ns/event")
+    print(f"speed-up       : {legacy_ns / table_ns:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Redraw cost of each overlay renderer: the widget tree (``widgets``) against
+the single canvas (``canvas``).
+
+Each frame applies one representative FrameUpdate -- a key bar toggle, the
+shot flash and a new result -- and then lets Tk lay out and draw it with
+``update_idletasks``.  Needs a display.
+
+Usage::
+
+    python -m benchmarks.bench_overlay [--frames N] [--renderer NAME]
+"""
+
+import argparse
+import time
+
+import benchmarks  # noqa: F401  (puts src/ on sys.path)
+from overlay import OVERLAYS
+from render_state import FrameUpdate
+
+_RESULTS = (
+    ("Classification: Counter-strafe\nCS time: 12 ms\nShot delay: 85 ms", "#228b22"),
+    ("Classification: Overlap\nOverlap: 24 ms", "#ff8c00"),
+    ("Classification: Bad\nCS time: 140 ms\nShot delay: 310 ms", "#cc0000"),
+)
+
+
+def make_updates(count: int) -> list[FrameUpdate]:
+    return [
+        FrameUpdate(
+            left_held=i % 2 == 0,
+            right_held=i % 3 == 0,
+            flash=i % 2 == 1,
+            result=_RESULTS[i % len(_RESULTS)],
+        )
+        for i in range(count)
+    ]
+
+
+def run(renderer: str, updates: list[FrameUpdate]) -> float:
+    overlay = OVERLAYS[renderer]()
+    root = overlay.root
+    try:
+        root.update()
+        start = time.perf_counter()
+        for update in updates:
+            overlay._apply(update)
+            root.update_idletasks()
+        return time.perf_counter() - start
+    finally:
+        root.destroy()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Overlay renderer redraw benchmark")
+    parser.add_argument("--frames", type=int, default=5_000)
+    parser.add_argument("--renderer", choices=list(OVERLAYS), action="append")
+    args = parser.parse_args()
+    updates = make_updates(args.frames)
+    for renderer in args.renderer or list(OVERLAYS):
+        elapsed = min(run(renderer, updates) for _ in range(3))
+        print(
+            f"{renderer:<8} {elapsed / args.frames * 1e6:8.1f} us/frame   "
+            f"{args.frames / elapsed:8.0f} frames/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
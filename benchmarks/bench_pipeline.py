@@ -0,0 +1,205 @@
+"""
+End-to-end input latency of the live pipeline, headless: hook callback ->
+classifier -> render tick, driven through the real InputListener.
+
+pynput is replaced by the fake package in ``tests/fake_pynput``, whose
+listener threads call the pynput backend's hooks on a fixed schedule (a
+``synthetic`` session, one hook call every ``1 / --rate`` s).  ``--backend
+trace`` delivers the same session through the trace backend instead, and
+``--backend evdev`` writes it as kernel-stamped ``input_event`` records to a
+FIFO the evdev backend reads.  The overlay is the Tk-free
+``tests/headless_overlay.py`` by default; ``--overlay widgets|canvas`` uses
+a real renderer and needs a display (e.g. ``xvfb-run``).
+
+Usage::
+
+    python -m benchmarks.bench_pipeline [--events N] [--rate HZ ...] [--backend NAME] [--overlay NAME]
+
+Per classifier and rate it reports the rate actually achieved, hook ->
+classified and hook -> rendered percentiles over the shots, and process
+CPU time per injected event (including the injecting threads).
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Callable
+
+import benchmarks  # noqa: F401  (puts src/ on sys.path)
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path[:0] = [str(ROOT / "tests" / "fake_pynput"), str(ROOT / "tests")]
+
+import synthetic  # noqa: E402
+from classifier import CLASSIFIERS  # noqa: E402
+from classifier.events import EVENT_PRESS, EVENT_RELEASE, EVENT_SHOT  # noqa: E402
+from classifier.key_codes import KEY_CTRL, KEY_SHIFT  # noqa: E402
+from clock import NS_PER_MS, PerfCounterClock  # noqa: E402
+from headless_overlay import HeadlessOverlay  # noqa: E402
+from input_backends import BACKENDS, InputBackend  # noqa: E402
+from input_backends import evdev_backend  # noqa: E402
+from input_backends.evdev_backend import EvdevBackend  # noqa: E402
+from input_backends.pynput_backend import PynputBackend  # noqa: E402
+from input_backends.trace_backend import TraceBackend  # noqa: E402
+from input_events import InputListener  # noqa: E402
+from latency import LatencyHistogram, LatencyTracker  # noqa: E402
+from overlay import OVERLAYS  # noqa: E402
+from pynput import _fake, keyboard, mouse  # noqa: E402
+from replay import Trace  # noqa: E402
+
+MOVEMENT_KEYS = synthetic.LAYOUTS["wasd"]
+RATES = (1_000, 4_000, 8_000)
+PERCENTILES = (50.0, 99.0, 99.9)
+
+# pynput key object per classifier key code.
+_HOOK_KEYS = {code: keyboard.KeyCode.from_char(name.lower()) for code, name in enumerate(MOVEMENT_KEYS)}
+_HOOK_KEYS[KEY_SHIFT] = keyboard.Key.shift
+_HOOK_KEYS[KEY_CTRL] = keyboard.Key.ctrl_l
+_CALLBACKS = {EVENT_PRESS: "on_press", EVENT_RELEASE: "on_release"}
+_CLICK = ("on_click", (0, 0, mouse.Button.left, True))
+
+
+class _ClassifyTracker(LatencyTracker):
+    """LatencyTracker that also records hook -> classified per shot."""
+
+    def __init__(self, now_ns) -> None:
+        super().__init__(now_ns)
+        self.hook_to_classify = LatencyHistogram()
+
+    def record_shot(self, event_ns: int, start_ns: int, classified_ns: int, filtered_ns: int) -> None:
+        self.hook_to_classify.record(classified_ns - event_ns)
+        super().record_shot(event_ns, start_ns, classified_ns, filtered_ns)
+
+
+def hook_calls(events: list[tuple[int, int, int]]) -> list[tuple[str, tuple]]:
+    """Events as fake-pynput hook calls."""
+    return [(_CALLBACKS[kind], (_HOOK_KEYS[key],)) if kind in _CALLBACKS else _CLICK for kind, key, _ in events]
+
+
+def make_overlay(name: str, latency: LatencyTracker):
+    if name == "stub":
+        return HeadlessOverlay(latency=latency)
+    return OVERLAYS[name](latency=latency)
+
+
+def make_backend(name: str, events: list[tuple[int, int, int]], rate: float) -> tuple[InputBackend, Callable[[], None]]:
+    """The backend and a function that injects the events and waits until all are delivered."""
+    if name == "trace":
+        period_ns = NS_PER_MS * 1000 / rate
+        trace = Trace([(kind, key, int(i * period_ns)) for i, (kind, key, _) in enumerate(events)], NS_PER_MS)
+        backend = TraceBackend(trace)
+        return backend, backend.finished.wait
+    if name == "evdev":
+        return _evdev_backend(events, rate)
+    calls = hook_calls(events)
+
+    def play() -> None:
+        _fake.inject(calls, rate)
+        _fake.drained()
+
+    return PynputBackend(MOVEMENT_KEYS), play
+
+
+def _evdev_backend(events: list[tuple[int, int, int]], rate: float) -> tuple[InputBackend, Callable[[], None]]:
+    """An EvdevBackend reading a FIFO that a writer fills with kernel-stamped records at ``rate``."""
+    fifo = os.path.join(tempfile.mkdtemp(prefix="cstrafe-evdev-"), "event0")
+    os.mkfifo(fifo)
+    table = evdev_backend.build_code_table(MOVEMENT_KEYS)
+    codes = {action: code for code, action in reversed(list(enumerate(table)))}
+    backend = EvdevBackend(MOVEMENT_KEYS, [fifo])
+    pack = evdev_backend.INPUT_EVENT.pack
+
+    def play() -> None:
+        period_ns = 1e9 / rate
+        start = time.clock_gettime_ns(time.CLOCK_MONOTONIC)
+        with open(fifo, "wb", buffering=0) as device:
+            for i, (kind, key, _) in enumerate(events):
+                due = start + int((i + 1) * period_ns)
+                wait = due - time.clock_gettime_ns(time.CLOCK_MONOTONIC)
+                if wait > 0:
+                    time.sleep(wait / 1e9)
+                # The "kernel" stamps the record when it is written.
+                now = time.clock_gettime_ns(time.CLOCK_MONOTONIC)
+                code = evdev_backend.BTN_LEFT if kind == EVENT_SHOT else codes[key]
+                sec, nsec = divmod(now, 1_000_000_000)
+                device.write(pack(sec, nsec // 1000, evdev_backend.EV_KEY, code, kind != EVENT_RELEASE))
+        backend.finished.wait()
+        os.unlink(fifo)
+        os.rmdir(os.path.dirname(fifo))
+
+    return backend, play
+
+
+def run(classifier: str, overlay_name: str, backend_name: str, events: list, rate: float) -> dict[str, float]:
+    clock = PerfCounterClock()
+    tracker = _ClassifyTracker(clock.now_ns)
+    overlay = make_overlay(overlay_name, tracker)
+    backend, play = make_backend(backend_name, events, rate)
+    mc_cls, sf_cls = CLASSIFIERS[classifier]
+    listener = InputListener(
+        overlay,
+        mc_cls(ticks_per_ms=NS_PER_MS),
+        sf_cls(),
+        MOVEMENT_KEYS,
+        clock=clock,
+        latency=tracker,
+        backend=backend,
+    )
+    cpu = time.process_time()
+    start = time.perf_counter()
+    listener.start()
+    elapsed = 0.0
+
+    def finish() -> None:
+        nonlocal elapsed
+        play()
+        elapsed = time.perf_counter() - start
+        # Let the last result reach a render tick before stopping.
+        time.sleep(3 * overlay._tick_ms / 1000)
+        overlay.terminate()
+
+    threading.Thread(target=finish, daemon=True).start()
+    overlay.run()
+    cpu = time.process_time() - cpu
+    listener.stop()
+    result = {
+        "rate": len(events) / elapsed,
+        "cpu_us": cpu / len(events) * 1e6,
+        "drops": listener.pipeline_stats()["drops"],
+    }
+    for label, hist in (("classify", tracker.hook_to_classify), ("render", tracker.histograms["total"])):
+        for p in PERCENTILES:
+            result[f"{label}_p{p:g}"] = hist.percentile(p) / 1000
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Headless end-to-end pipeline latency benchmark")
+    parser.add_argument("--events", type=int, default=20_000, help="Hook calls per run")
+    parser.add_argument("--rate", type=float, action="append", help=f"Hook calls per second (default: {RATES})")
+    parser.add_argument("--classifier", choices=list(CLASSIFIERS), action="append")
+    parser.add_argument("--overlay", choices=["stub", *OVERLAYS], default="stub")
+    parser.add_argument("--backend", choices=BACKENDS, default="pynput", help="Input backend (default: pynput)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    events = list(synthetic.generate(args.events, args.seed))
+    print("hook->classified and hook->rendered in us")
+    for classifier in args.classifier or list(CLASSIFIERS):
+        for rate in args.rate or RATES:
+            r = run(classifier, args.overlay, args.backend, events, rate)
+            print(
+                f"{classifier:<10} {rate:>6.0f} Hz (got {r['rate']:>6.0f})  "
+                + "  ".join(f"cls p{p:g} {r[f'classify_p{p:g}']:>7.1f}" for p in PERCENTILES)
+                + "  "
+                + "  ".join(f"draw p{p:g} {r[f'render_p{p:g}']:>7.1f}" for p in PERCENTILES)
+                + f"  cpu {r['cpu_us']:5.1f} us/event  drops {r['drops']}",
+                flush=True,
+            )
+
+
+if __name__ == "__main__":
+    main()
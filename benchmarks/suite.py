@@ -0,0 +1,242 @@
+"""
+Classifier benchmark suite: throughput and per-call latency of every hot
+entry point on canonical synthetic workloads, saved as JSON and comparable
+against a saved baseline.
+
+Usage::
+
+    python -m benchmarks.suite [--events N] [--seed S] [--out FILE]
+    python -m benchmarks.suite --compare BASELINE.json [--threshold PCT]
+
+Targets (``<target>/<classifier>/<workload>``):
+
+    axis          AxisState.press / release / classify_shot (horizontal axis)
+    movement      MovementClassifier.on_press / on_release / classify_shot
+    movement+dbg  the same with a DebugLogger attached (records discarded)
+    filter        ShotFilter.apply on the workload's unfiltered results
+
+Workloads are the ``synthetic.SCENARIOS`` sessions: ``clean``
+counter-strafes, ``overlap`` (both directions held at the shot), ``adad``
+tap spam with occasional shots, ``idle`` shots without movement, and
+``mixed`` play.  Every workload is seeded, so two runs see identical events.
+
+Each benchmark makes one untimed pass per call (throughput, best of
+``--repeat``) and one pass timing every call with ``perf_counter_ns``
+(latency percentiles, clock overhead subtracted).  ``--compare`` reruns the
+suite and flags any benchmark whose throughput dropped or whose p99 rose by
+more than ``--threshold`` percent; the exit status is 1 if any did.
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+from typing import Any, Callable, Iterable, Optional
+
+import benchmarks  # noqa: F401  (puts src/ on sys.path)
+import synthetic
+from classifier import CLASSIFIERS, DebugLogger
+from classifier.cs2KitchenClassifier import AxisState as CS2KitchenAxisState
+from classifier.events import EVENT_PRESS, EVENT_RELEASE, EVENT_SHOT
+from classifier.key_codes import KEY_LEFT, KEY_RIGHT
+from classifier.labels import ShotLabel
+from classifier.ppClassifier import AxisState as PPAxisState
+from latency import LatencyHistogram
+
+Event = tuple[int, int, int]
+
+AXIS_STATES = {"cs2kitchen": CS2KitchenAxisState, "pp": PPAxisState}
+PERCENTILES = (50.0, 99.0, 99.9)
+DEFAULT_THRESHOLD = 10.0
+
+
+def make_workload(name: str, events: int, seed: int) -> list[Event]:
+    return list(synthetic.generate(events, f"{name}:{seed}", synthetic.SCENARIOS[name]))
+
+
+# ---------------------------------------------------------------------------
+# Measurement
+# ---------------------------------------------------------------------------
+
+Call = tuple[Callable[..., Any], tuple[Any, ...]]
+
+
+def _clock_overhead_ns() -> int:
+    now = time.perf_counter_ns
+    return min(-now() + now() for _ in range(10_000))
+
+
+def _throughput(calls: list[Call], repeat: int, reset: Callable[[], None]) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        reset()
+        start = time.perf_counter()
+        for fn, args in calls:
+            fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return len(calls) / best
+
+
+def _latency(calls: list[Call], reset: Callable[[], None], overhead: int) -> LatencyHistogram:
+    hist = LatencyHistogram()
+    record = hist.record
+    now = time.perf_counter_ns
+    reset()
+    for fn, args in calls:
+        start = now()
+        fn(*args)
+        record(now() - start - overhead)
+    return hist
+
+
+def measure(calls: list[Call], reset: Callable[[], None], repeat: int, overhead: int) -> dict[str, float]:
+    result: dict[str, float] = {"calls": len(calls), "calls_per_s": _throughput(calls, repeat, reset)}
+    hist = _latency(calls, reset, overhead)
+    for p in PERCENTILES:
+        result[f"p{p:g}_ns"] = hist.percentile(p)
+    result["mean_ns"] = hist.mean()
+    return result
+
+
+# ---------------------------------------------------------------------------
+# Benchmarks: (name, calls, reset) where ``reset`` restores the fresh state
+# ---------------------------------------------------------------------------
+
+def _event_calls(stream: Iterable[Event], press: Callable, release: Callable, shot: Callable, sides: bool) -> list[Call]:
+    calls: list[Call] = []
+    for kind, key, t in stream:
+        if kind == EVENT_SHOT:
+            calls.append((shot, (t,)))
+        else:
+            calls.append((press if kind == EVENT_PRESS else release, (key & 1 if sides else key, t)))
+    return calls
+
+
+def _resetter(obj: Any, fresh: Any) -> Callable[[], None]:
+    state = fresh.snapshot()
+    return lambda: obj.restore(state)
+
+
+def raw_results(mc_cls: type, stream: Iterable[Event]) -> list[Any]:
+    """Unfiltered results of every shot in ``stream``."""
+    mc = mc_cls()
+    results = []
+    for kind, key, t in stream:
+        if kind == EVENT_PRESS:
+            mc.on_press(key, t)
+        elif kind == EVENT_RELEASE:
+            mc.on_release(key, t)
+        else:
+            result = mc.classify_shot(t)
+            # ppClassifier filters inside classify_shot and keeps the raw
+            # result in a scratch object ("Not detected" bypasses both).
+            raw = getattr(mc, "_raw", None)
+            if raw is not None and result.label_id != ShotLabel.NOT_DETECTED:
+                result = type(raw)(ShotLabel.BAD).copy_from(raw)
+            results.append(result)
+    return results
+
+
+def iter_benchmarks(events: int, seed: int) -> Iterable[tuple[str, list[Call], Callable[[], None]]]:
+    streams = {name: make_workload(name, events, seed) for name in synthetic.SCENARIOS}
+    discard = DebugLogger(lambda record: None)
+    for name, (mc_cls, sf_cls) in CLASSIFIERS.items():
+        axis_cls = AXIS_STATES[name]
+        for workload, stream in streams.items():
+            horizontal = [e for e in stream if e[0] == EVENT_SHOT or e[1] in (KEY_LEFT, KEY_RIGHT)]
+            axis = axis_cls(keys=("A", "D"))
+            calls = _event_calls(horizontal, axis.press, axis.release, axis.classify_shot, sides=True)
+            yield f"axis/{name}/{workload}", calls, _resetter(axis, axis_cls(keys=("A", "D")))
+
+            for target, logger in (("movement", None), ("movement+dbg", discard)):
+                mc = mc_cls(debug_logger=logger)
+                calls = _event_calls(stream, mc.on_press, mc.on_release, mc.classify_shot, sides=False)
+                yield f"{target}/{name}/{workload}", calls, _resetter(mc, mc_cls())
+
+            raw = raw_results(mc_cls, stream)
+            out = type(raw[0])(ShotLabel.BAD)
+            shot_filter = sf_cls()
+            yield f"filter/{name}/{workload}", [(shot_filter.apply, (r, out)) for r in raw], lambda: None
+
+
+def run_suite(events: int, seed: int, repeat: int, only: Optional[str] = None) -> dict[str, Any]:
+    overhead = _clock_overhead_ns()
+    results = {}
+    for name, calls, reset in iter_benchmarks(events, seed):
+        if only is not None and only not in name:
+            continue
+        results[name] = measure(calls, reset, repeat, overhead)
+        r = results[name]
+        print(
+            f"{name:<32} {r['calls_per_s'] / 1e6:7.2f} M calls/s   "
+            + "  ".join(f"p{p:g} {r[f'p{p:g}_ns']:>6} ns" for p in PERCENTILES),
+            flush=True,
+        )
+    return {
+        "meta": {
+            "python": sys.version.split()[0],
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "events": events,
+            "seed": seed,
+            "clock_overhead_ns": overhead,
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+
+def compare(baseline: dict[str, Any], current: dict[str, Any], threshold: float) -> list[str]:
+    """Names of benchmarks that regressed by more than ``threshold`` percent."""
+    regressions = []
+    for name, now in current["results"].items():
+        then = baseline["results"].get(name)
+        if then is None:
+            continue
+        speed = (now["calls_per_s"] / then["calls_per_s"] - 1) * 100
+        p99 = (now["p99_ns"] / then["p99_ns"] - 1) * 100 if then["p99_ns"] else 0.0
+        regressed = speed < -threshold or p99 > threshold
+        if regressed:
+            regressions.append(name)
+        print(f"{name:<32} throughput {speed:+7.1f}%   p99 {p99:+7.1f}%{'   REGRESSION' if regressed else ''}")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Classifier benchmark suite")
+    parser.add_argument("--events", type=int, default=200_000, help="Events per workload")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3, help="Throughput passes (best is kept)")
+    parser.add_argument("--only", metavar="SUBSTRING", help="Run only benchmarks whose name contains this")
+    parser.add_argument("--out", metavar="FILE", help="Save results as JSON")
+    parser.add_argument("--compare", metavar="BASELINE", help="Flag regressions against a saved run")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help=f"Regression threshold in percent (default: {DEFAULT_THRESHOLD:g})",
+    )
+    args = parser.parse_args()
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        # Same workloads as the baseline, or the comparison is meaningless.
+        args.events = baseline["meta"]["events"]
+        args.seed = baseline["meta"]["seed"]
+    current = run_suite(args.events, args.seed, args.repeat, args.only)
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(current, f, indent=2)
+    if baseline is not None:
+        print()
+        regressions = compare(baseline, current, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) over {args.threshold:g}%")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,6 +4,7 @@ from .cs2KitchenClassifier.axis_state import AxisState
 from .cs2KitchenClassifier.shot_filter import ShotFilter as CS2KitchenShotFilter
 from .ppClassifier.movement_classifier import MovementClassifier as PPMovementClassifier
 from .ppClassifier.shot_filter import ShotFilter as PPShotFilter
+from .labels import ShotLabel, SubLabel
 from .base import (
     DebugLogger,
     MovementClassifierInterface,
@@ -27,6 +28,8 @@ __all__ = [
     "MovementClassifier",
     "ShotClassification",
     "ShotFilter",
+    "ShotLabel",
+    "SubLabel",
     "CS2KitchenMovementClassifier",
     "CS2KitchenShotFilter",
     "PPMovementClassifier",
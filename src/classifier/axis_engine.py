@@ -0,0 +1,260 @@
+"""Table-driven single-axis state machine shared by every classifier.
+
+The counter-strafe tracking of one axis is a small state machine over
+``phase``:
+
+    IDLE          nothing released since the last shot
+    RELEASED(s)   key ``s`` was released; waiting for the opposite key
+    COUNTERED(s)  key ``s`` was pressed after the opposite key's release
+
+Press and release transitions are looked up in tables indexed by
+``phase << 1 | side``.  Each entry is the next phase, optionally OR-ed with
+``STAMP`` to record the event time (cs_press_time on press, cs_release_time
+on release).  Behaviour that differs between classifiers is declared in an
+``AxisConfig`` and compiled into the tables once per subclass.
+"""
+
+from typing import Dict, FrozenSet, NamedTuple, Optional, Sequence, Tuple, Union
+
+from .base import AxisStateInterface
+from .key_codes import KEY_NONE
+
+PHASE_IDLE = 0
+PHASE_RELEASED_0 = 1
+PHASE_RELEASED_1 = 2
+PHASE_COUNTERED_0 = 3
+PHASE_COUNTERED_1 = 4
+PHASE_COUNT = 5
+
+PHASE_MASK = 0x7
+STAMP = 0x8
+
+# Side of the cs_release / cs_press key implied by each phase.
+RELEASE_SIDE = (KEY_NONE, 0, 1, 1, 0)
+PRESS_SIDE = (KEY_NONE, KEY_NONE, KEY_NONE, 0, 1)
+
+_BOTH_HELD = 0b11
+
+# Length of AxisEngine.snapshot(): phase, held mask, both press times,
+# cs_release_time, cs_press_time, overlap_start_time, micro duration.
+AXIS_SNAPSHOT_SIZE = 8
+
+
+class AxisConfig(NamedTuple):
+    """Per-classifier behaviour switches for AxisEngine."""
+
+    # On a press from rest (nothing held, no counter-press pending), drop a
+    # stale overlap left over from a sequence that was never shot.
+    reset_stale_overlap_on_press: bool = False
+    # Releasing the counter-press key itself keeps the pending counter-strafe
+    # instead of starting a new release cycle.
+    keep_cs_press_on_release: bool = False
+    # Releasing after a long press clears micro_candidate_duration rather
+    # than leaving the previous short-tap value in place.
+    clear_micro_on_long_release: bool = False
+    micro_candidate_threshold_ms: float = 80.0
+
+
+def build_transition_tables(config: AxisConfig) -> Tuple[Tuple[int, ...], Tuple[int, ...]]:
+    """Return (press_table, release_table) for ``config``."""
+    press = []
+    release = []
+    for phase in range(PHASE_COUNT):
+        for side in (0, 1):
+            if phase in (PHASE_RELEASED_0, PHASE_RELEASED_1) and RELEASE_SIDE[phase] != side:
+                press.append((PHASE_COUNTERED_0 + side) | STAMP)
+            else:
+                press.append(phase)
+            if config.keep_cs_press_on_release and PRESS_SIDE[phase] == side:
+                release.append(phase)
+            else:
+                release.append((PHASE_RELEASED_0 + side) | STAMP)
+    return tuple(press), tuple(release)
+
+
+class AxisEngine(AxisStateInterface):
+    """
+    Tracks one movement axis.  Keys are addressed by side (0 or 1, the index
+    into ``keys``); held state is a 2-bit mask and press times live in two
+    fixed slots.  ``on_press``/``on_release`` also accept key names, and
+    ``held_keys``/``press_times``/``cs_*_key`` expose names for callers that
+    predate integer key codes.
+
+    Subclasses set ``CONFIG``; timestamps are integer clock ticks and
+    ``ticks_per_ms`` scales the millisecond threshold.
+    """
+
+    CONFIG = AxisConfig()
+    _TABLES = build_transition_tables(CONFIG)
+
+    __slots__ = (
+        "keys",
+        "_sides",
+        "_micro_threshold",
+        "_press_table",
+        "_release_table",
+        "_reset_stale",
+        "_clear_micro",
+        "_phase",
+        "_held",
+        "_press_times",
+        "cs_release_time",
+        "cs_press_time",
+        "overlap_start_time",
+        "micro_candidate_duration",
+    )
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._TABLES = build_transition_tables(cls.CONFIG)
+
+    def __init__(self, keys: Tuple[str, str], ticks_per_ms: float = 1) -> None:
+        self.keys: Tuple[str, str] = keys
+        self._sides = {keys[0]: 0, keys[1]: 1}
+        config = self.CONFIG
+        self._micro_threshold = config.micro_candidate_threshold_ms * ticks_per_ms
+        # Per-instance copies of the class tables and switches: slot reads
+        # are cheaper than class-attribute lookups on the hot path.
+        self._press_table, self._release_table = self._TABLES
+        self._reset_stale = config.reset_stale_overlap_on_press
+        self._clear_micro = config.clear_micro_on_long_release
+        self._phase: int = PHASE_IDLE
+        self._held: int = 0
+        self._press_times: list[Optional[float]] = [None, None]
+        self.cs_release_time: Optional[float] = None
+        self.cs_press_time: Optional[float] = None
+        self.overlap_start_time: Optional[float] = None
+        self.micro_candidate_duration: Optional[float] = None
+
+    @property
+    def held_keys(self) -> FrozenSet[str]:
+        return frozenset(self.keys[side] for side in (0, 1) if self._held >> side & 1)
+
+    @property
+    def press_times(self) -> Dict[str, float]:
+        return {self.keys[side]: t for side, t in enumerate(self._press_times) if t is not None}
+
+    @property
+    def cs_release_key(self) -> Optional[str]:
+        side = RELEASE_SIDE[self._phase]
+        return None if side == KEY_NONE else self.keys[side]
+
+    @property
+    def cs_press_key(self) -> Optional[str]:
+        side = PRESS_SIDE[self._phase]
+        return None if side == KEY_NONE else self.keys[side]
+
+    def on_press(self, key: Union[int, str], timestamp: float) -> None:
+        side = key if key.__class__ is int else self._sides.get(key, KEY_NONE)
+        if side != KEY_NONE:
+            self.press(side, timestamp)
+
+    def on_release(self, key: Union[int, str], timestamp: float) -> None:
+        side = key if key.__class__ is int else self._sides.get(key, KEY_NONE)
+        if side != KEY_NONE:
+            self.release(side, timestamp)
+
+    def press(self, side: int, timestamp: float) -> None:
+        held = self._held
+        if (
+            not held
+            and self._reset_stale
+            and self.overlap_start_time is not None
+            and self._phase < PHASE_COUNTERED_0
+        ):
+            self._reset()
+        held |= 1 << side
+        self._held = held
+        self._press_times[side] = timestamp
+        if held == _BOTH_HELD and self.overlap_start_time is None:
+            self.overlap_start_time = timestamp
+        entry = self._press_table[self._phase << 1 | side]
+        self._phase = entry & PHASE_MASK
+        if entry & STAMP:
+            self.cs_press_time = timestamp
+        self.micro_candidate_duration = None
+
+    def release(self, side: int, timestamp: float) -> None:
+        press_time = self._press_times[side]
+        if press_time is not None:
+            duration = timestamp - press_time
+            if duration < self._micro_threshold:
+                self.micro_candidate_duration = duration
+            elif self._clear_micro:
+                self.micro_candidate_duration = None
+        self._held &= ~(1 << side)
+        entry = self._release_table[self._phase << 1 | side]
+        self._phase = entry & PHASE_MASK
+        if entry & STAMP:
+            self.cs_release_time = timestamp
+            self.cs_press_time = None
+
+    def classify_shot(self, shot_time: float) -> Tuple[str, Optional[float], Optional[float]]:
+        """
+        Returns a 3-tuple:
+          ("Counter-strafe", cs_time, shot_delay)
+          ("Overlap",        overlap_time, None)
+          ("Bad",            None, reason)
+        Durations are in the same ticks as the timestamps.
+        """
+        cs_press_time = self.cs_press_time
+        cs_release_time = self.cs_release_time
+        if self.overlap_start_time is not None:
+            if not (
+                cs_press_time is not None
+                and cs_release_time is not None
+                and cs_release_time > self.overlap_start_time
+                and cs_press_time > cs_release_time
+            ):
+                overlap_time = shot_time - self.overlap_start_time
+                self._reset()
+                return "Overlap", overlap_time, None
+        if (
+            cs_press_time is not None
+            and cs_release_time is not None
+            and cs_press_time > cs_release_time
+        ):
+            self._reset()
+            return "Counter-strafe", cs_press_time - cs_release_time, shot_time - cs_press_time
+        if self._held:
+            reason = "still moving"
+        elif self._phase != PHASE_IDLE:
+            reason = "no counter-press"
+        else:
+            reason = "no movement"
+        self._reset()
+        return "Bad", None, reason
+
+    def snapshot(self) -> Tuple[Optional[float], ...]:
+        """Mutable state as a flat tuple (see ``AXIS_SNAPSHOT_SIZE``)."""
+        return (
+            self._phase,
+            self._held,
+            self._press_times[0],
+            self._press_times[1],
+            self.cs_release_time,
+            self.cs_press_time,
+            self.overlap_start_time,
+            self.micro_candidate_duration,
+        )
+
+    def restore(self, state: Sequence[Optional[float]]) -> None:
+        """Load state captured by ``snapshot()`` from an axis with the same CONFIG."""
+        (
+            self._phase,
+            self._held,
+            press_0,
+            press_1,
+            self.cs_release_time,
+            self.cs_press_time,
+            self.overlap_start_time,
+            self.micro_candidate_duration,
+        ) = state
+        self._press_times = [press_0, press_1]
+
+    def _reset(self) -> None:
+        self._phase = PHASE_IDLE
+        self.cs_release_time = None
+        self.cs_press_time = None
+        self.overlap_start_time = None
+        self.micro_candidate_duration = None
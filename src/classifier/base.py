@@ -1,14 +1,18 @@
 from abc import ABC, abstractmethod
-from typing import Any, Callable, Optional
+from typing import Any, Callable, List, Optional, Sequence, Tuple, Union
+
+from .events import EVENT_PRESS, EVENT_SHOT
+from .trace import Tracer
 
 
 class DebugLogger:
     """
     Simple debug logger for classifiers.
 
-    Accepts a callback (e.g. ``overlay.log_debug``) and provides a ``log()``
-    method.  Classifiers that accept a ``debug_logger`` kwarg call
-    ``self._debug.log(msg)`` to emit human-readable debug events.
+    Accepts a callback (e.g. ``overlay.log_debug``).  Classifiers that accept
+    a ``debug_logger`` kwarg take a ``tracer()`` from it and emit structured
+    TraceEvents, which reach the callback unformatted; ``str(event)`` renders
+    a human-readable line.  ``log()`` passes a free-form message through.
 
     Usage::
 
@@ -16,28 +20,77 @@ class DebugLogger:
         classifier = MovementClassifier(..., debug_logger=logger)
     """
 
-    def __init__(self, callback: Callable[[str], None]) -> None:
+    def __init__(self, callback: Callable[[Any], None]) -> None:
         self._callback = callback
 
     def log(self, message: str) -> None:
         self._callback(message)
 
+    def tracer(self, key_names: Sequence[str], ticks_per_ms: float) -> Tracer:
+        return Tracer(self._callback, key_names, ticks_per_ms)
+
 
 class MovementClassifierInterface(ABC):
+    """
+    Timestamps are integer ticks from a monotonic clock.  Classifiers take a
+    ``ticks_per_ms`` constructor argument (1 by default, so plain millisecond
+    values work; the live pipeline passes nanoseconds with ``1_000_000``) and
+    report every duration on the resulting classification in milliseconds.
+
+    Keys are integer codes from ``classifier.key_codes``; key names ("W",
+    "SHIFT", ...) are accepted as a compatibility shim.
+    """
+
     @abstractmethod
-    def on_press(self, key: str, timestamp: float) -> None:
+    def on_press(self, key: Union[int, str], timestamp: float) -> None:
         """Handle a key press for the given key at the given timestamp."""
 
     @abstractmethod
-    def on_release(self, key: str, timestamp: float) -> None:
+    def on_release(self, key: Union[int, str], timestamp: float) -> None:
         """Handle a key release for the given key at the given timestamp."""
 
     @abstractmethod
-    def classify_shot(self, shot_time: float) -> Any:
-        """Return a shot classification object for a shot at shot_time."""
+    def classify_shot(self, shot_time: float, out: Any = None) -> Any:
+        """
+        Return a shot classification object for a shot at shot_time.
+        When ``out`` is given it is filled in place and returned.
+        """
+
+    def feed(self, events: Sequence[int]) -> List[Any]:
+        """
+        Run a packed event buffer (see ``classifier.events``) through the
+        classifier and return one new classification per shot, in order.
+
+        Events must use integer key codes.  This default dispatches to the
+        per-event methods; classifiers override it with a tighter loop.
+        """
+        results = []
+        it = iter(events)
+        for kind, key, timestamp in zip(it, it, it):
+            if kind == EVENT_SHOT:
+                results.append(self.classify_shot(timestamp))
+            elif kind == EVENT_PRESS:
+                self.on_press(key, timestamp)
+            else:
+                self.on_release(key, timestamp)
+        return results
+
+    @abstractmethod
+    def snapshot(self) -> Tuple[Optional[float], ...]:
+        """
+        Return the classifier's mutable state as a flat tuple of ints, floats
+        and None, suitable for storing in a keyframe.  Configuration (keys,
+        ticks_per_ms, debug logger) is not included.
+        """
+
+    @abstractmethod
+    def restore(self, state: Sequence[Optional[float]]) -> None:
+        """Replace the mutable state with one returned by ``snapshot()``."""
 
 
 class ShotClassificationInterface(ABC):
+    __slots__ = ()
+
     @abstractmethod
     def to_display_string(self) -> str:
         """Return a human-friendly multi-line description of the classification."""
@@ -45,17 +98,31 @@ class ShotClassificationInterface(ABC):
 
 class ShotFilterInterface(ABC):
     @abstractmethod
-    def apply(self, raw: "ShotClassificationInterface") -> "ShotClassificationInterface":
-        """Apply threshold rules to a raw classification and return the final one."""
+    def apply(
+        self,
+        raw: "ShotClassificationInterface",
+        out: Optional["ShotClassificationInterface"] = None,
+    ) -> "ShotClassificationInterface":
+        """
+        Apply threshold rules to a raw classification and return the final one.
+        When ``out`` is given it is filled in place and returned.
+        """
 
 
 class AxisStateInterface(ABC):
+    """
+    Per-axis state machine; timestamps and returned durations are in ticks.
+    Keys are the side index (0 or 1) within the axis pair, or a key name.
+    """
+
+    __slots__ = ()
+
     @abstractmethod
-    def on_press(self, key: str, timestamp: float) -> None:
+    def on_press(self, key: Union[int, str], timestamp: float) -> None:
         """Handle a key press for the given key at the given timestamp."""
 
     @abstractmethod
-    def on_release(self, key: str, timestamp: float) -> None:
+    def on_release(self, key: Union[int, str], timestamp: float) -> None:
         """Handle a key release for the given key at the given timestamp."""
 
     @abstractmethod
@@ -0,0 +1,650 @@
+"""Vectorised classification of whole recorded sessions (requires NumPy).
+
+The functions here take columnar event arrays -- ``kinds`` (EVENT_*),
+``keys`` (key codes) and ``timestamps`` (ticks) -- and label every shot in
+one pass, with the same results as feeding the events one at a time through
+``MovementClassifier.classify_shot`` followed by ``ShotFilter.apply``.
+
+How one axis is reconstructed without a per-event loop:
+
+* Held state per key is the kind of the key's most recent event, so rest
+  presses (nothing on the axis held) and overlapping presses (the other key
+  already held) fall out of a forward fill.
+* Releases and shots are *anchors*.  Between two anchors only presses
+  happen, so the AxisEngine state after each anchor reduces to two bits:
+  whether the release kept a pending counter-press (AxisConfig
+  ``keep_cs_press_on_release``) and whether an overlap is recorded.  Each
+  anchor is a map over those four states, derived from counts of the
+  presses in the gap before it, and the maps are combined with a prefix
+  composition scan.
+* Stamped times (last effective release, counter-press, overlap start) are
+  then located with ``searchsorted`` on the press and release positions.
+"""
+
+from typing import Callable, Dict, Iterator, NamedTuple, Sequence, Tuple
+
+import numpy as np
+
+from .axis_engine import AxisConfig
+from .cs2KitchenClassifier.axis_state import AxisState as CS2KitchenAxisState
+from .events import EVENT_FIELDS, EVENT_PRESS, EVENT_RELEASE, EVENT_SHOT
+from .key_codes import KEY_CTRL, KEY_SHIFT, MODIFIER_BIT
+from .labels import ShotLabel, SubLabel
+from .ppClassifier.axis_state import AxisState as PPAxisState
+from .ppClassifier.movement_classifier import MovementClassifier as PPMovementClassifier
+from .ppClassifier.shot_filter import ShotFilter as PPShotFilter
+
+
+class ShotBatch(NamedTuple):
+    """
+    One entry per shot, in event order.  Durations are in milliseconds,
+    with NaN where the per-event result has None.
+    """
+
+    shot_time: np.ndarray
+    label: np.ndarray  # ShotLabel values
+    sub_label: np.ndarray  # SubLabel values
+    cs_time: np.ndarray
+    shot_delay: np.ndarray
+    overlap_time: np.ndarray
+    shift_held: np.ndarray
+    ctrl_held: np.ndarray
+
+
+def unpack_events(events: Sequence[int]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Split a packed event buffer (see ``classifier.events``) into columns."""
+    flat = np.asarray(events, dtype=np.int64).reshape(-1, EVENT_FIELDS)
+    return flat[:, 0], flat[:, 1], flat[:, 2]
+
+
+# ---------------------------------------------------------------------------
+# Anchor-state maps
+# ---------------------------------------------------------------------------
+#
+# A state is ``kept << 1 | overlap`` (0..3); a map over the four states is
+# packed into one byte, two bits per input state.
+
+def _build_compose_table() -> np.ndarray:
+    f = np.arange(256)[:, None]
+    g = np.arange(256)[None, :]
+    out = np.zeros((256, 256), dtype=np.uint8)
+    for state in range(4):
+        mid = (f >> (2 * state)) & 3
+        out |= (((g >> (2 * mid)) & 3) << (2 * state)).astype(np.uint8)
+    return out
+
+
+# _COMPOSE[f | g << 8] is "apply f, then g": the index is the byte pair
+# (f, g) read as a little-endian uint16.
+_COMPOSE = _build_compose_table().T.ravel()
+_IDENTITY = 0b11100100
+
+
+def _compose_pairs(pairs: np.ndarray) -> np.ndarray:
+    """Compose each (even, odd) pair of a contiguous, even-length map array."""
+    return np.take(_COMPOSE, pairs.view("<u2"))
+
+
+def _compose(f: np.ndarray, g: np.ndarray) -> np.ndarray:
+    pairs = np.empty(2 * len(f), dtype=np.uint8)
+    pairs[0::2] = f
+    pairs[1::2] = g
+    return _compose_pairs(pairs)
+
+
+def _prefix_compose(maps: np.ndarray) -> np.ndarray:
+    """Inclusive prefix composition (work-efficient up-sweep/down-sweep)."""
+    levels = [maps]
+    current = maps
+    while len(current) > 1:
+        if len(current) & 1:
+            current = np.append(current, np.uint8(_IDENTITY))
+        current = _compose_pairs(current)
+        levels.append(current)
+    prefix = levels[-1]
+    for level in reversed(levels[:-1]):
+        size = len(level)
+        out = np.empty(size, dtype=np.uint8)
+        out[0] = level[0]
+        out[1::2] = prefix[: size // 2]
+        out[2::2] = _compose(prefix[: (size + 1) // 2 - 1], level[2::2])
+        prefix = out
+    return prefix
+
+
+# ---------------------------------------------------------------------------
+# One axis
+# ---------------------------------------------------------------------------
+#
+# An axis stream holds that axis's key events and every shot as int8 codes
+# ``kind << 1 | side``: 0/1 press, 2/3 release, 4/5 shot.
+
+_CODE_SHOT = EVENT_SHOT << 1
+# Gap flags: a press of side s sets 1 << s.
+# ShotLabel indexed by is_cs | is_overlap << 1; an overlap outranks a
+# counter-strafe.
+_AXIS_LABELS = np.array(
+    [ShotLabel.BAD, ShotLabel.COUNTER_STRAFE, ShotLabel.OVERLAP, ShotLabel.OVERLAP], dtype=np.int8
+)
+
+
+def _next_after(positions: np.ndarray, after: np.ndarray) -> np.ndarray:
+    """First entry of sorted ``positions`` greater than each ``after``."""
+    return positions[np.searchsorted(positions, after, side="right")]
+
+
+def _last_before(marked: np.ndarray, index: np.ndarray) -> np.ndarray:
+    """Last ``i < index`` with ``marked[i]`` for each index; one must exist."""
+    pos = index - 1
+    # Marks are close by: step back a few times before searching.
+    pending = np.flatnonzero(~marked[pos])
+    for _ in range(3):
+        if not len(pending):
+            return pos
+        pos[pending] -= 1
+        pending = pending[~marked[pos[pending]]]
+    if len(pending):
+        marks = np.flatnonzero(marked)
+        pos[pending] = marks[np.searchsorted(marks, pos[pending]) - 1]
+    return pos
+
+
+def _first_press(code: np.ndarray, start: np.ndarray, side: np.ndarray) -> np.ndarray:
+    """
+    Position of the first press of ``side`` at or after each ``start``; one
+    must exist before the next anchor.
+    """
+    pos = start.copy()
+    # Gaps are short: step through a few presses before searching.
+    pending = np.flatnonzero(code[pos] != side)
+    for _ in range(3):
+        if not len(pending):
+            return pos
+        pos[pending] += 1
+        pending = pending[code[pos[pending]] != side[pending]]
+    for press_side in (0, 1):
+        wanted = pending[side[pending] == press_side]
+        if len(wanted):
+            pos[wanted] = _next_after(np.flatnonzero(code == press_side), pos[wanted] - 1)
+    return pos
+
+
+def _shifted(values: np.ndarray, first) -> np.ndarray:
+    """``values`` moved one place later, with ``first`` in front."""
+    out = np.empty_like(values)
+    out[0] = first
+    out[1:] = values[:-1]
+    return out
+
+
+def _gap_start(anchors: np.ndarray, index: np.ndarray) -> np.ndarray:
+    """Stream position where the gap before each of ``anchors[index]`` opens."""
+    start = anchors[index - 1] + 1
+    start[index == 0] = 0
+    return start
+
+
+def _build_held_table() -> np.ndarray:
+    """
+    The map of the held mask (a 4-state value too) over one anchor, for
+    ``gap | anchor_code << 2``: the gap's presses hold their sides, then a
+    release lets its side go.
+    """
+    table = np.zeros((_CODE_SHOT + 2) << 2, dtype=np.uint8)
+    for code in range(2, _CODE_SHOT + 2):
+        released = 1 << (code & 1) if code < _CODE_SHOT else 0
+        for gap in range(4):
+            for held in range(4):
+                table[gap | code << 2] |= ((held | gap) & ~released) << (2 * held)
+    return table
+
+
+_HELD_MAPS = _build_held_table()
+
+
+def _held_after(gap: np.ndarray, anchor_code: np.ndarray, held: int) -> np.ndarray:
+    """Held sides after each anchor, as a 2-bit mask, from ``held`` before them."""
+    maps = np.take(_HELD_MAPS, gap | anchor_code.view(np.uint8) << 2)
+    return _prefix_compose(maps) >> (2 * held) & 3
+
+
+def _axis_shots(
+    code: np.ndarray,
+    where: np.ndarray,
+    timestamps: np.ndarray,
+    shot_time: np.ndarray,
+    config: AxisConfig,
+    held: int,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, int]:
+    """
+    Classify every shot on one axis.  ``code`` is the axis stream, ``where``
+    its positions in ``timestamps``, ``shot_time`` the time of each shot and
+    ``held`` the sides held before the stream (it opens just after a shot).
+    Returns (label, val1, val2) per shot: ShotLabel values BAD /
+    COUNTER_STRAFE / OVERLAP and durations in ticks, which only mean
+    something where the label carries them (cs_time and shot_delay for a
+    counter-strafe, overlap_time in val1 for an overlap); then the sides
+    held at the end of the stream.
+    """
+    is_press = code < 2
+    # ``padded[i + 2]`` holds the gap flags of event i.
+    padded = np.zeros(len(code) + 2, dtype=np.uint8)
+    flags = padded[2:]
+    np.left_shift(is_press.view(np.uint8), code.view(np.uint8) & 1, out=flags)
+    anchors = np.flatnonzero(~is_press)
+    if not len(anchors):
+        no_shots = np.zeros(0, dtype=np.int8), shot_time[:0], shot_time[:0]
+        return (*no_shots, held | int(np.bitwise_or.reduce(flags)))
+    anchor_code = code[anchors]
+    anchor_is_shot = anchor_code >= _CODE_SHOT
+
+    # Flags OR-ed over the gap before each anchor.  Nearly every gap holds
+    # at most one press, the event just before the anchor (anchors have no
+    # flags); the longer ones, with presses one and two events back, are
+    # reduced on their own.
+    gap = padded[1:][anchors]
+    long_gaps = np.flatnonzero((gap != 0) & (padded[anchors] != 0))
+    if len(long_gaps):
+        bounds = np.empty(2 * len(long_gaps), dtype=np.intp)
+        bounds[0::2] = _gap_start(anchors, long_gaps)
+        bounds[1::2] = anchors[long_gaps]
+        gap[long_gaps] = np.bitwise_or.reduceat(flags, bounds)[0::2]
+    held_after = _held_after(gap, anchor_code, held)
+    # The stream ends with the presses after its last anchor.
+    held_at_end = int(held_after[-1] | np.bitwise_or.reduce(flags[anchors[-1] + 1 :]))
+    shots = np.flatnonzero(anchor_is_shot)
+    if not len(shots):
+        return np.zeros(0, dtype=np.int8), shot_time[:0], shot_time[:0], held_at_end
+
+    # A press overlaps when it leaves both keys held: the gap presses both,
+    # or presses one while the other is still held from before it.
+    held_before = _shifted(held_after, held)
+    other_held = (held_before >> 1) | ((held_before & 1) << 1)
+    overlap_in_gap = (gap == 3) | (gap & other_held).astype(bool)
+
+    anchor_is_release = ~anchor_is_shot
+    prev_is_release = _shifted(anchor_is_release, False)
+    side = anchor_code.view(np.uint8) & 1
+    prev_side = _shifted(side, 0)
+    if config.reset_stale_overlap_on_press:
+        # The gap opens with a rest press when nothing was held before it.
+        rest_gap = (gap != 0) & (held_before == 0)
+    else:
+        rest_gap = np.zeros(len(anchors), dtype=bool)
+
+    # Map of each anchor over (kept, overlap).  A release that follows a
+    # release depends on the state before it; shots and the first release
+    # after a shot are constants.  An overlap recorded before a release
+    # survives a chained release unless a stale reset cleared it.
+    chained = prev_is_release & anchor_is_release
+    fresh_overlap = (overlap_in_gap & anchor_is_release).view(np.uint8)
+    survives = (chained & ~rest_gap).view(np.uint8)
+    maps = (fresh_overlap * np.uint8(0b01010101)) | (survives << 2) | (chained.view(np.uint8) << 6)
+    if config.keep_cs_press_on_release:
+        countered_gap = chained & (side != prev_side) & (gap & (1 << side)).astype(bool)
+        same_side = (chained & (side == prev_side)).view(np.uint8)
+        maps |= countered_gap.view(np.uint8) << 1
+        maps |= (countered_gap & ~rest_gap).view(np.uint8) << 3
+        maps |= same_side * np.uint8(0b10100000)
+    after = _prefix_compose(maps) & 3
+    kept_after = after >= 2
+    overlap_after = (after & 1).astype(bool)
+
+    # Stale resets happen at the rest press opening a gap whose previous
+    # release left an overlap and no pending counter-press.
+    prev_state = _shifted(after, 0)
+    stale_gap = rest_gap & prev_is_release & (prev_state == 1)
+
+    # Axis state immediately before each shot.
+    prior = shots - 1
+    if shots[0] == 0:
+        prior[0] = 0
+    from_release = prev_is_release[shots]
+    stale = stale_gap[shots]
+    kept = from_release & kept_after[prior]
+    overlapped = (from_release & overlap_after[prior] & ~stale) | overlap_in_gap[shots]
+    released = from_release & ~stale
+    countered = kept | (released & (gap[shots] & (2 >> prev_side[shots])).astype(bool))
+
+    # Only the shots that have them look up their stamped times; the other
+    # entries of val1 / val2 stay zero.
+    is_cs = np.zeros(len(shots), dtype=bool)
+    is_overlap = np.zeros(len(shots), dtype=bool)
+    cs_release = np.zeros(len(shots), dtype=shot_time.dtype)
+    val1 = np.zeros(len(shots), dtype=shot_time.dtype)
+    val2 = np.zeros(len(shots), dtype=shot_time.dtype)
+
+    # The stamped release is the one just before the shot, unless releasing
+    # the counter key kept an earlier one; the counter-press is the first
+    # opposite press in the gap after it.
+    cs = np.flatnonzero(countered)
+    release = prior[cs]
+    carried = np.flatnonzero(kept[cs])
+    if len(carried):
+        effective = anchor_is_release & ~kept_after
+        release[carried] = _last_before(effective, release[carried])
+    release_pos = anchors[release]
+    counter_pos = _first_press(code, release_pos + 1, 1 - (code[release_pos] & 1))
+    cs_release[cs] = timestamps[where[release_pos]]
+    cs_press = timestamps[where[counter_pos]]
+    is_cs[cs] = cs_press > cs_release[cs]
+    val1[cs] = cs_press - cs_release[cs]
+    val2[cs] = shot_time[cs] - cs_press
+
+    # The overlap starts at the first overlapping press after the last
+    # reset: the previous shot, or a stale reset since (at the rest press
+    # opening a gap, which overlaps nothing).  Gaps are numbered by the
+    # anchor closing them.
+    ov = np.flatnonzero(overlapped)
+    if len(ov):
+        first_gap = shots[ov - 1] + 1
+        if ov[0] == 0:
+            first_gap[0] = 0
+        if config.reset_stale_overlap_on_press:
+            resets = np.flatnonzero(stale_gap)
+            last_reset = np.append(resets, 0)[np.searchsorted(resets, shots[ov], side="right") - 1]
+            first_gap = np.maximum(first_gap, last_reset)
+        overlap_gap = _next_after(np.flatnonzero(overlap_in_gap), first_gap - 1)
+        # Its first press overlaps if the other side is already held;
+        # otherwise the first press of the other side does.
+        start = _gap_start(anchors, overlap_gap)
+        other = 1 - (code[start].view(np.uint8) & 1)
+        side = other ^ ((held_before[overlap_gap] >> other) & 1)
+        overlap_start = timestamps[where[_first_press(code, start, side)]]
+        wins = ~(is_cs[ov] & (cs_release[ov] > overlap_start))
+        is_overlap[ov] = wins
+        val1[ov[wins]] = shot_time[ov[wins]] - overlap_start[wins]
+
+    label = np.take(_AXIS_LABELS, is_cs.view(np.uint8) | is_overlap.view(np.uint8) << 1)
+    return label, val1, val2, held_at_end
+
+
+# ---------------------------------------------------------------------------
+# Sessions
+# ---------------------------------------------------------------------------
+
+# Sessions are classified in chunks of about this many events, so that
+# their temporaries stay in cache.
+_CHUNK_EVENTS = 1 << 18
+# Event lanes are ``key >> 1``: the two axes, then the modifiers.
+_LANE_MODIFIER = MODIFIER_BIT >> 1
+_LANE_SHOT = -2
+
+
+class _Session(NamedTuple):
+    kinds: np.ndarray  # int8
+    keys: np.ndarray  # int8, out-of-range codes clipped to ignored values
+    lanes: np.ndarray  # int8, _LANE_SHOT at the shots
+    timestamps: np.ndarray
+    shots: np.ndarray  # positions of the shots
+    shot_time: np.ndarray
+
+    @classmethod
+    def of(cls, kinds, keys, timestamps) -> "_Session":
+        kinds = np.asarray(kinds).astype(np.int8)
+        keys = np.asarray(keys)
+        keys = np.clip(keys, -1, 8, out=np.empty(keys.shape, dtype=np.int8), casting="unsafe")
+        timestamps = np.asarray(timestamps)
+        if not (len(kinds) == len(keys) == len(timestamps)):
+            raise ValueError("kinds, keys and timestamps must have the same length")
+        shots = np.flatnonzero(kinds == EVENT_SHOT)
+        lanes = keys >> 1
+        lanes[shots] = _LANE_SHOT
+        return cls(kinds, keys, lanes, timestamps, shots, timestamps[shots])
+
+    def chunks(self) -> Iterator[Tuple[slice, slice, "_Session"]]:
+        """
+        The session cut into chunks of about ``_CHUNK_EVENTS`` events, with
+        the slices of the events and of the shots each holds.  Cuts fall just
+        after a shot, which leaves an axis with nothing but its held keys.
+        """
+        marks = np.arange(_CHUNK_EVENTS, len(self.kinds), _CHUNK_EVENTS)
+        last_shots = np.unique(np.searchsorted(self.shots, marks))
+        last_shots = last_shots[last_shots < len(self.shots)]
+        event_cuts = [0, *(self.shots[last_shots] + 1), len(self.kinds)]
+        shot_cuts = [0, *(last_shots + 1), len(self.shots)]
+        for i in range(len(event_cuts) - 1):
+            events = slice(event_cuts[i], event_cuts[i + 1])
+            shots = slice(shot_cuts[i], shot_cuts[i + 1])
+            yield events, shots, _Session(
+                self.kinds[events],
+                self.keys[events],
+                self.lanes[events],
+                self.timestamps[events],
+                self.shots[shots] - events.start,
+                self.shot_time[shots],
+            )
+
+    def axes(self, config: AxisConfig, ticks_per_ms: float):
+        """
+        Per-shot (label, val1 ms, val2 ms) for the vertical and horizontal
+        axes; the durations only mean something where the label has them.
+        """
+        count = len(self.shots)
+        duration = (self.shot_time[:0] / ticks_per_ms).dtype
+        results = [
+            (
+                np.full(count, ShotLabel.BAD, dtype=np.int8),
+                np.zeros(count, dtype=duration),
+                np.zeros(count, dtype=duration),
+            )
+            for _ in (0, 1)
+        ]
+        held = [0, 0]
+        for _, shots, chunk in self.chunks():
+            code = chunk.kinds << 1 | (chunk.keys & 1)
+            on_axis = [chunk.lanes == axis for axis in (0, 1)]
+            # The axes with a key event since the previous shot, per shot.  A
+            # shot without one finds that axis just reset (or untouched), so
+            # it is Bad there; such shots stay out of the axis stream.
+            touched = np.zeros(len(chunk.shots), dtype=np.uint8)
+            if len(chunk.shots):
+                lanes = on_axis[0].view(np.uint8) | on_axis[1].view(np.uint8) << 1
+                segments = np.append(0, chunk.shots[:-1] + 1)
+                touched = np.bitwise_or.reduceat(lanes[: chunk.shots[-1] + 1], segments)
+            for axis, (label, val1, val2) in enumerate(results):
+                kept = np.flatnonzero(touched & (1 << axis))
+                in_stream = on_axis[axis]
+                in_stream[chunk.shots[kept]] = True
+                where = np.flatnonzero(in_stream)
+                (
+                    label[shots][kept],
+                    val1[shots][kept],
+                    val2[shots][kept],
+                    held[axis],
+                ) = _axis_shots(
+                    code[where],
+                    where,
+                    chunk.timestamps,
+                    chunk.shot_time[kept],
+                    config,
+                    held[axis],
+                )
+        for _, val1, val2 in results:
+            val1 /= ticks_per_ms
+            val2 /= ticks_per_ms
+        return results
+
+    def since_movement_press(self) -> np.ndarray:
+        """Time from the last movement-key press to each shot, inf if none."""
+        since = np.empty(len(self.shots), dtype=np.float64)
+        carried = -np.inf
+        for _, shots, chunk in self.chunks():
+            # Movement lanes are 0 and 1; the others wrap past them as uint8.
+            mask = (chunk.kinds == EVENT_PRESS) & (chunk.lanes.view(np.uint8) < 2)
+            before = np.cumsum(mask, dtype=np.intp)[chunk.shots]
+            pressed = np.append(carried, chunk.timestamps[np.flatnonzero(mask)])
+            since[shots] = chunk.shot_time - pressed[before]
+            carried = pressed[-1]
+        return since
+
+    def modifiers_at_shots(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Whether Shift and Ctrl were held (their last event a press) at each shot."""
+        held = np.zeros((2, len(self.shots)), dtype=bool)
+        carried = [False, False]
+        for _, shots, chunk in self.chunks():
+            events = np.flatnonzero(chunk.lanes == _LANE_MODIFIER)
+            # Index into ``events`` of the last one before each shot; there
+            # are far fewer events than shots to search for.
+            next_shot = np.searchsorted(chunk.shots, events)
+            last = np.cumsum(np.bincount(next_shot, minlength=len(chunk.shots) + 1)[:-1]) - 1
+            keys = chunk.keys[events]
+            pressed = chunk.kinds[events] == EVENT_PRESS
+            index = np.arange(len(events))
+            for i, key in enumerate((KEY_SHIFT, KEY_CTRL)):
+                # Index into ``events`` of the key's last event, carried
+                # forward; -1 picks the state carried into the chunk.
+                key_last = np.maximum.accumulate(np.where(keys == key, index, -1))
+                held_after = np.append(np.append(pressed, carried[i])[key_last], carried[i])
+                held[i, shots] = held_after[last]
+            # The chunk ends with its last shot.
+            if len(chunk.shots):
+                carried = held[:, shots.stop - 1].tolist()
+        return held[0], held[1]
+
+
+# ---------------------------------------------------------------------------
+# Classifiers
+# ---------------------------------------------------------------------------
+
+def classify_cs2kitchen(
+    kinds,
+    keys,
+    timestamps,
+    *,
+    ticks_per_ms: float = 1,
+    max_shot_delay_ms: float = 230.0,
+    max_cs_time_and_delay_ms: float = 215.0,
+) -> ShotBatch:
+    """cs2KitchenClassifier MovementClassifier + ShotFilter over a whole session."""
+    session = _Session.of(kinds, keys, timestamps)
+    (v_label, v_val1, v_val2), (h_label, h_val1, h_val2) = session.axes(
+        CS2KitchenAxisState.CONFIG, ticks_per_ms
+    )
+
+    # Most negative axis wins (label values order Overlap > CS > Bad); a tie
+    # goes to the larger val1, vertical first.
+    use_v = (v_label > h_label) | ((v_label == h_label) & (v_val1 >= h_val1))
+    label = np.where(use_v, v_label, h_label)
+    val1 = np.where(use_v, v_val1, h_val1)
+    val2 = np.where(use_v, v_val2, h_val2)
+
+    count = len(label)
+    is_cs = label == ShotLabel.COUNTER_STRAFE
+    is_overlap = label == ShotLabel.OVERLAP
+    too_slow = (val2 > max_shot_delay_ms) | (
+        (val1 > max_cs_time_and_delay_ms) & (val2 > max_cs_time_and_delay_ms)
+    )
+    final = np.where(is_cs & too_slow, np.int8(ShotLabel.BAD), label)
+    return ShotBatch(
+        shot_time=session.shot_time,
+        label=final,
+        sub_label=np.zeros(count, dtype=np.int8),
+        cs_time=np.where(is_cs, val1, np.nan),
+        shot_delay=np.where(is_cs, val2, np.nan),
+        overlap_time=np.where(is_overlap, val1, np.nan),
+        shift_held=np.zeros(count, dtype=bool),
+        ctrl_held=np.zeros(count, dtype=bool),
+    )
+
+
+# ppClassifier outcomes as (label, sub-label).  The first six are the
+# ShotFilter rules for a counter-strafe, in the order it tries them.
+_PP_OUTCOMES = (
+    (ShotLabel.BAD, SubLabel.HOLDING_SHIFT),
+    (ShotLabel.BAD, SubLabel.HOLDING_CTRL),
+    (ShotLabel.BAD, SubLabel.FIRING_TOO_EARLY),
+    (ShotLabel.PERFECT, SubLabel.NONE),
+    (ShotLabel.GOOD, SubLabel.NONE),
+    (ShotLabel.BAD, SubLabel.FIRED_TOO_LATE),
+    (ShotLabel.BAD, SubLabel.OVERLAPPING_MOVEMENT),
+    (ShotLabel.BAD, SubLabel.NO_COUNTER_STRAFE),
+    (ShotLabel.NOT_DETECTED, SubLabel.NONE),
+)
+_PP_HOLDING_SHIFT, _PP_HOLDING_CTRL, _PP_FIRING_TOO_EARLY = 0, 1, 2
+_PP_OVERLAP, _PP_BAD, _PP_NOT_DETECTED = 6, 7, 8
+_PP_LABELS = np.array([label for label, _ in _PP_OUTCOMES], dtype=np.int8)
+_PP_SUB_LABELS = np.array([sub for _, sub in _PP_OUTCOMES], dtype=np.int8)
+
+
+def _build_pp_outcome_table() -> np.ndarray:
+    """
+    Outcome for ``rank | ctrl << 2 | shift << 3 | movement << 4 |
+    not_detected << 6``, where ``rank`` counts the delay bounds passed and
+    ``movement`` is the winning axis label: Bad, counter-strafe or overlap.
+    """
+    index = np.arange(128)
+    rank, ctrl, shift = index & 3, index >> 2 & 1, index >> 3 & 1
+    movement, not_detected = index >> 4 & 3, index >> 6
+    outcome = np.select(
+        [
+            not_detected == 1,
+            movement == ShotLabel.OVERLAP,
+            movement == ShotLabel.BAD,
+            shift == 1,
+            ctrl == 1,
+        ],
+        [_PP_NOT_DETECTED, _PP_OVERLAP, _PP_BAD, _PP_HOLDING_SHIFT, _PP_HOLDING_CTRL],
+        rank + _PP_FIRING_TOO_EARLY,
+    )
+    return outcome.astype(np.int8)
+
+
+_PP_OUTCOME_OF = _build_pp_outcome_table()
+
+
+def classify_pp(kinds, keys, timestamps, *, ticks_per_ms: float = 1) -> ShotBatch:
+    """ppClassifier MovementClassifier (which applies its ShotFilter) over a whole session."""
+    session = _Session.of(kinds, keys, timestamps)
+    (v_label, v_val1, v_val2), (h_label, h_val1, h_val2) = session.axes(
+        PPAxisState.CONFIG, ticks_per_ms
+    )
+    shot_time = session.shot_time
+    shift_held, ctrl_held = session.modifiers_at_shots()
+
+    window = PPMovementClassifier.NO_MOVEMENT_WINDOW_MS * ticks_per_ms
+    not_detected = session.since_movement_press() >= window
+
+    # Overlap > Counter-strafe > Bad (the label values' order); a tie goes to
+    # the larger val1, horizontal first.
+    movement = np.maximum(h_label, v_label)
+    use_h = (h_label > v_label) | ((h_label == v_label) & (h_val1 >= v_val1))
+    val1 = np.where(use_h, h_val1, v_val1)
+    delay = np.where(use_h, h_val2, v_val2)
+
+    # The delay rules are nested ranges, so the first one a delay meets
+    # follows from how many of the bounds it passes.
+    rank = (
+        (delay >= PPShotFilter.MIN_SHOT_DELAY).view(np.uint8)
+        + (delay > PPShotFilter.PERFECT_MAX).view(np.uint8)
+        + (delay > PPShotFilter.GOOD_MAX).view(np.uint8)
+    )
+    outcome = np.take(
+        _PP_OUTCOME_OF,
+        rank
+        | ctrl_held.view(np.uint8) << 2
+        | shift_held.view(np.uint8) << 3
+        | movement.view(np.uint8) << 4
+        | not_detected.view(np.uint8) << 6,
+    )
+
+    # The counter-strafe outcomes come first.
+    is_cs = outcome < _PP_OVERLAP
+    # The raw Bad result passes through the filter with its modifier flags.
+    keep_flags = outcome == _PP_BAD
+    return ShotBatch(
+        shot_time=shot_time,
+        label=np.take(_PP_LABELS, outcome),
+        sub_label=np.take(_PP_SUB_LABELS, outcome),
+        cs_time=np.where(is_cs, val1, np.nan),
+        shot_delay=np.where(is_cs, delay, np.nan),
+        overlap_time=np.where(outcome == _PP_OVERLAP, val1, np.nan),
+        shift_held=shift_held & keep_flags,
+        ctrl_held=ctrl_held & keep_flags,
+    )
+
+
+BATCH_CLASSIFIERS: Dict[str, Callable[..., ShotBatch]] = {
+    "cs2kitchen": classify_cs2kitchen,
+    "pp": classify_pp,
+}
@@ -1,18 +1,35 @@
-from typing import Optional, Tuple
+from typing import List, Optional, Sequence, Tuple, Union
 from .axis_state import AxisState
 from .shot_classification import ShotClassification
+from ..axis_engine import AXIS_SNAPSHOT_SIZE
 from ..base import DebugLogger, MovementClassifierInterface
+from ..events import EVENT_PRESS, EVENT_SHOT
+from ..key_codes import KEY_NONE, MODIFIER_BIT, KeyMap
+from ..labels import LABEL_BAD, LABEL_COUNTER_STRAFE, LABEL_OVERLAP
+from ..trace import (
+    TRACE_AXIS_H,
+    TRACE_AXIS_V,
+    TRACE_KEY_PRESS,
+    TRACE_KEY_RELEASE,
+    TRACE_SHOT,
+)
 
+# Axis result priority: the most negative outcome wins.
+_NEGATIVITY = {
+    "Overlap": 2,
+    "Counter-strafe": 1,
+    "Bad": 0,
+}
 
-def _fmt_axis(label: str, val1: Optional[float], val2) -> str:
-    """Format a single axis result tuple as a human-readable string."""
-    if label == "Counter-strafe" and val1 is not None and val2 is not None:
-        return f"Counter-strafe | CS: {val1:.0f} ms | Delay: {val2:.0f} ms"
-    if label == "Overlap" and val1 is not None:
-        return f"Overlap | {val1:.0f} ms"
-    if label == "Bad" and val2 is not None:
-        return f"Bad ({val2})"
-    return label
+
+def _to_ms(result: Tuple, ticks_per_ms: float) -> Tuple:
+    """Convert the durations in an axis result tuple from ticks to milliseconds."""
+    label, val1, val2 = result
+    if val1 is not None:
+        val1 = val1 / ticks_per_ms
+    if label == "Counter-strafe" and val2 is not None:
+        val2 = val2 / ticks_per_ms
+    return label, val1, val2
 
 
 class MovementClassifier(MovementClassifierInterface):
@@ -22,6 +39,15 @@ class MovementClassifier(MovementClassifierInterface):
     By default the classifier tracks the conventional vertical (forward/backward)
     and horizontal (left/right) movement keys. Custom key bindings can be
     supplied to accommodate different keyboard layouts or player preferences.
+
+    ``classify_shot`` fills ``out`` when given, so a caller can reuse one
+    preallocated ShotClassification per shot.  ``feed`` runs a packed event
+    buffer in one call.
+
+    Keys are integer codes from ``key_codes`` (key names are still accepted
+    and translated through a KeyMap).  Timestamps are integer clock ticks
+    (``ticks_per_ms`` per millisecond); durations on the returned
+    ShotClassification are in milliseconds.
     """
 
     def __init__(
@@ -30,6 +56,7 @@ class MovementClassifier(MovementClassifierInterface):
         vertical_keys: Tuple[str, str] = ("W", "S"),
         horizontal_keys: Tuple[str, str] = ("A", "D"),
         debug_logger: Optional[DebugLogger] = None,
+        ticks_per_ms: float = 1,
     ) -> None:
         v_keys = tuple(key.upper() for key in vertical_keys)
         h_keys = tuple(key.upper() for key in horizontal_keys)
@@ -37,45 +64,71 @@ class MovementClassifier(MovementClassifierInterface):
             raise ValueError(f"vertical_keys must contain two distinct keys, got {vertical_keys}")
         if len(set(h_keys)) != 2:
             raise ValueError(f"horizontal_keys must contain two distinct keys, got {horizontal_keys}")
-        self.vertical = AxisState(keys=v_keys)
-        self.horizontal = AxisState(keys=h_keys)
-        self._debug = debug_logger
-
-    def on_press(self, key: str, timestamp: float) -> None:
-        if key in self.vertical.keys:
-            if self._debug:
-                self._debug.log(f"[KEY PRESS] {key} @ {timestamp:.0f} ms")
-            self.vertical.on_press(key, timestamp)
-        elif key in self.horizontal.keys:
-            if self._debug:
-                self._debug.log(f"[KEY PRESS] {key} @ {timestamp:.0f} ms")
-            self.horizontal.on_press(key, timestamp)
-
-    def on_release(self, key: str, timestamp: float) -> None:
-        if key in self.vertical.keys:
-            if self._debug:
-                self._debug.log(f"[KEY RELEASE] {key} @ {timestamp:.0f} ms")
-            self.vertical.on_release(key, timestamp)
-        elif key in self.horizontal.keys:
-            if self._debug:
-                self._debug.log(f"[KEY RELEASE] {key} @ {timestamp:.0f} ms")
-            self.horizontal.on_release(key, timestamp)
-
-    def classify_shot(self, shot_time: float) -> ShotClassification:
-        v_label, v_val1, v_val2 = self.vertical.classify_shot(shot_time)
-        h_label, h_val1, h_val2 = self.horizontal.classify_shot(shot_time)
-
-        if self._debug:
-            self._debug.log(f"[AXIS:V] {_fmt_axis(v_label, v_val1, v_val2)}")
-            self._debug.log(f"[AXIS:H] {_fmt_axis(h_label, h_val1, h_val2)}")
-
-        negativity = {
-            "Overlap": 2,
-            "Counter-strafe": 1,
-            "Bad": 0,
-        }
-        v_score = negativity.get(v_label, 0)
-        h_score = negativity.get(h_label, 0)
+        self.vertical = AxisState(keys=v_keys, ticks_per_ms=ticks_per_ms)
+        self.horizontal = AxisState(keys=h_keys, ticks_per_ms=ticks_per_ms)
+        self._axes = (self.vertical, self.horizontal)
+        self._key_map = KeyMap(v_keys, h_keys)
+        self._trace = debug_logger.tracer(self._key_map.names, ticks_per_ms) if debug_logger else None
+        self._ticks_per_ms = ticks_per_ms
+
+    def on_press(self, key: Union[int, str], timestamp: float) -> None:
+        code = key if key.__class__ is int else self._key_map.code(key)
+        if 0 <= code < MODIFIER_BIT:
+            if self._trace is not None:
+                self._trace.emit(TRACE_KEY_PRESS, code, timestamp)
+            self._axes[code >> 1].press(code & 1, timestamp)
+
+    def on_release(self, key: Union[int, str], timestamp: float) -> None:
+        code = key if key.__class__ is int else self._key_map.code(key)
+        if 0 <= code < MODIFIER_BIT:
+            if self._trace is not None:
+                self._trace.emit(TRACE_KEY_RELEASE, code, timestamp)
+            self._axes[code >> 1].release(code & 1, timestamp)
+
+    def feed(self, events: Sequence[int]) -> List[ShotClassification]:
+        if self._trace is not None:
+            # The per-event path keeps the debug log complete.
+            return super().feed(events)
+        vertical, horizontal = self._axes
+        presses = (vertical.press, vertical.press, horizontal.press, horizontal.press)
+        releases = (vertical.release, vertical.release, horizontal.release, horizontal.release)
+        classify = self.classify_shot
+        results: List[ShotClassification] = []
+        append = results.append
+        it = iter(events)
+        for kind, key, timestamp in zip(it, it, it):
+            if kind == EVENT_SHOT:
+                append(classify(timestamp))
+            elif 0 <= key < MODIFIER_BIT:
+                if kind == EVENT_PRESS:
+                    presses[key](key & 1, timestamp)
+                else:
+                    releases[key](key & 1, timestamp)
+        return results
+
+    def snapshot(self) -> Tuple[Optional[float], ...]:
+        return self.vertical.snapshot() + self.horizontal.snapshot()
+
+    def restore(self, state: Sequence[Optional[float]]) -> None:
+        self.vertical.restore(state[:AXIS_SNAPSHOT_SIZE])
+        self.horizontal.restore(state[AXIS_SNAPSHOT_SIZE:])
+
+    def classify_shot(
+        self,
+        shot_time: float,
+        out: Optional[ShotClassification] = None,
+    ) -> ShotClassification:
+        tpm = self._ticks_per_ms
+        v_label, v_val1, v_val2 = _to_ms(self.vertical.classify_shot(shot_time), tpm)
+        h_label, h_val1, h_val2 = _to_ms(self.horizontal.classify_shot(shot_time), tpm)
+
+        trace = self._trace
+        if trace is not None:
+            trace.emit(TRACE_AXIS_V, KEY_NONE, shot_time, (v_label, v_val1, v_val2))
+            trace.emit(TRACE_AXIS_H, KEY_NONE, shot_time, (h_label, h_val1, h_val2))
+
+        v_score = _NEGATIVITY.get(v_label, 0)
+        h_score = _NEGATIVITY.get(h_label, 0)
         if v_score > h_score:
             label, val1, val2 = v_label, v_val1, v_val2
         elif h_score > v_score:
@@ -91,11 +144,13 @@ class MovementClassifier(MovementClassifierInterface):
             else:
                 label, val1, val2 = h_label, h_val1, h_val2
 
-        if self._debug:
-            self._debug.log(f"[SHOT] \u2192 {_fmt_axis(label, val1, val2)}")
+        if trace is not None:
+            trace.emit(TRACE_SHOT, KEY_NONE, shot_time, (label, val1, val2))
 
+        if out is None:
+            out = ShotClassification(LABEL_BAD)
         if label == "Counter-strafe":
-            return ShotClassification(label=label, cs_time=val1, shot_delay=val2)
+            return out.fill(LABEL_COUNTER_STRAFE, cs_time=val1, shot_delay=val2)
         elif label == "Overlap":
-            return ShotClassification(label=label, overlap_time=val1)
-        return ShotClassification(label=label)
+            return out.fill(LABEL_OVERLAP, overlap_time=val1)
+        return out.fill(LABEL_BAD)
@@ -1,33 +1,59 @@
-from typing import Optional
+from typing import Optional, Union
 from ..base import ShotClassificationInterface
+from ..labels import LABEL_NAMES, ShotLabel, label_id
 
 
 class ShotClassification(ShotClassificationInterface):
+    """
+    Result of one shot.  ``label_id`` is the interned ShotLabel; ``label``
+    returns its display name.  ``fill()`` overwrites every field in place so
+    a caller can reuse one preallocated result per shot.
+    """
+
+    __slots__ = ("label_id", "cs_time", "shot_delay", "overlap_time")
+
     def __init__(
         self,
-        label: str,
+        label: Union[str, ShotLabel],
         cs_time: Optional[float] = None,
         shot_delay: Optional[float] = None,
         overlap_time: Optional[float] = None,
     ):
-        self.label: str = label
+        self.label_id: ShotLabel = label_id(label)
         self.cs_time: Optional[float] = cs_time
         self.shot_delay: Optional[float] = shot_delay
         self.overlap_time: Optional[float] = overlap_time
 
+    @property
+    def label(self) -> str:
+        return LABEL_NAMES[self.label_id]
+
+    def fill(
+        self,
+        label: ShotLabel,
+        cs_time: Optional[float] = None,
+        shot_delay: Optional[float] = None,
+        overlap_time: Optional[float] = None,
+    ) -> "ShotClassification":
+        self.label_id = label
+        self.cs_time = cs_time
+        self.shot_delay = shot_delay
+        self.overlap_time = overlap_time
+        return self
+
     def to_display_string(self) -> str:
         lines = [f"Classification: {self.label}"]
         if (
-            self.label == "Counter-strafe"
+            self.label_id == ShotLabel.COUNTER_STRAFE
             and self.cs_time is not None
             and self.shot_delay is not None
         ):
             lines.append(f"CS time: {self.cs_time:.0f} ms")
             lines.append(f"Shot delay: {self.shot_delay:.0f} ms")
-        elif self.label == "Overlap" and self.overlap_time is not None:
+        elif self.label_id == ShotLabel.OVERLAP and self.overlap_time is not None:
             lines.append(f"Overlap: {self.overlap_time:.0f} ms")
         elif (
-            self.label == "Bad"
+            self.label_id == ShotLabel.BAD
             and self.cs_time is not None
             and self.shot_delay is not None
         ):
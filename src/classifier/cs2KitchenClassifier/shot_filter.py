@@ -1,5 +1,8 @@
+from typing import Optional
+
 from .shot_classification import ShotClassification
 from ..base import ShotClassificationInterface, ShotFilterInterface
+from ..labels import LABEL_BAD, LABEL_COUNTER_STRAFE, LABEL_OVERLAP
 
 
 class ShotFilter(ShotFilterInterface):
@@ -8,6 +11,9 @@ class ShotFilter(ShotFilterInterface):
     This is the only place where "too slow → Bad" policy lives.
     It has no I/O, no threading, and no UI dependency, making it
     straightforward to unit-test in isolation.
+
+    Pass ``out`` to have the result written into a preallocated
+    ShotClassification (which may be ``raw`` itself) instead of a new one.
     """
 
     def __init__(
@@ -18,11 +24,18 @@ class ShotFilter(ShotFilterInterface):
         self._max_shot_delay_ms = max_shot_delay_ms
         self._max_cs_time_and_delay_ms = max_cs_time_and_delay_ms
 
-    def apply(self, raw: ShotClassificationInterface) -> ShotClassification:
+    def apply(
+        self,
+        raw: ShotClassificationInterface,
+        out: Optional[ShotClassification] = None,
+    ) -> ShotClassification:
         assert isinstance(raw, ShotClassification)
-        if raw.label == "Overlap":
-            return ShotClassification(label="Overlap", overlap_time=raw.overlap_time)
-        if raw.label == "Counter-strafe":
+        if out is None:
+            out = ShotClassification(LABEL_BAD)
+        label = raw.label_id
+        if label == LABEL_OVERLAP:
+            return out.fill(LABEL_OVERLAP, overlap_time=raw.overlap_time)
+        if label == LABEL_COUNTER_STRAFE:
             cs_time = raw.cs_time
             shot_delay = raw.shot_delay
             if cs_time is not None and shot_delay is not None:
@@ -30,7 +43,7 @@ class ShotFilter(ShotFilterInterface):
                     cs_time > self._max_cs_time_and_delay_ms
                     and shot_delay > self._max_cs_time_and_delay_ms
                 ):
-                    return ShotClassification(label="Bad", cs_time=cs_time, shot_delay=shot_delay)
-                return ShotClassification(label="Counter-strafe", cs_time=cs_time, shot_delay=shot_delay)
-            return ShotClassification(label="Bad")
-        return ShotClassification(label="Bad")
+                    return out.fill(LABEL_BAD, cs_time=cs_time, shot_delay=shot_delay)
+                return out.fill(LABEL_COUNTER_STRAFE, cs_time=cs_time, shot_delay=shot_delay)
+            return out.fill(LABEL_BAD)
+        return out.fill(LABEL_BAD)
@@ -0,0 +1,32 @@
+"""Event kinds shared by the input pipeline and the classifiers.
+
+An input event is a ``(kind, key, timestamp)`` record.  ``key`` is ignored
+for shots.
+
+Bulk consumers (``MovementClassifierInterface.feed``) take events packed
+flat, ``EVENT_FIELDS`` integers per event, e.g. the int64 array built by
+``pack_events`` or a ``memoryview`` cast to ``"q"``.
+"""
+
+from array import array
+from typing import Iterable, Optional, Tuple
+
+from .key_codes import KEY_NONE
+
+EVENT_PRESS = 0
+EVENT_RELEASE = 1
+EVENT_SHOT = 2
+
+EVENT_FIELDS = 3
+EVENT_TYPECODE = "q"
+
+
+def pack_events(events: Iterable[Tuple[int, Optional[int], int]]) -> array:
+    """Pack ``(kind, key, timestamp)`` records into a flat int64 array.
+
+    A ``None`` key (shots) is stored as KEY_NONE.
+    """
+    buf = array(EVENT_TYPECODE)
+    for kind, key, timestamp in events:
+        buf.extend((kind, KEY_NONE if key is None else key, timestamp))
+    return buf
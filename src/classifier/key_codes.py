@@ -0,0 +1,42 @@
+"""Integer key codes used on the classifier hot path.
+
+A movement key's code is ``axis << 1 | side``: axis 0 is vertical
+(forward, backward) and axis 1 horizontal (left, right); side 0 is the first
+key of the axis pair.  Modifier codes have ``MODIFIER_BIT`` set.
+
+``KeyMap`` is the string-compatibility shim: it translates the key names the
+classifiers used to take ("W", "SHIFT", ...) to codes and back.
+"""
+
+from typing import Tuple
+
+AXIS_VERTICAL = 0
+AXIS_HORIZONTAL = 1
+
+KEY_FORWARD = 0
+KEY_BACKWARD = 1
+KEY_LEFT = 2
+KEY_RIGHT = 3
+MODIFIER_BIT = 4
+KEY_SHIFT = MODIFIER_BIT | 0
+KEY_CTRL = MODIFIER_BIT | 1
+KEY_NONE = -1
+
+MODIFIER_NAMES = ("SHIFT", "CTRL")
+
+
+class KeyMap:
+    """Bidirectional mapping between key names and integer key codes."""
+
+    __slots__ = ("names", "_codes")
+
+    def __init__(self, vertical_keys: Tuple[str, str], horizontal_keys: Tuple[str, str]) -> None:
+        self.names: Tuple[str, ...] = (*vertical_keys, *horizontal_keys, *MODIFIER_NAMES)
+        self._codes = {name: code for code, name in enumerate(self.names)}
+
+    def code(self, key: str) -> int:
+        """Return the code for a key name (case-insensitive), or KEY_NONE."""
+        return self._codes.get(key.upper(), KEY_NONE)
+
+    def name(self, code: int) -> str:
+        return self.names[code]
@@ -0,0 +1,96 @@
+"""Interned shot labels shared by every classifier.
+
+Results carry an ``IntEnum`` label (and, for ppClassifier, a sub-label);
+the display strings live in fixed tables indexed by the enum value, so a
+result never builds or compares label strings on the hot path.
+"""
+
+from enum import IntEnum
+from typing import Optional, Union
+
+
+class ShotLabel(IntEnum):
+    BAD = 0
+    COUNTER_STRAFE = 1
+    OVERLAP = 2
+    PERFECT = 3
+    GOOD = 4
+    NOT_DETECTED = 5
+    UNKNOWN = 6
+
+
+class SubLabel(IntEnum):
+    NONE = 0
+    NO_COUNTER_STRAFE = 1
+    OVERLAPPING_MOVEMENT = 2
+    HOLDING_SHIFT = 3
+    HOLDING_CTRL = 4
+    FIRING_TOO_EARLY = 5
+    FIRED_TOO_LATE = 6
+
+
+# The members again as plain module constants, for the per-shot paths:
+# before Python 3.12 EnumType defines __getattr__, which makes every
+# ``ShotLabel.X`` lookup allocate a bound method.
+(
+    LABEL_BAD,
+    LABEL_COUNTER_STRAFE,
+    LABEL_OVERLAP,
+    LABEL_PERFECT,
+    LABEL_GOOD,
+    LABEL_NOT_DETECTED,
+    LABEL_UNKNOWN,
+) = ShotLabel
+(
+    SUB_LABEL_NONE,
+    SUB_LABEL_NO_COUNTER_STRAFE,
+    SUB_LABEL_OVERLAPPING_MOVEMENT,
+    SUB_LABEL_HOLDING_SHIFT,
+    SUB_LABEL_HOLDING_CTRL,
+    SUB_LABEL_FIRING_TOO_EARLY,
+    SUB_LABEL_FIRED_TOO_LATE,
+) = SubLabel
+
+
+LABEL_NAMES = ("Bad", "Counter-strafe", "Overlap", "Perfect", "Good", "Not detected", "Unknown")
+SUB_LABEL_NAMES = (
+    None,
+    "No counter-strafe",
+    "Overlapping movement",
+    "Holding Shift",
+    "Holding Ctrl",
+    "Firing too early",
+    "Fired too late",
+)
+
+_LABEL_IDS = {name: ShotLabel(i) for i, name in enumerate(LABEL_NAMES)}
+_SUB_LABEL_IDS = {name: SubLabel(i) for i, name in enumerate(SUB_LABEL_NAMES)}
+
+
+def label_id(label: Union[str, int]) -> ShotLabel:
+    """
+    Accept a ShotLabel or its display name and return the ShotLabel.
+    Unrecognised names map to ShotLabel.UNKNOWN, which every filter treats
+    as Bad.
+    """
+    if label.__class__ is ShotLabel:
+        return label
+    if isinstance(label, str):
+        return _LABEL_IDS.get(label, ShotLabel.UNKNOWN)
+    return ShotLabel(label)
+
+
+def sub_label_id(sub_label: Union[str, int, None]) -> SubLabel:
+    """Accept a SubLabel, its display name or None and return the SubLabel."""
+    if sub_label.__class__ is SubLabel:
+        return sub_label
+    if sub_label is None or isinstance(sub_label, str):
+        try:
+            return _SUB_LABEL_IDS[sub_label]
+        except KeyError:
+            raise ValueError(f"unknown sub-label {sub_label!r}") from None
+    return SubLabel(sub_label)
+
+
+def sub_label_name(sub_label: SubLabel) -> Optional[str]:
+    return SUB_LABEL_NAMES[sub_label]
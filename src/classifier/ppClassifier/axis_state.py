@@ -1,114 +1,27 @@
-from typing import Optional, Tuple, Set, Dict
+from ..axis_engine import AxisConfig, AxisEngine
 
-from ..base import AxisStateInterface
 
-
-class AxisState(AxisStateInterface):
+class AxisState(AxisEngine):
     """
     Tracks the state of a single movement axis (e.g. A/D or W/S).
 
-    Identical detection logic to cs2KitchenClassifier's AxisState.
-    All timestamps are in milliseconds.
+    Same detection core as cs2KitchenClassifier's AxisState, plus:
+      - a press from a complete stand-still (nothing held, no pending CS)
+        clears a stale overlap recorded by a prior sequence that was never
+        shot, so it cannot corrupt CS tracking for the new movement;
+      - releasing the counter-press key itself (the brief D/A tap to stop
+        momentum) preserves cs_press_key/time so classify_shot can still
+        detect the counter-strafe;
+      - a long press clears micro_candidate_duration on release.
     Always returns a 3-tuple from classify_shot.
     """
 
-    MICRO_CANDIDATE_THRESHOLD_MS = 80.0
-
-    def __init__(self, keys: Tuple[str, str]) -> None:
-        self.keys: Tuple[str, str] = keys
-        self.held_keys: Set[str] = set()
-        self.press_times: Dict[str, float] = {}
-        self.cs_release_key: Optional[str] = None
-        self.cs_release_time: Optional[float] = None
-        self.cs_press_key: Optional[str] = None
-        self.cs_press_time: Optional[float] = None
-        self.overlap_start_time: Optional[float] = None
-        self.micro_candidate_duration: Optional[float] = None
-
-    def on_press(self, key: str, timestamp: float) -> None:
-        if key not in self.keys:
-            return
-        other = self.keys[0] if key == self.keys[1] else self.keys[1]
-        # If we're starting a fresh movement from a complete stand-still
-        # (nothing held, no pending CS escape) while a stale overlap is
-        # recorded from a prior sequence where no shot was fired, clear all
-        # state so the stale overlap doesn't corrupt CS tracking for the new
-        # movement.  The overlap_start_time is preserved only for the live
-        # shot detection in classify_shot; once a new movement begins from
-        # rest it is no longer relevant.
-        if not self.held_keys and self.cs_press_key is None and self.overlap_start_time is not None:
-            self._reset()
-        self.held_keys.add(key)
-        self.press_times[key] = timestamp
-        if other in self.held_keys and self.overlap_start_time is None:
-            self.overlap_start_time = timestamp
-        if self.cs_release_key == other and self.cs_press_time is None:
-            self.cs_press_key = key
-            self.cs_press_time = timestamp
-        self.micro_candidate_duration = None
-
-    def on_release(self, key: str, timestamp: float) -> None:
-        if key not in self.keys:
-            return
-        press_time = self.press_times.get(key)
-        if press_time is not None:
-            duration = timestamp - press_time
-            if duration < self.MICRO_CANDIDATE_THRESHOLD_MS:
-                self.micro_candidate_duration = duration
-            else:
-                self.micro_candidate_duration = None
-        self.held_keys.discard(key)
-        # Only start a new CS tracking cycle when releasing a key that is NOT
-        # the counter-press key.  If the player releases the CS key itself
-        # (the brief D/A tap to stop momentum) we must preserve cs_press_key/time
-        # so that classify_shot can still detect the counter-strafe.
-        if key != self.cs_press_key:
-            self.cs_release_key = key
-            self.cs_release_time = timestamp
-            self.cs_press_key = None
-            self.cs_press_time = None
+    __slots__ = ()
 
-    def classify_shot(self, shot_time: float) -> Tuple[str, Optional[float], Optional[float]]:
-        """
-        Returns a 3-tuple:
-          ("Counter-strafe", cs_time_ms, shot_delay_ms)
-          ("Overlap",        overlap_time_ms, None)
-          ("Bad",            None, None)
-        """
-        if self.overlap_start_time is not None:
-            if not (
-                self.cs_press_time is not None
-                and self.cs_release_time is not None
-                and self.cs_release_time > self.overlap_start_time
-                and self.cs_press_time > self.cs_release_time
-            ):
-                overlap_time = shot_time - self.overlap_start_time
-                self._reset()
-                return "Overlap", overlap_time, None
-
-        if (
-            self.cs_press_time is not None
-            and self.cs_release_time is not None
-            and self.cs_press_time > self.cs_release_time
-        ):
-            cs_time = self.cs_press_time - self.cs_release_time
-            shot_delay = shot_time - self.cs_press_time
-            self._reset()
-            return "Counter-strafe", cs_time, shot_delay
-
-        if self.held_keys:
-            reason = "still moving"
-        elif self.cs_release_key is not None:
-            reason = "no counter-press"
-        else:
-            reason = "no movement"
-        self._reset()
-        return "Bad", None, reason
-
-    def _reset(self) -> None:
-        self.cs_release_key = None
-        self.cs_release_time = None
-        self.cs_press_key = None
-        self.cs_press_time = None
-        self.overlap_start_time = None
-        self.micro_candidate_duration = None
+    MICRO_CANDIDATE_THRESHOLD_MS = 80.0
+    CONFIG = AxisConfig(
+        reset_stale_overlap_on_press=True,
+        keep_cs_press_on_release=True,
+        clear_micro_on_long_release=True,
+        micro_candidate_threshold_ms=MICRO_CANDIDATE_THRESHOLD_MS,
+    )
@@ -1,20 +1,34 @@
-from typing import Optional, Tuple
+from typing import List, Optional, Sequence, Tuple, Union
 
 from .axis_state import AxisState
 from .shot_classification import ShotClassification
 from .shot_filter import ShotFilter
+from ..axis_engine import AXIS_SNAPSHOT_SIZE
 from ..base import DebugLogger, MovementClassifierInterface
-
-
-def _fmt_axis(label: str, val1: Optional[float], val2) -> str:
-    """Format a single axis result tuple as a human-readable string."""
-    if label == "Counter-strafe" and val1 is not None and val2 is not None:
-        return f"Counter-strafe | CS: {val1:.0f} ms | Delay: {val2:.0f} ms"
-    if label == "Overlap" and val1 is not None:
-        return f"Overlap | {val1:.0f} ms"
-    if label == "Bad" and val2 is not None:
-        return f"Bad ({val2})"
-    return label
+from ..events import EVENT_PRESS, EVENT_SHOT
+from ..key_codes import KEY_CTRL, KEY_NONE, KEY_SHIFT, MODIFIER_BIT, KeyMap
+from ..labels import LABEL_BAD, LABEL_NOT_DETECTED, SUB_LABEL_NO_COUNTER_STRAFE
+from ..trace import (
+    TRACE_AXIS_H,
+    TRACE_AXIS_V,
+    TRACE_KEY_PRESS,
+    TRACE_KEY_RELEASE,
+    TRACE_MODIFIERS,
+    TRACE_SHOT,
+    TRACE_SHOT_IDLE,
+)
+
+
+def _to_ms(result: Tuple, ticks_per_ms: float) -> Tuple:
+    """Convert the durations in an axis result tuple from ticks to milliseconds."""
+    # Takes the tuple whole: star-calling ``_to_ms(*result, tpm)`` would
+    # build a list on every shot.
+    label, val1, val2 = result
+    if val1 is not None:
+        val1 = val1 / ticks_per_ms
+    if label == "Counter-strafe" and val2 is not None:
+        val2 = val2 / ticks_per_ms
+    return label, val1, val2
 
 
 class MovementClassifier(MovementClassifierInterface):
@@ -24,9 +38,14 @@ class MovementClassifier(MovementClassifierInterface):
     Tracks horizontal and vertical movement axes plus left Shift and left Ctrl.
     Fires "Not detected" when no movement key was pressed within 500 ms of the shot.
 
-    Key strings for special keys:
+    Keys are integer codes from ``key_codes`` (KEY_SHIFT / KEY_CTRL for the
+    modifiers).  Key names are still accepted and translated through a
+    KeyMap; the names for special keys are:
         Shift  → "SHIFT"
         Ctrl   → "CTRL"
+
+    Timestamps are integer clock ticks (``ticks_per_ms`` per millisecond);
+    durations on the returned ShotClassification are in milliseconds.
     """
 
     NO_MOVEMENT_WINDOW_MS = 500.0
@@ -37,6 +56,7 @@ class MovementClassifier(MovementClassifierInterface):
         vertical_keys: Tuple[str, str] = ("W", "S"),
         horizontal_keys: Tuple[str, str] = ("A", "D"),
         debug_logger: Optional[DebugLogger] = None,
+        ticks_per_ms: float = 1,
     ) -> None:
         v_keys = tuple(key.upper() for key in vertical_keys)
         h_keys = tuple(key.upper() for key in horizontal_keys)
@@ -48,106 +68,140 @@ class MovementClassifier(MovementClassifierInterface):
             raise ValueError(
                 f"horizontal_keys must contain two distinct keys, got {horizontal_keys}"
             )
-        self.vertical = AxisState(keys=v_keys)
-        self.horizontal = AxisState(keys=h_keys)
+        self.vertical = AxisState(keys=v_keys, ticks_per_ms=ticks_per_ms)
+        self.horizontal = AxisState(keys=h_keys, ticks_per_ms=ticks_per_ms)
+        self._ticks_per_ms = ticks_per_ms
+        self._no_movement_window = self.NO_MOVEMENT_WINDOW_MS * ticks_per_ms
         self._shot_filter = ShotFilter()
+        # Scratch for the unfiltered result; never handed to callers.
+        self._raw = ShotClassification(LABEL_NOT_DETECTED)
+        # Bound once: looking a classmethod up binds a new method each time.
+        self._merge_axes = ShotClassification.from_axis_results
         self._shift_held: bool = False
         self._ctrl_held: bool = False
         self._last_movement_time: float = None  # type: ignore[assignment]
-        self._debug = debug_logger
 
-        self._all_movement_keys = set(v_keys) | set(h_keys)
+        self._axes = (self.vertical, self.horizontal)
+        self._key_map = KeyMap(v_keys, h_keys)
+        self._trace = debug_logger.tracer(self._key_map.names, ticks_per_ms) if debug_logger else None
 
-    def on_press(self, key: str, timestamp: float) -> None:
-        upper = key.upper()
+    def on_press(self, key: Union[int, str], timestamp: float) -> None:
+        code = key if key.__class__ is int else self._key_map.code(key)
 
-        if upper == "SHIFT":
+        if code == KEY_SHIFT:
             self._shift_held = True
-            if self._debug:
-                self._debug.log(f"[KEY PRESS] SHIFT @ {timestamp:.0f} ms")
-            return
-        if upper == "CTRL":
+        elif code == KEY_CTRL:
             self._ctrl_held = True
-            if self._debug:
-                self._debug.log(f"[KEY PRESS] CTRL @ {timestamp:.0f} ms")
-            return
-
-        if upper in self.vertical.keys:
-            if self._debug:
-                self._debug.log(f"[KEY PRESS] {upper} @ {timestamp:.0f} ms")
-            self.vertical.on_press(upper, timestamp)
-            self._last_movement_time = timestamp
-        elif upper in self.horizontal.keys:
-            if self._debug:
-                self._debug.log(f"[KEY PRESS] {upper} @ {timestamp:.0f} ms")
-            self.horizontal.on_press(upper, timestamp)
+        elif 0 <= code < MODIFIER_BIT:
+            self._axes[code >> 1].press(code & 1, timestamp)
             self._last_movement_time = timestamp
+        else:
+            return
+        if self._trace is not None:
+            self._trace.emit(TRACE_KEY_PRESS, code, timestamp)
 
-    def on_release(self, key: str, timestamp: float) -> None:
-        upper = key.upper()
+    def on_release(self, key: Union[int, str], timestamp: float) -> None:
+        code = key if key.__class__ is int else self._key_map.code(key)
 
-        if upper == "SHIFT":
+        if code == KEY_SHIFT:
             self._shift_held = False
-            if self._debug:
-                self._debug.log(f"[KEY RELEASE] SHIFT @ {timestamp:.0f} ms")
-            return
-        if upper == "CTRL":
+        elif code == KEY_CTRL:
             self._ctrl_held = False
-            if self._debug:
-                self._debug.log(f"[KEY RELEASE] CTRL @ {timestamp:.0f} ms")
+        elif 0 <= code < MODIFIER_BIT:
+            self._axes[code >> 1].release(code & 1, timestamp)
+        else:
             return
+        if self._trace is not None:
+            self._trace.emit(TRACE_KEY_RELEASE, code, timestamp)
+
+    def feed(self, events: Sequence[int]) -> List[ShotClassification]:
+        if self._trace is not None:
+            # The per-event path keeps the debug log complete.
+            return super().feed(events)
+        vertical, horizontal = self._axes
+        presses = (vertical.press, vertical.press, horizontal.press, horizontal.press)
+        releases = (vertical.release, vertical.release, horizontal.release, horizontal.release)
+        classify = self.classify_shot
+        results: List[ShotClassification] = []
+        append = results.append
+        it = iter(events)
+        for kind, key, timestamp in zip(it, it, it):
+            if kind == EVENT_SHOT:
+                append(classify(timestamp))
+            elif 0 <= key < MODIFIER_BIT:
+                if kind == EVENT_PRESS:
+                    presses[key](key & 1, timestamp)
+                    self._last_movement_time = timestamp
+                else:
+                    releases[key](key & 1, timestamp)
+            elif key == KEY_SHIFT:
+                self._shift_held = kind == EVENT_PRESS
+            elif key == KEY_CTRL:
+                self._ctrl_held = kind == EVENT_PRESS
+        return results
+
+    def snapshot(self) -> Tuple[Optional[float], ...]:
+        return (
+            *self.vertical.snapshot(),
+            *self.horizontal.snapshot(),
+            int(self._shift_held),
+            int(self._ctrl_held),
+            self._last_movement_time,
+        )
+
+    def restore(self, state: Sequence[Optional[float]]) -> None:
+        axes = 2 * AXIS_SNAPSHOT_SIZE
+        self.vertical.restore(state[:AXIS_SNAPSHOT_SIZE])
+        self.horizontal.restore(state[AXIS_SNAPSHOT_SIZE:axes])
+        shift, ctrl, self._last_movement_time = state[axes:]
+        self._shift_held = bool(shift)
+        self._ctrl_held = bool(ctrl)
 
-        if upper in self.vertical.keys:
-            if self._debug:
-                self._debug.log(f"[KEY RELEASE] {upper} @ {timestamp:.0f} ms")
-            self.vertical.on_release(upper, timestamp)
-        elif upper in self.horizontal.keys:
-            if self._debug:
-                self._debug.log(f"[KEY RELEASE] {upper} @ {timestamp:.0f} ms")
-            self.horizontal.on_release(upper, timestamp)
+    def classify_shot(
+        self,
+        shot_time: float,
+        out: Optional[ShotClassification] = None,
+    ) -> ShotClassification:
+        if out is None:
+            out = ShotClassification(LABEL_NOT_DETECTED)
 
-    def classify_shot(self, shot_time: float) -> ShotClassification:
         # "Not detected": no movement at all, or last movement was > 500 ms ago
         if (
             self._last_movement_time is None
-            or (shot_time - self._last_movement_time) >= self.NO_MOVEMENT_WINDOW_MS
+            or (shot_time - self._last_movement_time) >= self._no_movement_window
         ):
-            if self._debug:
-                idle = (
-                    shot_time - self._last_movement_time
-                    if self._last_movement_time is not None
-                    else None
-                )
-                idle_str = f"{idle:.0f} ms ago" if idle is not None else "never"
-                self._debug.log(f"[SHOT] \u2192 Not detected (last move: {idle_str})")
+            if self._trace is not None:
+                self._trace.emit(TRACE_SHOT_IDLE, KEY_NONE, shot_time, self._last_movement_time)
             # Still need to reset axis state so it doesn't bleed into next shot
             self.vertical.classify_shot(shot_time)
             self.horizontal.classify_shot(shot_time)
-            return ShotClassification(label="Not detected")
+            return out.fill(LABEL_NOT_DETECTED)
 
-        h_result = self.horizontal.classify_shot(shot_time)
-        v_result = self.vertical.classify_shot(shot_time)
+        tpm = self._ticks_per_ms
+        h_result = _to_ms(self.horizontal.classify_shot(shot_time), tpm)
+        v_result = _to_ms(self.vertical.classify_shot(shot_time), tpm)
 
-        if self._debug:
-            self._debug.log(f"[AXIS:H] {_fmt_axis(*h_result)}")
-            self._debug.log(f"[AXIS:V] {_fmt_axis(*v_result)}")
+        trace = self._trace
+        if trace is not None:
+            trace.emit(TRACE_AXIS_H, KEY_NONE, shot_time, h_result)
+            trace.emit(TRACE_AXIS_V, KEY_NONE, shot_time, v_result)
             if self._shift_held or self._ctrl_held:
-                mods = " + ".join(k for k, v in [("SHIFT", self._shift_held), ("CTRL", self._ctrl_held)] if v)
-                self._debug.log(f"[MOD] {mods}")
+                trace.emit(TRACE_MODIFIERS, KEY_NONE, shot_time, (self._shift_held, self._ctrl_held))
 
-        raw = ShotClassification.from_axis_results(
+        raw = self._merge_axes(
             h_result,
             v_result,
             shift_held=self._shift_held,
             ctrl_held=self._ctrl_held,
+            out=self._raw,
         )
 
-        if raw.label == "Bad" and h_result[0] == "Bad" and v_result[0] == "Bad":
-            raw.sub_label = "No counter-strafe"
+        if raw.label_id == LABEL_BAD and h_result[0] == "Bad" and v_result[0] == "Bad":
+            raw.sub_label_id = SUB_LABEL_NO_COUNTER_STRAFE
 
-        final = self._shot_filter.apply(raw)
+        final = self._shot_filter.apply(raw, out)
 
-        if self._debug:
-            self._debug.log(f"[SHOT] \u2192 {final.label}")
+        if trace is not None:
+            trace.emit(TRACE_SHOT, KEY_NONE, shot_time, (final.label, None, None))
 
         return final
@@ -1,6 +1,17 @@
-from typing import Optional, Tuple
+from typing import Optional, Tuple, Union
 
 from ..base import ShotClassificationInterface
+from ..labels import (
+    LABEL_BAD,
+    LABEL_COUNTER_STRAFE,
+    LABEL_NAMES,
+    LABEL_OVERLAP,
+    SUB_LABEL_NAMES,
+    ShotLabel,
+    SubLabel,
+    label_id,
+    sub_label_id,
+)
 
 
 class ShotClassification(ShotClassificationInterface):
@@ -11,35 +22,93 @@ class ShotClassification(ShotClassificationInterface):
     Raw label from axes before filtering: "Counter-strafe", "Overlap", "Bad".
 
     Attributes:
-        label:        Final label after ShotFilter processing.
+        label_id:     Final ShotLabel after ShotFilter processing
+                      (``label`` is its display name).
         cs_time:      Gap between key release and opposite key press (ms).
         shot_delay:   Gap between opposite key press and shot (ms).
         overlap_time: Duration of key overlap before shot (ms).
-        sub_label:    Optional fine-grained reason (e.g. "Firing too early").
+        sub_label_id: Optional fine-grained SubLabel (``sub_label`` is its
+                      display name, e.g. "Firing too early", or None).
         shift_held:   Whether left Shift was held at shot time.
         ctrl_held:    Whether left Ctrl was held at shot time.
+
+    ``fill()`` overwrites every field in place so a caller can reuse one
+    preallocated result per shot.
     """
 
+    __slots__ = (
+        "label_id",
+        "cs_time",
+        "shot_delay",
+        "overlap_time",
+        "sub_label_id",
+        "shift_held",
+        "ctrl_held",
+    )
+
     def __init__(
         self,
-        label: str,
+        label: Union[str, ShotLabel],
         cs_time: Optional[float] = None,
         shot_delay: Optional[float] = None,
         overlap_time: Optional[float] = None,
-        sub_label: Optional[str] = None,
+        sub_label: Union[str, SubLabel, None] = None,
         shift_held: bool = False,
         ctrl_held: bool = False,
     ) -> None:
-        self.label = label
+        self.label_id = label_id(label)
+        self.cs_time = cs_time
+        self.shot_delay = shot_delay
+        self.overlap_time = overlap_time
+        self.sub_label_id = sub_label_id(sub_label)
+        self.shift_held = shift_held
+        self.ctrl_held = ctrl_held
+
+    @property
+    def label(self) -> str:
+        return LABEL_NAMES[self.label_id]
+
+    @property
+    def sub_label(self) -> Optional[str]:
+        return SUB_LABEL_NAMES[self.sub_label_id]
+
+    @sub_label.setter
+    def sub_label(self, value: Union[str, SubLabel, None]) -> None:
+        self.sub_label_id = sub_label_id(value)
+
+    def fill(
+        self,
+        label: ShotLabel,
+        cs_time: Optional[float] = None,
+        shot_delay: Optional[float] = None,
+        overlap_time: Optional[float] = None,
+        sub_label: SubLabel = SubLabel.NONE,
+        shift_held: bool = False,
+        ctrl_held: bool = False,
+    ) -> "ShotClassification":
+        self.label_id = label
         self.cs_time = cs_time
         self.shot_delay = shot_delay
         self.overlap_time = overlap_time
-        self.sub_label = sub_label
+        self.sub_label_id = sub_label
         self.shift_held = shift_held
         self.ctrl_held = ctrl_held
+        return self
+
+    def copy_from(self, other: "ShotClassification") -> "ShotClassification":
+        return self.fill(
+            other.label_id,
+            other.cs_time,
+            other.shot_delay,
+            other.overlap_time,
+            other.sub_label_id,
+            other.shift_held,
+            other.ctrl_held,
+        )
 
     def to_display_string(self) -> str:
-        if self.label in ("Perfect", "Good"):
+        label = self.label_id
+        if label == ShotLabel.PERFECT or label == ShotLabel.GOOD:
             lines = [f"Classification: {self.label}"]
             if self.cs_time is not None:
                 lines.append(f"CS time: {self.cs_time:.0f} ms")
@@ -47,7 +116,7 @@ class ShotClassification(ShotClassificationInterface):
                 lines.append(f"Shot delay: {self.shot_delay:.0f} ms")
             return "\n".join(lines)
 
-        if self.label == "Counter-strafe":
+        if label == ShotLabel.COUNTER_STRAFE:
             lines = ["Classification: Counter-strafe"]
             if self.cs_time is not None:
                 lines.append(f"CS time: {self.cs_time:.0f} ms")
@@ -55,18 +124,18 @@ class ShotClassification(ShotClassificationInterface):
                 lines.append(f"Shot delay: {self.shot_delay:.0f} ms")
             return "\n".join(lines)
 
-        if self.label == "Overlap":
+        if label == ShotLabel.OVERLAP:
             lines = ["Classification: Overlap"]
             if self.overlap_time is not None:
                 lines.append(f"Overlap: {self.overlap_time:.0f} ms")
             return "\n".join(lines)
 
-        if self.label == "Not detected":
+        if label == ShotLabel.NOT_DETECTED:
             return "Classification: Not detected"
 
         # Bad — with or without timing
         lines = ["Classification: Bad"]
-        if self.sub_label:
+        if self.sub_label_id:
             lines.append(self.sub_label)
         if self.overlap_time is not None:
             lines.append(f"Overlap: {self.overlap_time:.0f} ms")
@@ -82,33 +151,45 @@ class ShotClassification(ShotClassificationInterface):
         v_result: Tuple,
         shift_held: bool = False,
         ctrl_held: bool = False,
+        out: Optional["ShotClassification"] = None,
     ) -> "ShotClassification":
         """
         Merge two axis 3-tuples into a single raw ShotClassification.
         Priority: Overlap > Counter-strafe (larger cs_time wins tie) > Bad.
+        Horizontal wins an exact tie.  Fills ``out`` when given.
         """
-        results = [h_result, v_result]
-
-        overlap_results = [r for r in results if r[0] == "Overlap"]
-        if overlap_results:
-            best = max(overlap_results, key=lambda r: r[1] if r[1] is not None else 0.0)
-            return cls(
-                label="Overlap",
-                overlap_time=best[1],
+        if out is None:
+            out = cls(LABEL_BAD)
+        h_label, h_val1, h_val2 = h_result
+        v_label, v_val1, v_val2 = v_result
+
+        if h_label == "Overlap" or v_label == "Overlap":
+            use_h = _prefer_horizontal("Overlap", h_label, h_val1, v_label, v_val1)
+            return out.fill(
+                LABEL_OVERLAP,
+                overlap_time=h_val1 if use_h else v_val1,
                 shift_held=shift_held,
                 ctrl_held=ctrl_held,
             )
 
-        cs_results = [r for r in results if r[0] == "Counter-strafe"]
-        if cs_results:
+        if h_label == "Counter-strafe" or v_label == "Counter-strafe":
             # Larger cs_time wins the tie-break (most conservative / worst CS)
-            best = max(cs_results, key=lambda r: r[1] if r[1] is not None else 0.0)
-            return cls(
-                label="Counter-strafe",
-                cs_time=best[1],
-                shot_delay=best[2],
+            use_h = _prefer_horizontal("Counter-strafe", h_label, h_val1, v_label, v_val1)
+            return out.fill(
+                LABEL_COUNTER_STRAFE,
+                cs_time=h_val1 if use_h else v_val1,
+                shot_delay=h_val2 if use_h else v_val2,
                 shift_held=shift_held,
                 ctrl_held=ctrl_held,
             )
 
-        return cls(label="Bad", shift_held=shift_held, ctrl_held=ctrl_held)
+        return out.fill(LABEL_BAD, shift_held=shift_held, ctrl_held=ctrl_held)
+
+
+def _prefer_horizontal(label: str, h_label: str, h_val1, v_label: str, v_val1) -> bool:
+    """Pick between axes with ``label`` by larger val1 (None counts as 0); horizontal wins ties."""
+    if h_label != label:
+        return False
+    if v_label != label:
+        return True
+    return (h_val1 if h_val1 is not None else 0.0) >= (v_val1 if v_val1 is not None else 0.0)
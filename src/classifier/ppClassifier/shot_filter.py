@@ -1,5 +1,19 @@
+from typing import Optional
+
 from .shot_classification import ShotClassification
 from ..base import ShotFilterInterface, ShotClassificationInterface
+from ..labels import (
+    LABEL_BAD,
+    LABEL_COUNTER_STRAFE,
+    LABEL_GOOD,
+    LABEL_OVERLAP,
+    LABEL_PERFECT,
+    SUB_LABEL_FIRED_TOO_LATE,
+    SUB_LABEL_FIRING_TOO_EARLY,
+    SUB_LABEL_HOLDING_CTRL,
+    SUB_LABEL_HOLDING_SHIFT,
+    SUB_LABEL_OVERLAPPING_MOVEMENT,
+)
 
 
 class ShotFilter(ShotFilterInterface):
@@ -15,72 +29,81 @@ class ShotFilter(ShotFilterInterface):
       - 300 < delay <= 500               → Good
       - delay > 500                      → Bad
       - otherwise                        → Bad
+
+    Pass ``out`` to have the result written into a preallocated
+    ShotClassification (which may be ``raw`` itself) instead of a new one.
     """
 
     MIN_SHOT_DELAY = 80.0       # Minimum ms for a valid (non-early) CS
     PERFECT_MAX = 300.0         # Upper bound (inclusive) for "Perfect"
     GOOD_MAX = 500.0            # Upper bound (inclusive) for "Good"
 
-    def apply(self, raw: ShotClassificationInterface) -> ShotClassification:
+    def apply(
+        self,
+        raw: ShotClassificationInterface,
+        out: Optional[ShotClassification] = None,
+    ) -> ShotClassification:
         assert isinstance(raw, ShotClassification)
 
-        if raw.label == "Not detected":
-            return raw
+        label = raw.label_id
+        if label != LABEL_OVERLAP and label != LABEL_COUNTER_STRAFE:
+            # "Not detected", "Bad" and any unexpected labels pass through
+            return raw if out is None else out.copy_from(raw)
 
-        if raw.label == "Overlap":
-            return ShotClassification(
-                label="Bad",
-                sub_label="Overlapping movement",
+        if out is None:
+            out = ShotClassification(LABEL_BAD)
+
+        if label == LABEL_OVERLAP:
+            return out.fill(
+                LABEL_BAD,
+                sub_label=SUB_LABEL_OVERLAPPING_MOVEMENT,
                 overlap_time=raw.overlap_time,
             )
 
-        if raw.label == "Counter-strafe":
-            cs_time = raw.cs_time
-            shot_delay = raw.shot_delay
-
-            if raw.shift_held:
-                return ShotClassification(
-                    label="Bad",
-                    sub_label="Holding Shift",
-                    cs_time=cs_time,
-                    shot_delay=shot_delay,
-                )
-
-            if raw.ctrl_held:
-                return ShotClassification(
-                    label="Bad",
-                    sub_label="Holding Ctrl",
-                    cs_time=cs_time,
-                    shot_delay=shot_delay,
-                )
-
-            if shot_delay is None:
-                return ShotClassification(label="Bad")
-
-            if shot_delay < self.MIN_SHOT_DELAY:
-                return ShotClassification(
-                    label="Bad",
-                    sub_label="Firing too early",
-                    cs_time=cs_time,
-                    shot_delay=shot_delay,
-                )
-
-            if self.MIN_SHOT_DELAY <= shot_delay <= self.PERFECT_MAX:
-                return ShotClassification(
-                    label="Perfect",
-                    cs_time=cs_time,
-                    shot_delay=shot_delay,
-                )
-
-            if self.PERFECT_MAX < shot_delay <= self.GOOD_MAX:
-                return ShotClassification(
-                    label="Good",
-                    cs_time=cs_time,
-                    shot_delay=shot_delay,
-                )
-
-            # shot_delay > GOOD_MAX (> 500 ms)
-            return ShotClassification(label="Bad", sub_label="Fired too late", cs_time=cs_time, shot_delay=shot_delay)
-
-        # "Bad" and any unexpected labels
-        return raw
+        # Counter-strafe
+        cs_time = raw.cs_time
+        shot_delay = raw.shot_delay
+
+        if raw.shift_held:
+            return out.fill(
+                LABEL_BAD,
+                sub_label=SUB_LABEL_HOLDING_SHIFT,
+                cs_time=cs_time,
+                shot_delay=shot_delay,
+            )
+
+        if raw.ctrl_held:
+            return out.fill(
+                LABEL_BAD,
+                sub_label=SUB_LABEL_HOLDING_CTRL,
+                cs_time=cs_time,
+                shot_delay=shot_delay,
+            )
+
+        if shot_delay is None:
+            return out.fill(LABEL_BAD)
+
+        if shot_delay < self.MIN_SHOT_DELAY:
+            return out.fill(
+                LABEL_BAD,
+                sub_label=SUB_LABEL_FIRING_TOO_EARLY,
+                cs_time=cs_time,
+                shot_delay=shot_delay,
+            )
+
+        if self.MIN_SHOT_DELAY <= shot_delay <= self.PERFECT_MAX:
+            return out.fill(
+                LABEL_PERFECT,
+                cs_time=cs_time,
+                shot_delay=shot_delay,
+            )
+
+        if self.PERFECT_MAX < shot_delay <= self.GOOD_MAX:
+            return out.fill(
+                LABEL_GOOD,
+                cs_time=cs_time,
+                shot_delay=shot_delay,
+            )
+
+        # shot_delay > GOOD_MAX (> 500 ms)
+        return out.fill(LABEL_BAD, sub_label=SUB_LABEL_FIRED_TOO_LATE, cs_time=cs_time, shot_delay=shot_delay)
@@ -0,0 +1,81 @@
+"""Structured classifier trace events.
+
+Classifiers no longer format debug strings on the input path.  With a
+DebugLogger attached they emit a TraceEvent -- a tuple of an event code, a
+key code, a timestamp in ticks and an event-specific payload -- and the sink
+decides what to do with it: ``str(event)`` renders the familiar debug-panel
+line, while a file or network exporter can keep the raw fields.  Without a
+logger the cost is the one ``is not None`` check in front of each emit.
+
+Payloads:
+
+    TRACE_KEY_PRESS / TRACE_KEY_RELEASE   None
+    TRACE_AXIS_V / TRACE_AXIS_H           axis result tuple, durations in ms
+    TRACE_MODIFIERS                       (shift held, ctrl held)
+    TRACE_SHOT                            final (label, val1, val2) tuple
+    TRACE_SHOT_IDLE                       tick of the last movement, or None
+"""
+
+from typing import Any, Callable, NamedTuple, Optional, Sequence
+
+TRACE_KEY_PRESS = 0
+TRACE_KEY_RELEASE = 1
+TRACE_AXIS_V = 2
+TRACE_AXIS_H = 3
+TRACE_MODIFIERS = 4
+TRACE_SHOT = 5
+TRACE_SHOT_IDLE = 6  # shot with no recent movement (pp "Not detected")
+
+TRACE_NAMES = ("KEY PRESS", "KEY RELEASE", "AXIS:V", "AXIS:H", "MOD", "SHOT", "SHOT")
+
+
+def format_axis(label: str, val1: Optional[float], val2: Any) -> str:
+    """Format a single axis result tuple (durations in ms) as a human-readable string."""
+    if label == "Counter-strafe" and val1 is not None and val2 is not None:
+        return f"Counter-strafe | CS: {val1:.0f} ms | Delay: {val2:.0f} ms"
+    if label == "Overlap" and val1 is not None:
+        return f"Overlap | {val1:.0f} ms"
+    if label == "Bad" and val2 is not None:
+        return f"Bad ({val2})"
+    return label
+
+
+class Tracer:
+    """
+    A classifier's handle on a DebugLogger: it remembers the key names and
+    tick rate a sink needs to render the classifier's events.
+    """
+
+    __slots__ = ("key_names", "ticks_per_ms", "_sink")
+
+    def __init__(self, sink: Callable[[Any], None], key_names: Sequence[str], ticks_per_ms: float) -> None:
+        self.key_names = tuple(key_names)
+        self.ticks_per_ms = ticks_per_ms
+        self._sink = sink
+
+    def emit(self, event: int, key: int, timestamp: float, data: Any = None) -> None:
+        self._sink(TraceEvent(event, key, timestamp, data, self))
+
+
+class TraceEvent(NamedTuple):
+    event: int
+    key: int
+    timestamp: float  # ticks
+    data: Any
+    tracer: Tracer
+
+    def __str__(self) -> str:
+        event, key, timestamp, data, tracer = self
+        name = TRACE_NAMES[event]
+        if event == TRACE_KEY_PRESS or event == TRACE_KEY_RELEASE:
+            return f"[{name}] {tracer.key_names[key]} @ {timestamp / tracer.ticks_per_ms:.0f} ms"
+        if event == TRACE_MODIFIERS:
+            shift, ctrl = data
+            return f"[{name}] " + " + ".join(m for m, held in (("SHIFT", shift), ("CTRL", ctrl)) if held)
+        if event == TRACE_SHOT_IDLE:
+            idle = "never" if data is None else f"{(timestamp - data) / tracer.ticks_per_ms:.0f} ms ago"
+            return f"[{name}] → Not detected (last move: {idle})"
+        if event == TRACE_SHOT:
+            return f"[{name}] → {format_axis(*data)}"
+        return f"[{name}] {format_axis(*data)}"
+
@@ -0,0 +1,58 @@
+"""Monotonic clocks used to timestamp input events.
+
+Every clock returns integer nanoseconds from a monotonic source, so event
+timestamps never jump when the wall clock is slewed and differences between
+them are exact.  Durations are converted to milliseconds only when they leave
+the classifier or are shown to the player.
+"""
+
+import time
+from abc import ABC, abstractmethod
+
+NS_PER_MS = 1_000_000
+
+
+def ns_to_ms(ns: int) -> float:
+    """Convert a nanosecond duration to (fractional) milliseconds."""
+    return ns / NS_PER_MS
+
+
+class Clock(ABC):
+    @abstractmethod
+    def now_ns(self) -> int:
+        """Return the current time as integer monotonic nanoseconds."""
+
+
+class PerfCounterClock(Clock):
+    """Highest-resolution monotonic clock available (``time.perf_counter_ns``)."""
+
+    now_ns = staticmethod(time.perf_counter_ns)
+
+
+class MonotonicClock(Clock):
+    """System monotonic clock (``time.monotonic_ns``).
+
+    Coarser than ``PerfCounterClock`` on some platforms but shares its epoch
+    with other processes, which makes it the better choice when timestamps
+    are compared against another source.
+    """
+
+    now_ns = staticmethod(time.monotonic_ns)
+
+
+class VirtualClock(Clock):
+    """Clock that only moves when told to; replay sets it to each event's time.
+
+    ``advance_to`` never moves the clock backwards, so it stays monotonic
+    even if a trace has out-of-order timestamps.
+    """
+
+    def __init__(self, start_ns: int = 0) -> None:
+        self._now = start_ns
+
+    def now_ns(self) -> int:
+        return self._now
+
+    def advance_to(self, timestamp_ns: int) -> None:
+        if timestamp_ns > self._now:
+            self._now = timestamp_ns
@@ -0,0 +1,255 @@
+"""Hand-off between the pynput hook threads and the classifier.
+
+The OS hook callbacks must return quickly, so they only stamp an event and
+push it onto a preallocated single-producer/single-consumer ring.  One
+consumer thread drains every ring in timestamp order and runs the
+classifier, shot filter and overlay updates.
+"""
+
+import threading
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Optional
+
+from classifier import MovementClassifierInterface, ShotFilterInterface
+from classifier.events import EVENT_PRESS, EVENT_SHOT
+from classifier.key_codes import KEY_LEFT, KEY_RIGHT
+from clock import NS_PER_MS
+from watchdog import timing_window_ns
+
+if TYPE_CHECKING:
+    from gc_monitor import GCMonitor
+    from latency import LatencyTracker
+    from overlay import Overlay
+    from session_log import SessionRecorder
+    from watchdog import StallWatchdog
+
+
+class EventRing:
+    """
+    Fixed-capacity single-producer/single-consumer ring of input events.
+
+    Exactly one thread may call ``push()`` and exactly one other thread may
+    call ``peek_time()``/``pop()``.  The producer only advances ``_tail`` and
+    the consumer only advances ``_head``; a slot is always written before the
+    index that publishes it, and under the GIL each of those stores is
+    atomic, so neither side takes a lock.  When the ring is full new events
+    are dropped and counted instead of blocking the hook thread.
+    """
+
+    __slots__ = ("capacity", "drops", "_mask", "_kinds", "_keys", "_stamps", "_head", "_tail")
+
+    def __init__(self, capacity: int = 1024) -> None:
+        if capacity <= 0 or capacity & (capacity - 1):
+            raise ValueError(f"capacity must be a power of two, got {capacity}")
+        self.capacity = capacity
+        self.drops = 0
+        self._mask = capacity - 1
+        self._kinds: list[int] = [0] * capacity
+        self._keys: list[Any] = [None] * capacity
+        self._stamps: list[int] = [0] * capacity
+        self._head = 0
+        self._tail = 0
+
+    def __len__(self) -> int:
+        return self._tail - self._head
+
+    def push(self, kind: int, key: Any, timestamp: int) -> bool:
+        """Append an event (producer side).  Returns False if it was dropped."""
+        tail = self._tail
+        if tail - self._head >= self.capacity:
+            self.drops += 1
+            return False
+        i = tail & self._mask
+        self._kinds[i] = kind
+        self._keys[i] = key
+        self._stamps[i] = timestamp
+        self._tail = tail + 1
+        return True
+
+    def peek_time(self) -> Optional[int]:
+        """Timestamp of the oldest queued event, or None when empty."""
+        head = self._head
+        if head == self._tail:
+            return None
+        return self._stamps[head & self._mask]
+
+    def pop(self) -> tuple[int, Any, int]:
+        """Remove and return the oldest event.  Call only when non-empty."""
+        head = self._head
+        i = head & self._mask
+        record = (self._kinds[i], self._keys[i], self._stamps[i])
+        self._head = head + 1
+        return record
+
+
+class PipelineStats:
+    """Counters kept by the consumer thread (never touched by producers)."""
+
+    __slots__ = ("events", "max_depth", "latency_total_ns", "latency_max_ns")
+
+    def __init__(self) -> None:
+        self.events = 0
+        self.max_depth = 0
+        self.latency_total_ns = 0
+        self.latency_max_ns = 0
+
+    def record(self, latency_ns: int) -> None:
+        self.events += 1
+        self.latency_total_ns += latency_ns
+        if latency_ns > self.latency_max_ns:
+            self.latency_max_ns = latency_ns
+
+
+class EventConsumer(threading.Thread):
+    """
+    Drains a set of EventRings in timestamp order on a dedicated thread.
+
+    ``handler(kind, key, timestamp)`` is called for every event; the time
+    from the event's timestamp until the handler returns is recorded in
+    ``stats``.  Producers call ``notify()`` after each push.
+    """
+
+    def __init__(
+        self,
+        rings: Iterable[EventRing],
+        handler: Callable[[int, Any, int], None],
+        now_ns: Callable[[], int],
+    ) -> None:
+        super().__init__(name="cstrafe-classifier", daemon=True)
+        self._rings = tuple(rings)
+        self._handler = handler
+        self._now_ns = now_ns
+        self._wake = threading.Event()
+        self._running = True
+        self.stats = PipelineStats()
+
+    def notify(self) -> None:
+        if not self._wake.is_set():
+            self._wake.set()
+
+    def stop(self, timeout: float = 1.0) -> None:
+        self._running = False
+        self._wake.set()
+        if self.is_alive() and threading.current_thread() is not self:
+            self.join(timeout)
+
+    def run(self) -> None:
+        wake = self._wake
+        while self._running:
+            wake.wait()
+            # Clear before draining so a push that lands mid-drain re-arms
+            # the event and is picked up on the next pass.
+            wake.clear()
+            self.drain()
+
+    def drain(self) -> int:
+        """Handle every queued event, oldest first; return how many ran."""
+        rings = self._rings
+        handler = self._handler
+        now_ns = self._now_ns
+        stats = self.stats
+        depth = sum(len(ring) for ring in rings)
+        if depth > stats.max_depth:
+            stats.max_depth = depth
+        handled = 0
+        while True:
+            best: Optional[EventRing] = None
+            best_time = 0
+            for ring in rings:
+                t = ring.peek_time()
+                if t is not None and (best is None or t < best_time):
+                    best, best_time = ring, t
+            if best is None:
+                return handled
+            kind, key, timestamp = best.pop()
+            handler(kind, key, timestamp)
+            stats.record(now_ns() - timestamp)
+            handled += 1
+
+    def snapshot(self) -> dict[str, float]:
+        """Return queue depth, drop and latency counters for display."""
+        stats = self.stats
+        mean_ns = stats.latency_total_ns / stats.events if stats.events else 0.0
+        return {
+            "depth": sum(len(ring) for ring in self._rings),
+            "max_depth": stats.max_depth,
+            "drops": sum(ring.drops for ring in self._rings),
+            "events": stats.events,
+            "latency_mean_ms": mean_ns / NS_PER_MS,
+            "latency_max_ms": stats.latency_max_ns / NS_PER_MS,
+        }
+
+
+class ClassifierSink:
+    """
+    Runs events through the classifier and shot filter and forwards the
+    outcome to the overlay (and the optional session recorder).  With a
+    LatencyTracker, every shot's queue, classify and filter times are
+    recorded before the result is handed to the overlay.  With a
+    StallWatchdog that flags shots, a shot whose timing window overlaps a
+    recent stall is shown and recorded as low confidence; a GCMonitor
+    counts and logs shots whose timing window a collection overlapped.
+
+    The live listener calls ``handle`` from its consumer thread; replay
+    calls it directly.  Shot results are filled in place: the first shot
+    allocates them as whichever ShotClassification type the classifier
+    produces.
+    """
+
+    def __init__(
+        self,
+        overlay: "Overlay",
+        classifier: MovementClassifierInterface,
+        shot_filter: ShotFilterInterface,
+        recorder: Optional["SessionRecorder"] = None,
+        latency: Optional["LatencyTracker"] = None,
+        watchdog: Optional["StallWatchdog"] = None,
+        gc_monitor: Optional["GCMonitor"] = None,
+    ) -> None:
+        self.overlay = overlay
+        self.classifier = classifier
+        self._shot_filter = shot_filter
+        self._recorder = recorder
+        self._latency = latency
+        self._watchdog = watchdog if watchdog is not None and watchdog.flag_shots else None
+        self._gc_monitor = gc_monitor
+        self._base_result: Any = None
+        self._final_result: Any = None
+
+    def handle(self, kind: int, key: Any, timestamp: int) -> None:
+        """Run one event through the classifier."""
+        recorder = self._recorder
+        if recorder is not None:
+            recorder.record_event(kind, key, timestamp)
+        if kind == EVENT_SHOT:
+            latency = self._latency
+            if latency is not None:
+                start_ns = latency.now_ns()
+            self.overlay.flash_shot()
+            base_result = self.classifier.classify_shot(timestamp, self._base_result)
+            if latency is not None:
+                classified_ns = latency.now_ns()
+            final_result = self._shot_filter.apply(base_result, self._final_result)
+            if latency is not None:
+                latency.record_shot(timestamp, start_ns, classified_ns, latency.now_ns())
+            self._base_result = base_result
+            self._final_result = final_result
+            low_confidence = False
+            if self._watchdog is not None or self._gc_monitor is not None:
+                window = timing_window_ns(final_result, timestamp)
+                if self._watchdog is not None:
+                    low_confidence = self._watchdog.overlaps(*window)
+                if self._gc_monitor is not None:
+                    self._gc_monitor.check_shot(*window)
+            if recorder is not None:
+                recorder.record_shot(timestamp, final_result, low_confidence)
+            self.overlay.update_result(final_result, low_confidence)
+            return
+        held = kind == EVENT_PRESS
+        if held:
+            self.classifier.on_press(key, timestamp)
+        else:
+            self.classifier.on_release(key, timestamp)
+        if key == KEY_LEFT:
+            self.overlay.set_left_key_held(held)
+        elif key == KEY_RIGHT:
+            self.overlay.set_right_key_held(held)
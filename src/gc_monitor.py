@@ -0,0 +1,84 @@
+"""Cyclic GC pause control and instrumentation for the live session.
+
+Every event allocates a little (hook arguments, result strings, debug
+records), so the cyclic collector runs during play, and a generation-2
+pass that lands between a key release and the counter-press shows up as
+CS time.  GCMonitor times every collection through ``gc.callbacks`` into a
+histogram per generation and remembers the recent pauses, so the pipeline
+can report a shot whose timing window one of them overlaps.
+
+``tune()`` additionally moves everything allocated during startup into the
+permanent generation (``gc.freeze()``) and raises the collection thresholds
+for the session; ``close()`` undoes both and unhooks the callback.
+"""
+
+import gc
+from typing import Any, Callable, Optional
+
+from clock import NS_PER_MS
+from latency import LatencyHistogram
+from watchdog import RecentIntervals
+
+# Collections are rare with these, and the young generations stay small
+# because the hot path barely allocates.
+PLAY_THRESHOLDS = (50_000, 50, 1000)
+
+
+class GCMonitor:
+    """Installs itself in ``gc.callbacks`` on construction."""
+
+    def __init__(self, now_ns: Callable[[], int], log: Optional[Callable[[str], None]] = None) -> None:
+        self.now_ns = now_ns
+        self.log = log
+        self.pauses = [LatencyHistogram() for _ in gc.get_count()]
+        self.overlapped_shots = 0
+        self._recent = RecentIntervals()
+        self._start_ns = 0
+        self._saved_thresholds: Optional[tuple[int, ...]] = None
+        gc.callbacks.append(self._on_gc)
+
+    def _on_gc(self, phase: str, info: dict[str, Any]) -> None:
+        now = self.now_ns()
+        if phase == "start":
+            self._start_ns = now
+            return
+        start = self._start_ns
+        self.pauses[info["generation"]].record(now - start)
+        self._recent.add(start, now)
+
+    def tune(self, thresholds: tuple[int, ...] = PLAY_THRESHOLDS) -> None:
+        """Freeze the startup heap and switch to the session thresholds."""
+        gc.collect()
+        gc.freeze()
+        if self._saved_thresholds is None:
+            self._saved_thresholds = gc.get_threshold()
+        gc.set_threshold(*thresholds)
+
+    def check_shot(self, start_ns: int, end_ns: int) -> bool:
+        """Count and log a GC pause overlapping a shot's timing window."""
+        pause = self._recent.overlapping(start_ns, end_ns)
+        if pause is None:
+            return False
+        self.overlapped_shots += 1
+        if self.log is not None:
+            self.log(f"[GC] {(pause[1] - pause[0]) / NS_PER_MS:.2f} ms pause inside shot timing")
+        return True
+
+    def report_lines(self) -> list[str]:
+        lines = []
+        for generation, hist in enumerate(self.pauses):
+            lines.append(
+                f"[GC] gen{generation}: {hist.count} collections, "
+                f"p50 {hist.percentile(50) / NS_PER_MS:.3f}  p99 {hist.percentile(99) / NS_PER_MS:.3f}  "
+                f"max {hist.max / NS_PER_MS:.3f} ms"
+            )
+        lines.append(f"[GC] shots with a pause in their timing: {self.overlapped_shots}")
+        return lines
+
+    def close(self) -> None:
+        if self._on_gc in gc.callbacks:
+            gc.callbacks.remove(self._on_gc)
+        if self._saved_thresholds is not None:
+            gc.set_threshold(*self._saved_thresholds)
+            gc.unfreeze()
+            self._saved_thresholds = None
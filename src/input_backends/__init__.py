@@ -0,0 +1,43 @@
+"""
+Input capture backends for InputListener.
+
+Backend modules import their platform libraries, so import the one you use
+directly (``input_backends.pynput_backend``, ``input_backends.evdev_backend``,
+``input_backends.trace_backend``); this package only holds the shared
+interface and the OS event clock mapping.
+"""
+
+from .base import (
+    ACTION_CTRL,
+    ACTION_EXIT,
+    ACTION_GROW,
+    ACTION_IGNORE,
+    ACTION_SHIFT,
+    ACTION_SHRINK,
+    ACTION_TOGGLE,
+    LAST_KEY_ACTION,
+    ClickCallback,
+    InputBackend,
+    InputBackendError,
+    KeyCallback,
+)
+from .os_time import OSClockMap
+
+BACKENDS = ("pynput", "evdev", "trace")
+
+__all__ = [
+    "ACTION_CTRL",
+    "ACTION_EXIT",
+    "ACTION_GROW",
+    "ACTION_IGNORE",
+    "ACTION_SHIFT",
+    "ACTION_SHRINK",
+    "ACTION_TOGGLE",
+    "BACKENDS",
+    "LAST_KEY_ACTION",
+    "ClickCallback",
+    "InputBackend",
+    "InputBackendError",
+    "KeyCallback",
+    "OSClockMap",
+]
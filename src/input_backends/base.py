@@ -0,0 +1,63 @@
+"""The interface between an input capture mechanism and InputListener."""
+
+from abc import ABC, abstractmethod
+from typing import Callable, Optional
+
+from classifier.key_codes import KEY_CTRL, KEY_SHIFT
+from latency import LatencyHistogram
+
+# Action codes a backend delivers with key events.  Codes up to
+# LAST_KEY_ACTION are the classifier key codes themselves: 0-3 the movement
+# keys (forward, backward, left, right), then Shift and Ctrl; the rest are
+# overlay hotkeys.
+ACTION_SHIFT = KEY_SHIFT
+ACTION_CTRL = KEY_CTRL
+ACTION_TOGGLE = 6
+ACTION_EXIT = 7
+ACTION_GROW = 8
+ACTION_SHRINK = 9
+ACTION_IGNORE = 10
+LAST_KEY_ACTION = ACTION_CTRL
+
+# on_key(kind, action, timestamp_ns) with kind EVENT_PRESS / EVENT_RELEASE;
+# on_click(timestamp_ns) for a left-button press.
+KeyCallback = Callable[[int, int, int], None]
+ClickCallback = Callable[[int], None]
+
+
+class InputBackendError(RuntimeError):
+    """A backend cannot capture input: no devices, or no access to them."""
+
+
+class InputBackend(ABC):
+    """
+    Captures key and mouse input and delivers it already normalised.
+
+    Keys arrive as action codes, so parsing the OS's key representation
+    happens once, in the backend.  Timestamps are integer nanoseconds on
+    the ``now_ns`` clock passed to ``start``: the time the backend learned
+    of the event, or the OS's own event time mapped onto that clock where
+    the backend has one.  ``on_key`` and ``on_click`` are each only ever
+    called from one thread (they feed single-producer rings), which may be
+    the same thread for both.  Keys the backend does not map are dropped,
+    not delivered as ACTION_IGNORE.
+    """
+
+    @abstractmethod
+    def start(self, on_key: KeyCallback, on_click: ClickCallback, now_ns: Callable[[], int]) -> None:
+        """
+        Start delivering events; returns once capture is running.  Raises
+        InputBackendError, with nothing left open, if capture cannot start.
+        """
+
+    @abstractmethod
+    def stop(self) -> None:
+        """Stop delivering events.  Safe to call from a callback and more than once."""
+
+    def time_skew(self) -> Optional[LatencyHistogram]:
+        """
+        How far each callback so far ran behind its event's timestamp, or
+        None for a backend that stamps events on callback entry.  Read from
+        any thread while events arrive; counts may be a few events apart.
+        """
+        return None
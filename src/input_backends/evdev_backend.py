@@ -0,0 +1,252 @@
+"""
+Linux evdev backend: reads ``/dev/input/event*`` directly.
+
+One thread waits on every keyboard and mouse device with a single
+``select.epoll``, reads whatever each ready device has queued and decodes
+the ``struct input_event`` records in bulk with ``struct.iter_unpack``.
+Events carry the kernel's timestamp from when the driver reported them,
+switched to CLOCK_MONOTONIC where the device allows it and mapped onto the
+pipeline clock, so neither X11 nor Python callback scheduling adds to the
+measured times; ``time_skew`` reports how much they would have.
+
+Reading event devices needs root or membership of the ``input`` group.
+evdev codes are physical key positions: bindings are looked up on the US
+layout, whatever layout X or the game uses.
+"""
+
+import errno
+import fcntl
+import os
+import re
+import select
+import stat
+import struct
+import threading
+import time
+from typing import Callable, Optional, Sequence
+
+from classifier.events import EVENT_PRESS, EVENT_RELEASE
+from latency import LatencyHistogram
+
+from .base import (
+    ACTION_CTRL,
+    ACTION_EXIT,
+    ACTION_GROW,
+    ACTION_IGNORE,
+    ACTION_SHIFT,
+    ACTION_SHRINK,
+    ACTION_TOGGLE,
+    ClickCallback,
+    InputBackend,
+    InputBackendError,
+    KeyCallback,
+)
+
+# struct input_event: struct timeval (two longs), __u16 type, __u16 code,
+# __s32 value, in native layout.
+INPUT_EVENT = struct.Struct("@llHHi")
+READ_EVENTS = 64
+
+EV_KEY = 0x01
+KEY_VALUE_RELEASE, KEY_VALUE_PRESS, KEY_VALUE_REPEAT = 0, 1, 2
+BTN_LEFT = 0x110
+KEY_CNT = 0x300
+
+# _IOW('E', 0xa0, int): per-device timestamp clock.
+EVIOCSCLOCKID = 0x400445A0
+
+PROC_DEVICES = "/proc/bus/input/devices"
+
+# Linux input-event-codes.h, US layout.
+_CHAR_CODES = {
+    **dict(zip("1234567890", range(2, 12))),
+    **dict(zip("QWERTYUIOP", range(16, 26))),
+    **dict(zip("ASDFGHJKL", range(30, 39))),
+    **dict(zip("ZXCVBNM", range(44, 51))),
+}
+KEY_MINUS = 12
+KEY_EQUAL = 13
+KEY_LEFTCTRL = 29
+KEY_LEFTSHIFT = 42
+KEY_RIGHTSHIFT = 54
+KEY_F6 = 64
+KEY_F8 = 66
+KEY_RIGHTCTRL = 97
+
+
+def build_code_table(movement_keys: Sequence[str]) -> list[int]:
+    """Action code for every evdev key code, indexed by code."""
+    table = [ACTION_IGNORE] * KEY_CNT
+    table[KEY_F6] = ACTION_TOGGLE
+    table[KEY_F8] = ACTION_EXIT
+    table[KEY_EQUAL] = ACTION_GROW
+    table[KEY_MINUS] = ACTION_SHRINK
+    table[KEY_LEFTSHIFT] = table[KEY_RIGHTSHIFT] = ACTION_SHIFT
+    table[KEY_LEFTCTRL] = table[KEY_RIGHTCTRL] = ACTION_CTRL
+    for index, name in enumerate(movement_keys):
+        code = _CHAR_CODES.get(name.upper())
+        if code is None:
+            raise ValueError(f"no evdev key code for movement key {name!r}")
+        table[code] = index
+    return table
+
+
+def find_devices(proc_devices: str = PROC_DEVICES) -> list[str]:
+    """Event nodes of every device with a keyboard or mouse handler."""
+    with open(proc_devices) as f:
+        text = f.read()
+    nodes = []
+    for match in re.finditer(r"^H: Handlers=(.*)$", text, re.MULTILINE):
+        handlers = match.group(1).split()
+        if "kbd" in handlers or any(h.startswith("mouse") for h in handlers):
+            nodes.extend(f"/dev/input/{h}" for h in handlers if h.startswith("event"))
+    return nodes
+
+
+def _open_error(path: str, exc: OSError) -> str:
+    if exc.errno in (errno.EACCES, errno.EPERM):
+        return (
+            f"cannot read {path}: permission denied; reading event devices "
+            "needs root or membership of the 'input' group"
+        )
+    return f"cannot open {path}: {exc.strerror or exc}"
+
+
+class EvdevBackend(InputBackend):
+    """
+    ``devices`` are event device paths (default: every keyboard and mouse
+    in ``/proc/bus/input/devices``); anything that yields ``input_event``
+    records works, e.g. a FIFO in tests.  Autorepeat events are dropped.
+    ``finished`` is set once the read loop exits: on ``stop`` or when every
+    device has closed.  Finding no devices raises InputBackendError here; a
+    device that cannot be opened raises it from ``start``.
+    """
+
+    def __init__(
+        self,
+        movement_keys: Sequence[str],
+        devices: Optional[Sequence[str]] = None,
+        clock_id: int = time.CLOCK_MONOTONIC,
+    ) -> None:
+        self._table = build_code_table(movement_keys)
+        self._devices = list(devices) if devices is not None else find_devices()
+        if not self._devices:
+            raise InputBackendError(f"no keyboard or mouse event devices listed in {PROC_DEVICES}")
+        self._clock_id = clock_id
+        self._fds: dict[int, int] = {}  # fd -> clock its timestamps are on
+        self._wake_r = self._wake_w = -1
+        # Guards the wake pipe: stop() may run on any thread, including this
+        # backend's own (F8), and the thread closes every fd on the way out.
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._skew = LatencyHistogram()
+        self.finished = threading.Event()
+
+    def _open(self, path: str) -> tuple[int, int]:
+        fd = os.open(path, os.O_RDONLY | os.O_NONBLOCK)
+        try:
+            fcntl.ioctl(fd, EVIOCSCLOCKID, struct.pack("i", self._clock_id))
+            return fd, self._clock_id
+        except OSError:
+            # A real device that refuses keeps the kernel default; a FIFO
+            # or file is taken to be written on clock_id already.
+            if stat.S_ISCHR(os.fstat(fd).st_mode):
+                return fd, time.CLOCK_REALTIME
+            return fd, self._clock_id
+
+    def start(self, on_key: KeyCallback, on_click: ClickCallback, now_ns: Callable[[], int]) -> None:
+        for path in self._devices:
+            try:
+                fd, clock = self._open(path)
+            except OSError as exc:
+                for fd in self._fds:
+                    os.close(fd)
+                self._fds.clear()
+                raise InputBackendError(_open_error(path, exc)) from exc
+            self._fds[fd] = clock
+        # Offset from each kernel clock to the pipeline clock, read between
+        # two pipeline-clock samples.
+        offsets = {}
+        for clock in set(self._fds.values()):
+            before = now_ns()
+            kernel = time.clock_gettime_ns(clock)
+            offsets[clock] = (before + now_ns()) // 2 - kernel
+        self._wake_r, self._wake_w = os.pipe()
+        self._thread = threading.Thread(
+            target=self._run, args=(on_key, on_click, now_ns, offsets), name="cstrafe-evdev", daemon=True
+        )
+        self._thread.start()
+
+    def _run(
+        self, on_key: KeyCallback, on_click: ClickCallback, now_ns: Callable[[], int], offsets: dict[int, int]
+    ) -> None:
+        table = self._table
+        record_skew = self._skew.record
+        fds = self._fds
+        fd_offsets = {fd: offsets[clock] for fd, clock in fds.items()}
+        partial = {fd: b"" for fd in fds}
+        record_size = INPUT_EVENT.size
+        read_size = record_size * READ_EVENTS
+        iter_unpack = INPUT_EVENT.iter_unpack
+        epoll = select.epoll()
+        try:
+            epoll.register(self._wake_r, select.EPOLLIN)
+            for fd in fds:
+                epoll.register(fd, select.EPOLLIN)
+            while fd_offsets:
+                for fd, _ in epoll.poll():
+                    if fd == self._wake_r:
+                        return
+                    try:
+                        data = os.read(fd, read_size)
+                    except BlockingIOError:
+                        continue
+                    except OSError as exc:
+                        if exc.errno != errno.ENODEV:  # unplugged
+                            raise
+                        data = b""
+                    if not data:
+                        epoll.unregister(fd)
+                        del fd_offsets[fd]
+                        continue
+                    data = partial[fd] + data
+                    whole = len(data) - len(data) % record_size
+                    partial[fd] = data[whole:]
+                    offset = fd_offsets[fd]
+                    for sec, usec, type_, code, value in iter_unpack(data[:whole]):
+                        if type_ != EV_KEY or value == KEY_VALUE_REPEAT:
+                            continue
+                        timestamp = sec * 1_000_000_000 + usec * 1000 + offset
+                        if code == BTN_LEFT:
+                            if value == KEY_VALUE_PRESS:
+                                record_skew(now_ns() - timestamp)
+                                on_click(timestamp)
+                        elif code < KEY_CNT:
+                            action = table[code]
+                            if action != ACTION_IGNORE:
+                                kind = EVENT_PRESS if value == KEY_VALUE_PRESS else EVENT_RELEASE
+                                record_skew(now_ns() - timestamp)
+                                on_key(kind, action, timestamp)
+        finally:
+            epoll.close()
+            with self._lock:
+                for fd in (*fds, self._wake_r, self._wake_w):
+                    os.close(fd)
+                fds.clear()
+                self._wake_r = self._wake_w = -1
+            self.finished.set()
+
+    def stop(self) -> None:
+        thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        with self._lock:
+            if self._wake_w >= 0:
+                os.write(self._wake_w, b"\0")
+        if threading.current_thread() is not thread:
+            thread.join(1.0)
+
+    def time_skew(self) -> Optional[LatencyHistogram]:
+        skew = LatencyHistogram()
+        skew.merge(self._skew)
+        return skew
@@ -0,0 +1,80 @@
+"""
+Mapping an OS event clock onto the pipeline clock.
+
+X11 (server time) and the Win32 low-level hooks (message time) stamp every
+event with a 32-bit millisecond counter that Python cannot read against
+``now_ns`` directly, so the offset between the two is calibrated from the
+events themselves.  Each event's callback is stamped on entry as well, and
+``callback - os_time`` is that event's delivery lag plus the clock offset;
+the smallest value seen belongs to the event delivered with the least
+queueing, so it is taken as the offset.
+"""
+
+import threading
+from typing import Callable
+
+from clock import NS_PER_MS
+from latency import LatencyHistogram
+
+# The minimum is kept over the current and the previous window, so it
+# follows drift between the two clocks in both directions.
+RECALIBRATE_NS = 10_000 * NS_PER_MS
+
+
+class OSClockMap:
+    """
+    ``clock_map(os_time)`` returns an event's time on the ``now_ns`` clock.
+
+    One map serves every listener thread whose events carry the same OS
+    clock, so keys and clicks share one offset and the gap between them
+    is the OS's; a lock keeps the calibration consistent between threads.
+    A mapped time is never later than the callback that mapped it, nor
+    earlier than the previous event's when the OS stamped the two in order.
+    ``skew`` collects ``callback - mapped time`` for every event: the
+    queueing a callback-time stamp would have added.  ``os_time`` counts
+    ``ns_per_tick`` nanosecond ticks and wraps at ``wrap_ticks``.
+    """
+
+    __slots__ = (
+        "_now_ns", "_ns_per_tick", "_wrap", "_lock", "_window_end",
+        "_window_min", "_previous_min", "offset_ns", "skew",
+    )
+
+    def __init__(
+        self, now_ns: Callable[[], int], ns_per_tick: int = NS_PER_MS, wrap_ticks: int = 1 << 32
+    ) -> None:
+        self._now_ns = now_ns
+        self._ns_per_tick = ns_per_tick
+        self._wrap = wrap_ticks
+        self._lock = threading.Lock()
+        self._window_end = 0
+        self._window_min = self._previous_min = 0
+        self.offset_ns = 0
+        self.skew = LatencyHistogram()
+
+    def __call__(self, os_time: int) -> int:
+        now = self._now_ns()
+        ns_per_tick = self._ns_per_tick
+        with self._lock:
+            if not self._window_end:
+                ticks = os_time
+                self._window_end = now + RECALIBRATE_NS
+                self._window_min = self._previous_min = self.offset_ns = now - ticks * ns_per_tick
+            else:
+                # Unwrap to the count nearest where the current offset puts
+                # the callback; delivery lag is far below half the range.
+                wrap = self._wrap
+                expected = (now - self.offset_ns) // ns_per_tick
+                ticks = os_time + (expected - os_time + (wrap >> 1)) // wrap * wrap
+            os_ns = ticks * ns_per_tick
+            offset = now - os_ns
+            if now >= self._window_end:
+                self._previous_min = self._window_min
+                self._window_min = offset
+                self._window_end = now + RECALIBRATE_NS
+            elif offset < self._window_min:
+                self._window_min = offset
+            self.offset_ns = min(self._window_min, self._previous_min)
+            mapped = os_ns + self.offset_ns
+            self.skew.record(now - mapped)
+        return mapped
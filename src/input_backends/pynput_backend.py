@@ -0,0 +1,204 @@
+"""
+pynput backend: one keyboard and one mouse hook thread.
+
+On X11 and Windows, events carry the OS's own time: the X server's for the
+XRecord listener, the hook message time for the Win32 listeners.  pynput
+does not pass it to the hooks, so the backend reads it just before pynput
+calls them -- from the X event its ``_handle_message`` gets, or through the
+listener's ``win32_event_filter``, queued for the Win32 keyboard listener
+whose callbacks run behind its hook -- and maps it onto the pipeline clock
+with one OSClockMap shared by both listeners, so keys and clicks are
+placed with the same offset.  Elsewhere events are stamped on callback
+entry.
+"""
+
+from collections import deque
+from typing import Any, Callable, Optional, Sequence
+
+from pynput import keyboard, mouse
+
+from classifier.events import EVENT_PRESS, EVENT_RELEASE
+from latency import LatencyHistogram
+
+from .base import (
+    ACTION_CTRL,
+    ACTION_EXIT,
+    ACTION_GROW,
+    ACTION_IGNORE,
+    ACTION_SHIFT,
+    ACTION_SHRINK,
+    ACTION_TOGGLE,
+    ClickCallback,
+    InputBackend,
+    KeyCallback,
+)
+from .os_time import OSClockMap
+
+_Key = keyboard.Key
+
+# Where event timestamps come from: an OS clock, or the callback's entry.
+EVENT_TIMES = ("xorg", "win32", "callback")
+
+
+def detect_event_time() -> str:
+    """The EVENT_TIMES entry for the pynput backend in use."""
+    # pynput picks a platform module, e.g. pynput.keyboard._xorg.
+    name = keyboard.Listener.__module__.rpartition("._")[2]
+    return name if name in EVENT_TIMES else "callback"
+
+
+def build_dispatch_table(movement_keys: Sequence[str]) -> dict[Any, int]:
+    """
+    Map every pynput key we care about to an action code.
+
+    ``movement_keys`` is (forward, backward, left, right); a key's position
+    in it is its classifier key code.
+
+    ``Key`` members are keyed by identity; ``KeyCode`` events are keyed by
+    ``key.char``, or by ``key.vk`` when pynput reports no char (a Windows
+    quirk for letter keys), so a handler resolves any event with
+    ``table.get(key if key is a Key else key.char or key.vk)``.
+    """
+    table: dict[Any, int] = {
+        _Key.f6: ACTION_TOGGLE,
+        _Key.f8: ACTION_EXIT,
+        "=": ACTION_GROW,
+        "-": ACTION_SHRINK,
+    }
+    for key in (_Key.shift, _Key.shift_l, _Key.shift_r):
+        table[key] = ACTION_SHIFT
+    for key in (_Key.ctrl, _Key.ctrl_l, _Key.ctrl_r):
+        table[key] = ACTION_CTRL
+    for index, name in enumerate(movement_keys):
+        table[name.lower()] = index
+        table[name.upper()] = index
+        vk = ord(name.upper())
+        if 65 <= vk <= 90:  # A–Z virtual key codes match the letter
+            table[vk] = index
+    return table
+
+
+class _EventTime:
+    """
+    The OS time of the event one listener thread is dispatching, captured
+    before pynput calls the hook; calling it maps that time onto the
+    pipeline clock through the backend's shared ``clock_map``.
+
+    With ``posted``, the listener is pynput's Win32 keyboard listener: its
+    hook only filters the event and posts it to the listener's message
+    loop, and ``on_press``/``on_release`` run later from ``_process``.
+    Several events can be filtered before the first of them is processed,
+    so their times queue up in order and ``_process`` takes the oldest.
+    """
+
+    __slots__ = ("os_time", "clock_map", "_posted")
+
+    def __init__(self, clock_map: OSClockMap, posted: bool = False) -> None:
+        self.os_time = 0
+        self.clock_map = clock_map
+        self._posted: Optional[deque[int]] = deque() if posted else None
+
+    def __call__(self) -> int:
+        return self.clock_map(self.os_time)
+
+    def win32_event_filter(self, msg: int, data: Any) -> None:
+        # Returning None (not False) lets the event through to the hook.
+        if self._posted is None:
+            self.os_time = data.time
+        else:
+            self._posted.append(data.time)
+
+    def wrap_win32(self, listener: Any) -> None:
+        posted = self._posted
+        if posted is None:
+            return
+        process = listener._process
+
+        def dequeue(*args: Any) -> None:
+            self.os_time = posted.popleft()
+            process(*args)
+
+        listener._process = dequeue
+
+    def wrap_xorg(self, listener: Any) -> None:
+        handle_message = listener._handle_message
+
+        def capture(display: Any, event: Any, injected: bool) -> None:
+            self.os_time = event.time
+            handle_message(display, event, injected)
+
+        listener._handle_message = capture
+
+
+class PynputBackend(InputBackend):
+    """
+    ``event_time`` is one of EVENT_TIMES, or ``"auto"`` for the OS clock
+    of the platform pynput runs on.
+    """
+
+    def __init__(self, movement_keys: Sequence[str], event_time: str = "auto") -> None:
+        # Key events resolve to an action code with one lookup in a table
+        # built here.
+        self._dispatch = build_dispatch_table(movement_keys)
+        if event_time == "auto":
+            event_time = detect_event_time()
+        elif event_time not in EVENT_TIMES:
+            raise ValueError(f"unknown event time source {event_time!r}")
+        self.event_time = event_time
+        self._clock_map: Optional[OSClockMap] = None
+        self._keyboard_listener: Optional[keyboard.Listener] = None
+        self._mouse_listener: Optional[mouse.Listener] = None
+
+    def start(self, on_key: KeyCallback, on_click: ClickCallback, now_ns: Callable[[], int]) -> None:
+        get = self._dispatch.get
+        key_time: Callable[[], int] = now_ns
+        click_time: Callable[[], int] = now_ns
+        if self.event_time != "callback":
+            clock_map = self._clock_map = OSClockMap(now_ns)
+            key_time = _EventTime(clock_map, posted=self.event_time == "win32")
+            click_time = _EventTime(clock_map)
+
+        def key_hook(kind: int) -> Callable[[Any], None]:
+            def hook(key: Any) -> None:
+                timestamp = key_time()
+                action = get(key if key.__class__ is _Key else (key.char or key.vk), ACTION_IGNORE)
+                if action != ACTION_IGNORE:
+                    on_key(kind, action, timestamp)
+
+            return hook
+
+        def click_hook(x: int, y: int, button: mouse.Button, pressed: bool) -> None:
+            if pressed and button == mouse.Button.left:
+                on_click(click_time())
+
+        self._keyboard_listener = self._listen(
+            keyboard.Listener, key_time, on_press=key_hook(EVENT_PRESS), on_release=key_hook(EVENT_RELEASE)
+        )
+        self._mouse_listener = self._listen(mouse.Listener, click_time, on_click=click_hook)
+
+    def _listen(self, listener_cls: Any, event_time: Any, **callbacks: Any) -> Any:
+        if self.event_time == "win32":
+            callbacks["win32_event_filter"] = event_time.win32_event_filter
+        listener = listener_cls(**callbacks)
+        if self.event_time == "win32":
+            event_time.wrap_win32(listener)
+        elif self.event_time == "xorg":
+            event_time.wrap_xorg(listener)
+        listener.start()
+        return listener
+
+    def time_skew(self) -> Optional[LatencyHistogram]:
+        if self.event_time == "callback":
+            return None
+        skew = LatencyHistogram()
+        if self._clock_map is not None:
+            skew.merge(self._clock_map.skew)
+        return skew
+
+    def stop(self) -> None:
+        if self._keyboard_listener is not None:
+            self._keyboard_listener.stop()
+            self._keyboard_listener = None
+        if self._mouse_listener is not None:
+            self._mouse_listener.stop()
+            self._mouse_listener = None
@@ -0,0 +1,77 @@
+"""Trace backend: replays a recorded or synthetic trace as live input."""
+
+import threading
+from typing import Callable, Optional
+
+from classifier.events import EVENT_SHOT
+from clock import NS_PER_MS
+from latency import LatencyHistogram
+from replay import Trace, load_trace
+
+from .base import ClickCallback, InputBackend, KeyCallback
+
+
+class TraceBackend(InputBackend):
+    """
+    Delivers a trace's events on one thread, paced ``speed`` times faster
+    than recorded, starting when ``start`` is called.
+
+    An event's timestamp is the time it was due on the ``now_ns`` clock --
+    the trace's "OS time" -- so the gap until the pipeline handles it is
+    this backend's own delivery lag, like a hook's.  ``finished`` is set
+    once the last event has been delivered.
+    """
+
+    def __init__(self, trace: Trace, speed: float = 1.0) -> None:
+        self._trace = trace
+        self._speed = speed
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._skew = LatencyHistogram()
+        self.finished = threading.Event()
+
+    @classmethod
+    def from_file(cls, path: str, speed: float = 1.0) -> "TraceBackend":
+        return cls(load_trace(path), speed)
+
+    def start(self, on_key: KeyCallback, on_click: ClickCallback, now_ns: Callable[[], int]) -> None:
+        self._thread = threading.Thread(
+            target=self._run, args=(on_key, on_click, now_ns), name="cstrafe-trace-input", daemon=True
+        )
+        self._thread.start()
+
+    def _run(self, on_key: KeyCallback, on_click: ClickCallback, now_ns: Callable[[], int]) -> None:
+        events = self._trace.events
+        stop = self._stop
+        record_skew = self._skew.record
+        try:
+            if not events:
+                return
+            ns_per_tick = NS_PER_MS / self._trace.ticks_per_ms / self._speed
+            first = events[0][2]
+            start = now_ns()
+            for kind, key, timestamp in events:
+                due = start + int((timestamp - first) * ns_per_tick)
+                delay_ns = due - now_ns()
+                if delay_ns > 0 and stop.wait(delay_ns / 1e9):
+                    return
+                if stop.is_set():
+                    return
+                record_skew(now_ns() - due)
+                if kind == EVENT_SHOT:
+                    on_click(due)
+                else:
+                    on_key(kind, key, due)
+        finally:
+            self.finished.set()
+
+    def stop(self) -> None:
+        self._stop.set()
+        thread = self._thread
+        if thread is not None and thread.is_alive() and threading.current_thread() is not thread:
+            thread.join(1.0)
+
+    def time_skew(self) -> Optional[LatencyHistogram]:
+        skew = LatencyHistogram()
+        skew.merge(self._skew)
+        return skew
@@ -1,14 +1,29 @@
-import threading
-import time
-from typing import Optional
+from typing import Optional, Sequence
 
 from typing import TYPE_CHECKING
 if TYPE_CHECKING:
+    from gc_monitor import GCMonitor
+    from latency import LatencyTracker
     from overlay import Overlay
-
-from pynput import keyboard, mouse
+    from session_log import SessionRecorder
+    from watchdog import StallWatchdog
 
 from classifier import MovementClassifierInterface, ShotFilterInterface
+from classifier.events import EVENT_PRESS, EVENT_SHOT
+from clock import NS_PER_MS, Clock, PerfCounterClock
+from event_pipeline import ClassifierSink, EventConsumer, EventRing
+from input_backends import (
+    ACTION_EXIT,
+    ACTION_GROW,
+    ACTION_SHRINK,
+    ACTION_TOGGLE,
+    LAST_KEY_ACTION,
+    ClickCallback,
+    InputBackend,
+    KeyCallback,
+)
+from latency import REPORT_PERCENTILES
+from watchdog import HOOK_CLICK, HOOK_KEY_PRESS, HOOK_KEY_RELEASE
 
 
 class InputListener:
@@ -17,153 +32,119 @@ class InputListener:
         overlay: "Overlay",
         classifier: MovementClassifierInterface,
         shot_filter: ShotFilterInterface,
-        movement_keys: frozenset[str],
-        left_key: Optional[str] = None,
-        right_key: Optional[str] = None,
+        movement_keys: Sequence[str],
+        clock: Optional[Clock] = None,
+        recorder: Optional["SessionRecorder"] = None,
+        latency: Optional["LatencyTracker"] = None,
+        watchdog: Optional["StallWatchdog"] = None,
+        gc_monitor: Optional["GCMonitor"] = None,
+        backend: Optional[InputBackend] = None,
     ) -> None:
         self.overlay = overlay
         self.classifier = classifier
         self._shot_filter = shot_filter
-        self._movement_keys = movement_keys
-        self._left_key = left_key
-        self._right_key = right_key
-        self._lock = threading.Lock()
-        self._keyboard_listener: Optional[keyboard.Listener] = None
-        self._mouse_listener: Optional[mouse.Listener] = None
-        # Tracks which movement/modifier keys are currently held so that
-        # duplicate pynput events (a known Windows hook quirk) are ignored.
-        self._held_keys: set[str] = set()
+        # Events are stamped with integer monotonic nanoseconds; the
+        # classifier must be constructed with ticks_per_ms=NS_PER_MS.
+        self._now_ns = (clock or PerfCounterClock()).now_ns
+        if backend is None:
+            from input_backends.pynput_backend import PynputBackend
 
-    def start(self) -> None:
-        self._keyboard_listener = keyboard.Listener(
-            on_press=self._on_key_press,
-            on_release=self._on_key_release,
+            backend = PynputBackend(movement_keys)
+        self.backend = backend
+        # Tracks which movement/modifier keys are currently held so that
+        # duplicate press events (OS autorepeat, a known Windows hook quirk)
+        # are ignored.
+        self._held: list[bool] = [False] * (LAST_KEY_ACTION + 1)
+        # The optional --record log is written by the sink on the consumer
+        # thread, so the hook callbacks never touch it.
+        self._sink = ClassifierSink(
+            overlay, classifier, shot_filter, recorder, latency, watchdog, gc_monitor
         )
-        self._keyboard_listener.start()
-        self._mouse_listener = mouse.Listener(
-            on_click=self._on_click,
+        self._watchdog = watchdog
+        # Key and click events each have their own ring, fed by one backend
+        # thread apiece; the consumer thread is the only
+        # caller of the classifier, shot filter and overlay indicators.
+        self._keyboard_ring = EventRing()
+        self._mouse_ring = EventRing()
+        self._consumer = EventConsumer(
+            (self._keyboard_ring, self._mouse_ring),
+            self._sink.handle,
+            self._now_ns,
         )
-        self._mouse_listener.start()
 
-    def _on_key_press(self, key: keyboard.Key) -> None:
-        if key == keyboard.Key.f6:
-            self.overlay.toggle_visibility()
+    def start(self) -> None:
+        self._consumer.start()
+        self.backend.start(*self._hooks(), self._now_ns)
+
+    def _hooks(self) -> tuple[KeyCallback, ClickCallback]:
+        """The backend callbacks, timed for the watchdog if there is one."""
+        on_key, on_click = self._on_key, self._on_click
+        watchdog = self._watchdog
+        if watchdog is None:
+            return on_key, on_click
+        now_ns = self._now_ns
+
+        def timed_key(kind: int, action: int, timestamp: int) -> None:
+            entry_ns = now_ns()
+            try:
+                on_key(kind, action, timestamp)
+            finally:
+                watchdog.hook_returned(HOOK_KEY_PRESS if kind == EVENT_PRESS else HOOK_KEY_RELEASE, entry_ns)
+
+        def timed_click(timestamp: int) -> None:
+            entry_ns = now_ns()
+            try:
+                on_click(timestamp)
+            finally:
+                watchdog.hook_returned(HOOK_CLICK, entry_ns)
+
+        return timed_key, timed_click
+
+    def _on_key(self, kind: int, action: int, timestamp: int) -> None:
+        if action <= LAST_KEY_ACTION:
+            pressed = kind == EVENT_PRESS
+            if self._held[action] != pressed:
+                self._held[action] = pressed
+                self._enqueue_key(kind, action, timestamp)
+        elif kind != EVENT_PRESS:
             return
-        if key == keyboard.Key.f8:
+        elif action == ACTION_TOGGLE:
+            self.overlay.toggle_visibility()
+        elif action == ACTION_EXIT:
             self.stop()
             self.overlay.terminate()
-            return
-        char_key: Optional[str] = None
-        try:
-            char_key = key.char
-        except AttributeError:
-            char_key = None
-        if char_key == "=":
+        elif action == ACTION_GROW:
             self.overlay.increase_size()
-            return
-        if char_key == "-":
+        elif action == ACTION_SHRINK:
             self.overlay.decrease_size()
-            return
-        timestamp = time.time() * 1000.0
-        char: Optional[str] = None
-        try:
-            char = key.char
-        except AttributeError:
-            char = None
-        # Fallback: on Windows, pynput may report key.char as None for regular
-        # letter keys when certain OS quirks occur.  Use the virtual key code
-        # (vk) to recover the character so movement keys are never silently
-        # dropped.
-        if char is None:
-            try:
-                vk = key.vk  # type: ignore[union-attr]
-                if vk is not None and 65 <= vk <= 90:  # A–Z
-                    char = chr(vk)
-            except AttributeError:
-                pass
-        if key in (keyboard.Key.shift, keyboard.Key.shift_l, keyboard.Key.shift_r):
-            if "SHIFT" not in self._held_keys:
-                self._held_keys.add("SHIFT")
-                with self._lock:
-                    self.classifier.on_press("SHIFT", timestamp)
-            return
-        if key in (keyboard.Key.ctrl, keyboard.Key.ctrl_l, keyboard.Key.ctrl_r):
-            if "CTRL" not in self._held_keys:
-                self._held_keys.add("CTRL")
-                with self._lock:
-                    self.classifier.on_press("CTRL", timestamp)
-            return
-        if char:
-            upper_char = char.upper()
-            if upper_char in self._movement_keys:
-                if upper_char not in self._held_keys:
-                    self._held_keys.add(upper_char)
-                    with self._lock:
-                        self.classifier.on_press(upper_char, timestamp)
-            if upper_char == self._left_key:
-                self.overlay.set_left_key_held(True)
-            elif upper_char == self._right_key:
-                self.overlay.set_right_key_held(True)
-
-    def _on_key_release(self, key: keyboard.Key) -> None:
-        timestamp = time.time() * 1000.0
-        char: Optional[str] = None
-        try:
-            char = key.char
-        except AttributeError:
-            char = None
-        # Fallback: on Windows, pynput may report key.char as None for regular
-        # letter keys when certain OS quirks occur.  Use the virtual key code
-        # (vk) to recover the character so movement keys are never silently
-        # dropped and never get stuck in _held_keys.
-        if char is None:
-            try:
-                vk = key.vk  # type: ignore[union-attr]
-                if vk is not None and 65 <= vk <= 90:  # A–Z
-                    char = chr(vk)
-            except AttributeError:
-                pass
-        if key in (keyboard.Key.shift, keyboard.Key.shift_l, keyboard.Key.shift_r):
-            if "SHIFT" in self._held_keys:
-                self._held_keys.discard("SHIFT")
-                with self._lock:
-                    self.classifier.on_release("SHIFT", timestamp)
-            return
-        if key in (keyboard.Key.ctrl, keyboard.Key.ctrl_l, keyboard.Key.ctrl_r):
-            if "CTRL" in self._held_keys:
-                self._held_keys.discard("CTRL")
-                with self._lock:
-                    self.classifier.on_release("CTRL", timestamp)
-            return
-        if char:
-            upper_char = char.upper()
-            if upper_char in self._movement_keys:
-                if upper_char in self._held_keys:
-                    self._held_keys.discard(upper_char)
-                    with self._lock:
-                        self.classifier.on_release(upper_char, timestamp)
-            if upper_char == self._left_key:
-                self.overlay.set_left_key_held(False)
-            elif upper_char == self._right_key:
-                self.overlay.set_right_key_held(False)
-
-    def _on_click(self, x: int, y: int, button: mouse.Button, pressed: bool) -> None:
-        if button != mouse.Button.left:
-            return
-        current_time = time.time() * 1000.0
-        if pressed:
-            self.overlay.flash_shot()
-            with self._lock:
-                base_result = self.classifier.classify_shot(current_time)
-            final_result = self._shot_filter.apply(base_result)
-            self.overlay.update_result(final_result)
+
+    def _on_click(self, timestamp: int) -> None:
+        self._mouse_ring.push(EVENT_SHOT, None, timestamp)
+        self._consumer.notify()
+
+    def _enqueue_key(self, kind: int, key: int, timestamp: int) -> None:
+        self._keyboard_ring.push(kind, key, timestamp)
+        self._consumer.notify()
+
+    def pipeline_stats(self) -> dict[str, float]:
+        """Queue depth, drop count and event-to-classify latency counters."""
+        return self._consumer.snapshot()
+
+    def time_skew_lines(self, percentiles: tuple[float, ...] = REPORT_PERCENTILES) -> list[str]:
+        """
+        How far the backend's callbacks ran behind the OS event times, in
+        milliseconds: the queueing that stamping events on callback entry
+        would have added.  Empty for a backend that does stamp them there.
+        Builds the report from scratch, so keep it off the hook threads.
+        """
+        skew = self.backend.time_skew()
+        if skew is None:
+            return []
+        values = "  ".join(f"p{p:g} {skew.percentile(p) / NS_PER_MS:.3f}" for p in percentiles)
+        return [f"[CLOCK] callback - event time, {skew.count} events: {values}  max {skew.max / NS_PER_MS:.3f} ms"]
 
     def stop(self) -> None:
-        if self._keyboard_listener is not None:
-            self._keyboard_listener.stop()
-            self._keyboard_listener = None
-        if self._mouse_listener is not None:
-            self._mouse_listener.stop()
-            self._mouse_listener = None
+        self._consumer.stop()
+        self.backend.stop()
 
 
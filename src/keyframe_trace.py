@@ -0,0 +1,227 @@
+"""Seekable traces: recorded events plus periodic classifier keyframes.
+
+A keyframed trace is written once from an event list and then lets a reader
+jump to any shot without replaying the whole session: it restores the
+nearest keyframe at or before the shot and replays only the events after
+it.  Finding that keyframe is a binary search over a shot-number index.
+
+Layout (little-endian)::
+
+    header      HEADER
+    events      event_count EVENT_RECORDs (the session_log event record)
+    keyframes   keyframe_count records: shot number, event index, presence
+                mask and ``state_size`` int64 state values
+    index       keyframe_count (shot number, keyframe byte offset) pairs
+
+A keyframe is taken just before its shot is classified, so restoring it
+and resuming at its event index reproduces that shot exactly.  State values
+are the classifier's ``snapshot()``; bit ``i`` of the presence mask is
+clear where value ``i`` is None.  Timestamps must be integer ticks.
+"""
+
+import mmap
+import struct
+from typing import Any, Iterator, Optional, Sequence
+
+from classifier import CLASSIFIERS, MovementClassifierInterface
+from classifier.events import EVENT_PRESS, EVENT_SHOT
+from clock import NS_PER_MS
+from session_log import EVENT_RECORD
+
+KEYFRAME_MAGIC = b"CSTRKEY\x00"
+KEYFRAME_VERSION = 1
+DEFAULT_INTERVAL = 256
+
+# magic, version, state size, classifier name, ticks per ms, keyframe
+# interval, event count, shot count, keyframe count, index offset
+HEADER = struct.Struct("<8sHH16sQIxxxxQQQQ")
+INDEX_ENTRY = struct.Struct("<qQ")
+
+
+def _keyframe_struct(state_size: int) -> struct.Struct:
+    return struct.Struct(f"<qqQ{state_size}q")
+
+
+def _pack_state(state: Sequence[Optional[float]]) -> tuple[int, list[int]]:
+    mask = 0
+    values = []
+    for i, value in enumerate(state):
+        if value is None:
+            values.append(0)
+        else:
+            mask |= 1 << i
+            values.append(value)  # type: ignore[arg-type]
+    return mask, values
+
+
+def _unpack_state(mask: int, values: Sequence[int]) -> tuple[Optional[int], ...]:
+    return tuple(value if mask >> i & 1 else None for i, value in enumerate(values))
+
+
+def _run(classifier: MovementClassifierInterface, kind: int, key: int, timestamp: int) -> None:
+    if kind == EVENT_PRESS:
+        classifier.on_press(key, timestamp)
+    else:
+        classifier.on_release(key, timestamp)
+
+
+def write_keyframe_trace(
+    path: str,
+    events: Sequence[tuple[int, int, int]],
+    classifier_name: str,
+    ticks_per_ms: int = NS_PER_MS,
+    interval: int = DEFAULT_INTERVAL,
+) -> None:
+    """
+    Run ``events`` through ``CLASSIFIERS[classifier_name]`` and write them
+    with a keyframe before every ``interval``-th shot.
+    """
+    if interval <= 0:
+        raise ValueError(f"interval must be positive, got {interval}")
+    name = classifier_name.encode()
+    if len(name) > 16:
+        raise ValueError(f"classifier name too long: {classifier_name!r}")
+    movement_cls, _ = CLASSIFIERS[classifier_name]
+    classifier = movement_cls(ticks_per_ms=ticks_per_ms)
+    state_size = len(classifier.snapshot())
+    keyframe = _keyframe_struct(state_size)
+
+    body = bytearray()
+    for kind, key, timestamp in events:
+        body += EVENT_RECORD.pack(timestamp, kind, key)
+
+    keyframes = bytearray()
+    index = bytearray()
+    keyframes_at = HEADER.size + len(body)
+    shot = 0
+    for position, (kind, key, timestamp) in enumerate(events):
+        if kind != EVENT_SHOT:
+            _run(classifier, kind, key, timestamp)
+            continue
+        if shot % interval == 0:
+            mask, values = _pack_state(classifier.snapshot())
+            index += INDEX_ENTRY.pack(shot, keyframes_at + len(keyframes))
+            keyframes += keyframe.pack(shot, position, mask, *values)
+        classifier.classify_shot(timestamp)
+        shot += 1
+
+    keyframe_count = len(index) // INDEX_ENTRY.size
+    header = HEADER.pack(
+        KEYFRAME_MAGIC,
+        KEYFRAME_VERSION,
+        state_size,
+        name,
+        ticks_per_ms,
+        interval,
+        len(events),
+        shot,
+        keyframe_count,
+        keyframes_at + len(keyframes),
+    )
+    with open(path, "wb") as f:
+        f.write(header)
+        f.write(body)
+        f.write(keyframes)
+        f.write(index)
+
+
+class KeyframeTrace:
+    """
+    Read-only, memory-mapped keyframed trace.
+
+    ``seek(shot)`` returns a classifier whose state is exactly the live
+    classifier's just before shot number ``shot`` (0-based), together with
+    the event index of that shot; ``classify_shots`` builds on it.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._map) < HEADER.size or self._map[:8] != KEYFRAME_MAGIC:
+            self._map.close()
+            raise ValueError(f"{path}: not a keyframed trace")
+        (
+            _,
+            version,
+            self.state_size,
+            name,
+            self.ticks_per_ms,
+            self.interval,
+            self.event_count,
+            self.shot_count,
+            self.keyframe_count,
+            self._index_offset,
+        ) = HEADER.unpack_from(self._map)
+        if version != KEYFRAME_VERSION:
+            self._map.close()
+            raise ValueError(f"{path}: unsupported keyframe trace version {version}")
+        self.classifier_name = name.rstrip(b"\x00").decode()
+        self._keyframe = _keyframe_struct(self.state_size)
+
+    def close(self) -> None:
+        self._map.close()
+
+    def __enter__(self) -> "KeyframeTrace":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def events(self, start: int = 0) -> Iterator[tuple[int, int, int]]:
+        """``(kind, key, timestamp)`` from event index ``start`` onwards."""
+        size = EVENT_RECORD.size
+        base = HEADER.size
+        for i in range(start, self.event_count):
+            timestamp, kind, key = EVENT_RECORD.unpack_from(self._map, base + i * size)
+            yield kind, key, timestamp
+
+    def _keyframe_for(self, shot: int) -> int:
+        """Byte offset of the last keyframe at or before ``shot``."""
+        index, size = self._index_offset, INDEX_ENTRY.size
+        lo, hi = 0, self.keyframe_count
+        while hi - lo > 1:
+            mid = (lo + hi) // 2
+            if INDEX_ENTRY.unpack_from(self._map, index + mid * size)[0] <= shot:
+                lo = mid
+            else:
+                hi = mid
+        return INDEX_ENTRY.unpack_from(self._map, index + lo * size)[1]
+
+    def new_classifier(self) -> Any:
+        movement_cls, _ = CLASSIFIERS[self.classifier_name]
+        return movement_cls(ticks_per_ms=self.ticks_per_ms)
+
+    def seek(self, shot: int) -> tuple[Any, int]:
+        if not 0 <= shot < self.shot_count:
+            raise IndexError(f"shot {shot} out of range (trace has {self.shot_count})")
+        key_shot, position, mask, *values = self._keyframe.unpack_from(
+            self._map, self._keyframe_for(shot)
+        )
+        classifier = self.new_classifier()
+        classifier.restore(_unpack_state(mask, values))
+        for kind, key, timestamp in self.events(position):
+            if kind == EVENT_SHOT:
+                if key_shot == shot:
+                    return classifier, position
+                classifier.classify_shot(timestamp)
+                key_shot += 1
+            else:
+                _run(classifier, kind, key, timestamp)
+            position += 1
+        raise ValueError(f"{self.path}: shot {shot} missing from the event stream")
+
+    def classify_shots(self, first: int, count: int = 1) -> list[Any]:
+        """Final (filtered) results of shots ``first`` .. ``first + count - 1``."""
+        classifier, position = self.seek(first)
+        _, shot_filter_cls = CLASSIFIERS[self.classifier_name]
+        shot_filter = shot_filter_cls()
+        results: list[Any] = []
+        for kind, key, timestamp in self.events(position):
+            if kind == EVENT_SHOT:
+                if len(results) == count:
+                    break
+                results.append(shot_filter.apply(classifier.classify_shot(timestamp)))
+            else:
+                _run(classifier, kind, key, timestamp)
+        return results
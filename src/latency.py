@@ -0,0 +1,159 @@
+"""Input-to-pixel latency histograms.
+
+Every shot is timed through five stages, each recorded into its own
+fixed-size histogram:
+
+    queue       hook timestamp -> consumer thread picks the click up
+    classify    MovementClassifier.classify_shot
+    filter      ShotFilter.apply
+    dispatch    result handed to the overlay -> render tick that takes it
+    render      render tick start -> widgets configured
+
+plus ``total``, hook timestamp -> widgets configured.
+
+The histograms are log-linear (HDR-style): values below ``2 ** (SUB_BITS +
+1)`` ns get one bucket each, and every power of two above that is split
+into ``2 ** SUB_BITS`` equal buckets, so any recorded value is known to
+within ``2 ** -SUB_BITS`` (about 3 %).  Recording is an index computation
+and one list increment; nothing is allocated.
+"""
+
+import math
+from typing import TYPE_CHECKING, Callable, Optional
+
+from clock import NS_PER_MS
+
+if TYPE_CHECKING:
+    from gc_monitor import GCMonitor
+
+SUB_BITS = 5
+MAX_BITS = 36  # ~69 s; longer values land in the last bucket
+
+STAGES = ("queue", "classify", "filter", "dispatch", "render", "total")
+REPORT_PERCENTILES = (50.0, 90.0, 99.0, 99.9)
+
+
+class LatencyHistogram:
+    """Log-linear histogram of non-negative integer nanosecond values."""
+
+    __slots__ = ("counts", "count", "total", "max")
+
+    _SUB = 1 << SUB_BITS
+    _SIZE = (MAX_BITS - SUB_BITS + 1) * _SUB
+
+    def __init__(self) -> None:
+        self.counts = [0] * self._SIZE
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    @classmethod
+    def bucket_index(cls, value: int) -> int:
+        sub = cls._SUB
+        if value < 2 * sub:
+            return value if value > 0 else 0
+        shift = value.bit_length() - SUB_BITS - 1
+        index = (shift + 1) * sub + (value >> shift) - sub
+        return index if index < cls._SIZE else cls._SIZE - 1
+
+    @classmethod
+    def bucket_range(cls, index: int) -> tuple[int, int]:
+        """Inclusive lowest and highest value that fall in bucket ``index``."""
+        sub = cls._SUB
+        if index < 2 * sub:
+            return index, index
+        shift = index // sub - 1
+        low = (index % sub + sub) << shift
+        return low, low + (1 << shift) - 1
+
+    def record(self, value: int) -> None:
+        self.counts[self.bucket_index(value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        counts = self.counts
+        for i, n in enumerate(other.counts):
+            if n:
+                counts[i] += n
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def reset(self) -> None:
+        self.counts = [0] * self._SIZE
+        self.count = self.total = self.max = 0
+
+    def percentile(self, p: float) -> int:
+        """
+        Smallest bucket upper bound covering ``p`` percent of the values
+        (capped at the largest value seen); 0 when empty.
+        """
+        if not self.count:
+            return 0
+        rank = max(1, math.ceil(self.count * p / 100))
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                return min(self.bucket_range(i)[1], self.max)
+        return self.max
+
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+
+class LatencyTracker:
+    """
+    Per-stage histograms for the live pipeline.
+
+    The consumer thread records the first three stages through
+    ``record_shot`` and hands the shot over; the Tk thread closes it with
+    ``record_render`` when the result it draws came from that shot.  Only
+    the newest handed-over shot is pending at a time -- the overlay draws
+    only the newest result too.  With a GCMonitor, the report also covers
+    collection pauses.
+    """
+
+    def __init__(self, now_ns: Callable[[], int], gc_monitor: Optional["GCMonitor"] = None) -> None:
+        self.now_ns = now_ns
+        self.gc_monitor = gc_monitor
+        self.histograms = {stage: LatencyHistogram() for stage in STAGES}
+        self.shots = 0
+        self._pending: Optional[tuple[int, int]] = None
+
+    def record_shot(self, event_ns: int, start_ns: int, classified_ns: int, filtered_ns: int) -> None:
+        h = self.histograms
+        h["queue"].record(start_ns - event_ns)
+        h["classify"].record(classified_ns - start_ns)
+        h["filter"].record(filtered_ns - classified_ns)
+        self._pending = (event_ns, self.now_ns())
+
+    def record_render(self, tick_ns: int, done_ns: int) -> bool:
+        """Close the pending shot; False if there was none."""
+        pending, self._pending = self._pending, None
+        if pending is None:
+            return False
+        event_ns, handed_ns = pending
+        h = self.histograms
+        h["dispatch"].record(tick_ns - handed_ns)
+        h["render"].record(done_ns - tick_ns)
+        h["total"].record(done_ns - event_ns)
+        self.shots += 1
+        return True
+
+    def discard_pending(self) -> None:
+        self._pending = None
+
+    def report_lines(self, percentiles: tuple[float, ...] = REPORT_PERCENTILES) -> list[str]:
+        """One line per stage: count, percentiles and max, in milliseconds."""
+        header = "  ".join(f"p{p:g}" for p in percentiles)
+        lines = [f"[LATENCY] stage      n  {header}  max (ms)"]
+        for stage, hist in self.histograms.items():
+            values = "  ".join(f"{hist.percentile(p) / NS_PER_MS:.3f}" for p in percentiles)
+            lines.append(f"[LATENCY] {stage:<8} {hist.count:>5}  {values}  {hist.max / NS_PER_MS:.3f}")
+        if self.gc_monitor is not None:
+            lines.extend(self.gc_monitor.report_lines())
+        return lines
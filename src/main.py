@@ -1,9 +1,15 @@
 import argparse
 
 from classifier import CLASSIFIERS, DebugLogger
+from clock import NS_PER_MS, PerfCounterClock
+from input_backends import BACKENDS, InputBackendError
 from input_events import InputListener
+from gc_monitor import GCMonitor
 from key_config import resolve_movement_keys
-from overlay import Overlay
+from latency import LatencyTracker
+from overlay import DEFAULT_REFRESH_HZ, OVERLAYS
+from session_log import SessionRecorder
+from watchdog import HOOK_STALL_MS, TICK_STALL_MS, StallWatchdog
 
 
 def parse_args() -> argparse.Namespace:
@@ -23,7 +29,85 @@ def parse_args() -> argparse.Namespace:
         metavar="true|false",
         help="Enable debug overlay (default: false)",
     )
-    return parser.parse_args()
+    parser.add_argument(
+        "--refresh-hz",
+        type=float,
+        default=DEFAULT_REFRESH_HZ,
+        help=f"Overlay redraw rate (default: {DEFAULT_REFRESH_HZ})",
+    )
+    parser.add_argument(
+        "--renderer",
+        choices=list(OVERLAYS),
+        default="widgets",
+        help="Overlay implementation: Tk widget tree or a single canvas (default: widgets)",
+    )
+    parser.add_argument(
+        "--input",
+        choices=BACKENDS,
+        default="pynput",
+        help=(
+            "Input backend: pynput hooks, Linux evdev devices (kernel timestamps), "
+            "or replay --input-trace as live input (default: pynput)"
+        ),
+    )
+    parser.add_argument(
+        "--input-device",
+        metavar="PATH",
+        action="append",
+        help="Event device for --input evdev, repeatable (default: every keyboard and mouse)",
+    )
+    parser.add_argument(
+        "--input-trace",
+        metavar="TRACE",
+        help="Session log or JSONL trace for --input trace",
+    )
+    parser.add_argument(
+        "--record",
+        metavar="PATH",
+        default=None,
+        help="Record key/click events to PATH and shot results to PATH.shots",
+    )
+    parser.add_argument(
+        "--latency",
+        action="store_true",
+        help="Time every shot from click to redraw; percentiles go to the debug panel and are printed on exit",
+    )
+    parser.add_argument(
+        "--watchdog",
+        action="store_true",
+        help="Count and log hook callbacks and overlay ticks that stall",
+    )
+    parser.add_argument(
+        "--hook-stall-ms",
+        type=float,
+        default=HOOK_STALL_MS,
+        help=f"Hook callback run time that counts as a stall (default: {HOOK_STALL_MS:g})",
+    )
+    parser.add_argument(
+        "--tick-stall-ms",
+        type=float,
+        default=TICK_STALL_MS,
+        help=f"Overlay tick lateness that counts as a stall (default: {TICK_STALL_MS:g})",
+    )
+    parser.add_argument(
+        "--flag-stalled-shots",
+        action="store_true",
+        help="Mark shots timed across a stall as low confidence (implies --watchdog)",
+    )
+    parser.add_argument(
+        "--gc",
+        choices=("default", "monitor", "tuned"),
+        default="default",
+        help=(
+            "monitor: time every garbage collection and report pauses inside shot timing; "
+            "tuned: also freeze the startup heap and raise GC thresholds while playing "
+            "(default: default)"
+        ),
+    )
+    args = parser.parse_args()
+    if args.input == "trace" and not args.input_trace:
+        parser.error("--input trace needs --input-trace TRACE")
+    return args
 
 
 def main() -> None:
@@ -31,22 +115,88 @@ def main() -> None:
     MovementClassifier, ShotFilter = CLASSIFIERS[args.classifier]
 
     forward, backward, left, right = resolve_movement_keys()
-    overlay = Overlay(debug_mode=bool(args.debugger))
-
+    clock = PerfCounterClock()
+    gc_monitor = GCMonitor(clock.now_ns) if args.gc != "default" else None
+    latency = LatencyTracker(clock.now_ns, gc_monitor) if args.latency else None
+    watchdog: StallWatchdog | None = None
+    if args.watchdog or args.flag_stalled_shots:
+        watchdog = StallWatchdog(
+            clock.now_ns,
+            hook_threshold_ms=args.hook_stall_ms,
+            tick_threshold_ms=args.tick_stall_ms,
+            flag_shots=args.flag_stalled_shots,
+        )
+    overlay = OVERLAYS[args.renderer](
+        debug_mode=bool(args.debugger),
+        refresh_hz=args.refresh_hz,
+        latency=latency,
+        watchdog=watchdog,
+    )
     debug_logger: DebugLogger | None = None
     if args.debugger:
         debug_logger = DebugLogger(overlay.log_debug)
+        if watchdog is not None:
+            watchdog.log = overlay.log_debug
+        if gc_monitor is not None:
+            gc_monitor.log = overlay.log_debug
 
     classifier = MovementClassifier(
         vertical_keys=(forward, backward),
         horizontal_keys=(left, right),
         debug_logger=debug_logger,
+        ticks_per_ms=NS_PER_MS,
     )
     shot_filter = ShotFilter()
-    movement_keys = frozenset((forward, backward, left, right))
-    listener = InputListener(overlay, classifier, shot_filter, movement_keys, left_key=left, right_key=right)
-    listener.start()
-    overlay.run()
+    movement_keys = (forward, backward, left, right)
+    backend = None
+    if args.input == "evdev":
+        from input_backends.evdev_backend import EvdevBackend
+
+        try:
+            backend = EvdevBackend(movement_keys, args.input_device)
+        except InputBackendError as exc:
+            raise SystemExit(f"cstrafe: {exc}") from exc
+    elif args.input == "trace":
+        from input_backends.trace_backend import TraceBackend
+
+        backend = TraceBackend.from_file(args.input_trace)
+    recorder = SessionRecorder(args.record, ticks_per_ms=NS_PER_MS) if args.record else None
+    listener = InputListener(
+        overlay,
+        classifier,
+        shot_filter,
+        movement_keys,
+        clock=clock,
+        recorder=recorder,
+        latency=latency,
+        watchdog=watchdog,
+        gc_monitor=gc_monitor,
+        backend=backend,
+    )
+    overlay.add_debug_report(listener.time_skew_lines)
+    try:
+        listener.start()
+    except InputBackendError as exc:
+        listener.stop()
+        if recorder is not None:
+            recorder.close()
+        raise SystemExit(f"cstrafe: {exc}") from exc
+    if gc_monitor is not None and args.gc == "tuned":
+        gc_monitor.tune()
+    try:
+        overlay.run()
+    finally:
+        listener.stop()
+        if recorder is not None:
+            recorder.close()
+        if latency is not None:
+            print("\n".join(latency.report_lines() + listener.time_skew_lines()))
+        if watchdog is not None:
+            print("\n".join(watchdog.summary_lines()))
+        if gc_monitor is not None:
+            if latency is None:
+                print("\n".join(gc_monitor.report_lines()))
+            gc_monitor.close()
 
 
 if __name__ == "__main__":
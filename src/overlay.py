@@ -1,25 +1,99 @@
 import time
 import tkinter as tk
-from typing import Optional
+import tkinter.font as tkfont
+from typing import TYPE_CHECKING, Callable, Optional, Type
 
 from classifier import ShotClassification
+from classifier.labels import ShotLabel
+from clock import NS_PER_MS, Clock
+from render_state import FrameUpdate, RenderState
+
+if TYPE_CHECKING:
+    from latency import LatencyTracker
+    from watchdog import StallWatchdog
 
 _DEBUG_MAX_LINES = 60
+DEFAULT_REFRESH_HZ = 144
+# While hidden the tick only polls for F6 / F8.
+_HIDDEN_POLL_MS = 100
+# Shots between percentile reports in the debug panel.
+_DEBUG_REPORT_EVERY = 25
+
+# Background colour per ShotLabel value.
+_LABEL_COLOURS = (
+    "#cc0000",  # Bad
+    "#228b22",  # Counter-strafe
+    "#ff8c00",  # Overlap
+    "#228b22",  # Perfect
+    "#228b22",  # Good
+    "#202020",  # Not detected
+    "#202020",  # Unknown
+)
 
 
 class Overlay:
-    def __init__(self, debug_mode: bool = False) -> None:
+    """
+    Always-on-top result window.
+
+    Every public method may be called from any thread: it only records the
+    wanted state in a RenderState, and a render tick on the Tk thread
+    (``refresh_hz`` times a second) applies whatever changed since the
+    previous tick.  While hidden (F6) nothing is drawn at all: the tick
+    drops to a slow poll for show/terminate, and showing the window again
+    redraws once from the latest state.
+
+    With a LatencyTracker, every tick that draws a new result closes that
+    shot's dispatch and render stages; with a StallWatchdog, every tick
+    reports how late it ran.  ``clock`` times the shot flash (default:
+    PerfCounterClock); realtime replay passes its virtual clock so the
+    flash lasts in replayed time.
+    """
+
+    def __init__(
+        self,
+        debug_mode: bool = False,
+        refresh_hz: float = DEFAULT_REFRESH_HZ,
+        latency: Optional["LatencyTracker"] = None,
+        watchdog: Optional["StallWatchdog"] = None,
+        clock: Optional[Clock] = None,
+    ) -> None:
+        self.header_font_size = 12
+        self.body_font_size = 10
+        self.retro_font = "Courier"
+        self._debug_mode = debug_mode
+        self._latency = latency
+        self._watchdog = watchdog
+        self._debug_text: Optional[tk.Text] = None
+        self._debug_line_count = 0
+        self._debug_reports: list[Callable[[], list[str]]] = []
+        self._shots_drawn = 0
+        self._offset_x: Optional[int] = None
+        self._offset_y: Optional[int] = None
+        self.is_visible = True
+        self._state = RenderState(clock, debug_tail=_DEBUG_MAX_LINES)
+        self._tick_ms = max(1, round(1000 / refresh_hz))
+        self._tick_due_ns = 0
+
+        self._build_window()
+        self._schedule_tick(self._tick_ms)
+
+    def _build_window(self) -> None:
+        """Create the Tk root window and everything drawn in it."""
         self.root = tk.Tk()
         self.root.title("cStrafe UI by CS2Kitchen")
         self.root.overrideredirect(True)
         self.root.attributes("-topmost", True)
         self.frame = tk.Frame(self.root, bd=2, relief="solid")
         self.frame.pack(fill=tk.BOTH, expand=True)
-        self.header_font_size = 12
-        self.body_font_size = 10
-        self.retro_font = "Courier"
-        self._debug_mode = debug_mode
 
+        self._build_widgets()
+
+        # Debug panel (row 3) — only created when debug_mode is enabled
+        if self._debug_mode:
+            self._build_debug_panel()
+
+    def _build_widgets(self) -> None:
+        """Create the result display inside rows 0-2 of ``self.frame``."""
         # Grid layout for self.frame children
         self.frame.grid_rowconfigure(2, weight=1)
         self.frame.grid_columnconfigure(0, weight=1)
@@ -66,18 +140,8 @@ class Overlay:
         self.right_bar.grid(row=0, column=2, sticky="nsew")
         self.right_bar.grid_remove()
 
-        # Debug panel (row 3) — only created when debug_mode is enabled
-        self._debug_text: Optional[tk.Text] = None
-        if debug_mode:
-            self._build_debug_panel()
-
-        self._offset_x: Optional[int] = None
-        self._offset_y: Optional[int] = None
         self.header.bind("<ButtonPress-1>", self._on_mouse_down)
         self.header.bind("<B1-Motion>", self._on_mouse_move)
-        self.is_visible = True
-        self._last_text: Optional[str] = None
-        self._last_bg_colour: Optional[str] = None
 
     def _build_debug_panel(self) -> None:
         """Create the debug log panel shown below the main body."""
@@ -133,108 +197,275 @@ class Overlay:
             y = event.y_root - self._offset_y
             self.root.geometry(f"+{x}+{y}")
 
-    def update_result(self, classification: ShotClassification) -> None:
-        label = classification.label
-        lines = [f"Classification: {label}"]
-        if label == "Counter-strafe" and classification.cs_time is not None and classification.shot_delay is not None:
+    def update_result(self, classification: ShotClassification, low_confidence: bool = False) -> None:
+        # The classifier reuses its result objects, so only derived strings
+        # may outlive this call.
+        label = classification.label_id
+        lines = [f"Classification: {classification.label}"]
+        if label == ShotLabel.COUNTER_STRAFE and classification.cs_time is not None and classification.shot_delay is not None:
             lines.append(f"CS time: {classification.cs_time:.0f} ms")
             lines.append(f"Shot delay: {classification.shot_delay:.0f} ms")
-        elif label == "Overlap" and classification.overlap_time is not None:
+        elif label == ShotLabel.OVERLAP and classification.overlap_time is not None:
             lines.append(f"Overlap: {classification.overlap_time:.0f} ms")
-        elif label == "Bad" and classification.cs_time is not None and classification.shot_delay is not None:
+        elif label == ShotLabel.BAD and classification.cs_time is not None and classification.shot_delay is not None:
             lines.append(f"CS time: {classification.cs_time:.0f} ms")
             lines.append(f"Shot delay: {classification.shot_delay:.0f} ms")
-        colours = {
-            "Counter-strafe": "#228b22",
-            "Perfect": "#228b22",
-            "Good": "#228b22",
-            "Overlap": "#ff8c00",
-            "Bad": "#cc0000",
-        }
-        bg_colour = colours.get(label, "#202020")
-        text = "\n".join(lines)
-        if text == self._last_text and bg_colour == self._last_bg_colour:
-            return
-        self._last_text = text
-        self._last_bg_colour = bg_colour
-        def apply_update() -> None:
-            self.frame.configure(bg=bg_colour)
-            self._inner_frame.configure(bg=bg_colour)
-            self.body.configure(text=text, bg=bg_colour)
-        self.root.after(0, apply_update)
+        if low_confidence:
+            lines.append("Low confidence: input stalled")
+        self._state.set_result("\n".join(lines), _LABEL_COLOURS[label])
 
     def run(self) -> None:
         self.root.mainloop()
 
+    def _schedule_tick(self, delay_ms: int) -> None:
+        watchdog = self._watchdog
+        if watchdog is not None:
+            self._tick_due_ns = watchdog.now_ns() + delay_ms * NS_PER_MS
+        self.root.after(delay_ms, self._tick)
+
+    def _tick(self) -> None:
+        watchdog = self._watchdog
+        if watchdog is not None:
+            watchdog.tick_ran(self._tick_due_ns, watchdog.now_ns())
+        if not self.is_visible and not self._state.wake_pending():
+            self._schedule_tick(_HIDDEN_POLL_MS)
+            return
+        latency = self._latency
+        tick_ns = latency.now_ns() if latency is not None else 0
+        update = self._state.take()
+        if update is not None:
+            if update.terminate:
+                self.root.destroy()
+                return
+            self._apply(update)
+            if latency is not None and update.result is not None:
+                self._record_latency(latency, update, tick_ns)
+            if self._debug_reports and update.result is not None and not update.toggle_visibility:
+                self._shots_drawn += 1
+                if self._shots_drawn % _DEBUG_REPORT_EVERY == 0:
+                    for report in self._debug_reports:
+                        for line in report():
+                            self.log_debug(line)
+        self._schedule_tick(self._tick_ms)
+
+    def _record_latency(self, latency: "LatencyTracker", update: FrameUpdate, tick_ns: int) -> None:
+        if update.toggle_visibility:
+            # Drawn on show/hide, not when it arrived; not a latency sample.
+            latency.discard_pending()
+            return
+        if not latency.record_render(tick_ns, latency.now_ns()):
+            return
+        if self._debug_mode and latency.shots % _DEBUG_REPORT_EVERY == 0:
+            for line in latency.report_lines():
+                self.log_debug(line)
+
+    def _apply(self, update: FrameUpdate) -> None:
+        if update.left_held is not None:
+            self._show_left_bar(update.left_held)
+        if update.right_held is not None:
+            self._show_right_bar(update.right_held)
+        if update.flash is not None:
+            self._show_flash(update.flash)
+        if update.result is not None:
+            self._show_result(*update.result)
+        if update.debug_lines:
+            self._append_debug_lines(update.debug_lines)
+        if update.font_step:
+            self._step_font_size(update.font_step)
+        if update.toggle_visibility:
+            if self.is_visible:
+                self.root.withdraw()
+            else:
+                self.root.deiconify()
+            self.is_visible = not self.is_visible
+
+    def _show_left_bar(self, shown: bool) -> None:
+        if shown:
+            self.left_bar.grid()
+        else:
+            self.left_bar.grid_remove()
+
+    def _show_right_bar(self, shown: bool) -> None:
+        if shown:
+            self.right_bar.grid()
+        else:
+            self.right_bar.grid_remove()
+
+    def _show_flash(self, shown: bool) -> None:
+        if shown:
+            self.top_bar.grid()
+        else:
+            self.top_bar.grid_remove()
+
+    def _show_result(self, text: str, bg_colour: str) -> None:
+        self.frame.configure(bg=bg_colour)
+        self._inner_frame.configure(bg=bg_colour)
+        self.body.configure(text=text, bg=bg_colour)
+
     def _apply_font_sizes(self) -> None:
         self.header.configure(font=(self.retro_font, self.header_font_size, "bold"))
         self.body.configure(font=(self.retro_font, self.body_font_size))
 
+    def _step_font_size(self, steps: int) -> None:
+        for _ in range(abs(steps)):
+            if steps > 0 and self.body_font_size < 24:
+                self.body_font_size += 2
+                self.header_font_size += 2
+            elif steps < 0 and self.body_font_size > 8:
+                self.body_font_size -= 2
+                self.header_font_size = max(10, self.header_font_size - 2)
+        self._apply_font_sizes()
+
     def increase_size(self) -> None:
-        if self.body_font_size < 24:
-            self.body_font_size += 2
-            self.header_font_size += 2
-            self._apply_font_sizes()
+        self._state.resize(1)
 
     def decrease_size(self) -> None:
-        if self.body_font_size > 8:
-            self.body_font_size -= 2
-            self.header_font_size = max(10, self.header_font_size - 2)
-            self._apply_font_sizes()
+        self._state.resize(-1)
 
     def toggle_visibility(self) -> None:
-        def do_toggle() -> None:
-            if self.is_visible:
-                self.root.withdraw()
-            else:
-                self.root.deiconify()
-            self.is_visible = not self.is_visible
-        self.root.after(0, do_toggle)
+        self._state.toggle_visibility()
 
     def set_left_key_held(self, held: bool) -> None:
-        def apply() -> None:
-            if held:
-                self.left_bar.grid()
-            else:
-                self.left_bar.grid_remove()
-        self.root.after(0, apply)
+        self._state.set_left_key_held(held)
 
     def set_right_key_held(self, held: bool) -> None:
-        def apply() -> None:
-            if held:
-                self.right_bar.grid()
-            else:
-                self.right_bar.grid_remove()
-        self.root.after(0, apply)
+        self._state.set_right_key_held(held)
 
     def flash_shot(self) -> None:
-        def show() -> None:
-            self.top_bar.grid()
-            self.root.after(150, hide)
-        def hide() -> None:
-            self.top_bar.grid_remove()
-        self.root.after(0, show)
+        self._state.flash_shot()
 
     def terminate(self) -> None:
-        self.root.after(0, self.root.destroy)
+        self._state.terminate()
+
+    def add_debug_report(self, report: Callable[[], list[str]]) -> None:
+        """
+        Show ``report()``'s lines in the debug panel every few shots; it runs
+        on the Tk thread.  No-op when debug_mode is off.
+        """
+        if self._debug_mode:
+            self._debug_reports.append(report)
 
     def log_debug(self, entry: str) -> None:
         """Append a timestamped line to the debug panel (thread-safe). No-op when debug_mode is off."""
-        if not self._debug_mode or self._debug_text is None:
+        if not self._debug_mode:
             return
-        ts = time.strftime("%H:%M:%S") + f".{int(time.time() * 1000) % 1000:03d}"
-        line = f"[{ts}] {entry}"
+        # Stored raw; formatted on the Tk thread only if it reaches the panel.
+        self._state.log_debug((time.time(), entry))
 
-        def _append() -> None:
-            widget = self._debug_text
-            if widget is None:
-                return
-            widget.insert(tk.END, line + "\n")
-            # Trim oldest lines when the buffer exceeds the cap
-            line_count = int(widget.index(tk.END).split(".")[0]) - 1
-            if line_count > _DEBUG_MAX_LINES:
-                excess = line_count - _DEBUG_MAX_LINES
-                widget.delete("1.0", f"{excess + 1}.0")
-            widget.see(tk.END)
-
-        self.root.after(0, _append)
+    def _append_debug_lines(self, entries: tuple[tuple[float, str], ...]) -> None:
+        widget = self._debug_text
+        if widget is None:
+            return
+        lines = []
+        for wall_time, entry in entries:
+            ts = time.strftime("%H:%M:%S", time.localtime(wall_time))
+            lines.append(f"[{ts}.{int(wall_time * 1000) % 1000:03d}] {entry}\n")
+        widget.insert(tk.END, "".join(lines))
+        # Trim oldest lines when the buffer exceeds the cap
+        self._debug_line_count += len(lines)
+        excess = self._debug_line_count - _DEBUG_MAX_LINES
+        if excess > 0:
+            widget.delete("1.0", f"{excess + 1}.0")
+            self._debug_line_count = _DEBUG_MAX_LINES
+        widget.see(tk.END)
+
+
+class CanvasOverlay(Overlay):
+    """
+    Overlay drawn on a single Canvas instead of a tree of Frames and Labels.
+
+    Every element is a canvas item created once; updates only change item
+    options (``itemconfigure``) or, when the text or font size changes,
+    recompute the layout (``coords``).  Fonts are ``tkinter.font.Font``
+    objects cached per size, so Tk never re-parses a font description.
+    Space for the flash and key bars is always reserved, so showing them
+    does not resize the window.
+    """
+
+    _TOP_BAR_HEIGHT = 4
+    _KEY_BAR_WIDTH = 6
+    _BODY_PAD_X = 8
+    _BODY_PAD_Y = 4
+
+    def _build_widgets(self) -> None:
+        self._fonts: dict[tuple[int, bool], tkfont.Font] = {}
+        self._header_text = "cStrafe UI"
+        self._body_text = "Waiting for input..."
+        self.frame.grid_columnconfigure(0, weight=1)
+        self.canvas = tk.Canvas(self.frame, bg="#202020", bd=0, highlightthickness=0)
+        self.canvas.grid(row=0, column=0, sticky="nsew")
+
+        c = self.canvas
+        self._top_bar = c.create_rectangle(0, 0, 0, 0, fill="#ff6600", width=0, state=tk.HIDDEN)
+        self._header_bg = c.create_rectangle(0, 0, 0, 0, fill="#303030", width=0, tags="header")
+        self._header = c.create_text(
+            0, 0, text=self._header_text, fill="white", anchor=tk.N, justify=tk.CENTER, tags="header"
+        )
+        self._body = c.create_text(0, 0, text=self._body_text, fill="white", anchor=tk.N, justify=tk.CENTER)
+        self._left_bar = c.create_rectangle(0, 0, 0, 0, fill="#ffff00", width=0, state=tk.HIDDEN)
+        self._right_bar = c.create_rectangle(0, 0, 0, 0, fill="#ffff00", width=0, state=tk.HIDDEN)
+
+        c.tag_bind("header", "<ButtonPress-1>", self._on_mouse_down)
+        c.tag_bind("header", "<B1-Motion>", self._on_mouse_move)
+        self._apply_font_sizes()
+
+    def _font(self, size: int, bold: bool = False) -> tkfont.Font:
+        font = self._fonts.get((size, bold))
+        if font is None:
+            font = tkfont.Font(
+                root=self.root, family=self.retro_font, size=size, weight="bold" if bold else "normal"
+            )
+            self._fonts[(size, bold)] = font
+        return font
+
+    def _layout(self) -> None:
+        """Size the canvas to the current text and fonts and place every item."""
+        header_font = self._font(self.header_font_size, bold=True)
+        body_font = self._font(self.body_font_size)
+        body_lines = self._body_text.split("\n")
+        body_width = max(body_font.measure(line) for line in body_lines)
+        width = max(
+            header_font.measure(self._header_text) + 2,
+            body_width + 2 * (self._BODY_PAD_X + self._KEY_BAR_WIDTH),
+        )
+        header_top = self._TOP_BAR_HEIGHT
+        body_top = header_top + header_font.metrics("linespace") + 2
+        height = body_top + body_font.metrics("linespace") * len(body_lines) + 2 * self._BODY_PAD_Y
+
+        c = self.canvas
+        c.coords(self._top_bar, 0, 0, width, header_top)
+        c.coords(self._header_bg, 0, header_top, width, body_top)
+        c.coords(self._header, width // 2, header_top + 1)
+        c.coords(self._body, width // 2, body_top + self._BODY_PAD_Y)
+        c.coords(self._left_bar, 0, body_top, self._KEY_BAR_WIDTH, height)
+        c.coords(self._right_bar, width - self._KEY_BAR_WIDTH, body_top, width, height)
+        c.configure(width=width, height=height)
+
+    def _show_left_bar(self, shown: bool) -> None:
+        self.canvas.itemconfigure(self._left_bar, state=tk.NORMAL if shown else tk.HIDDEN)
+
+    def _show_right_bar(self, shown: bool) -> None:
+        self.canvas.itemconfigure(self._right_bar, state=tk.NORMAL if shown else tk.HIDDEN)
+
+    def _show_flash(self, shown: bool) -> None:
+        self.canvas.itemconfigure(self._top_bar, state=tk.NORMAL if shown else tk.HIDDEN)
+
+    def _show_result(self, text: str, bg_colour: str) -> None:
+        self.frame.configure(bg=bg_colour)
+        self.canvas.configure(bg=bg_colour)
+        if text != self._body_text:
+            self._body_text = text
+            self.canvas.itemconfigure(self._body, text=text)
+            self._layout()
+
+    def _apply_font_sizes(self) -> None:
+        self.canvas.itemconfigure(self._header, font=self._font(self.header_font_size, bold=True))
+        self.canvas.itemconfigure(self._body, font=self._font(self.body_font_size))
+        self._layout()
+
+
+# Selectable overlay implementations, by --renderer name.
+OVERLAYS: dict[str, Type[Overlay]] = {
+    "widgets": Overlay,
+    "canvas": CanvasOverlay,
+}
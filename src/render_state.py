@@ -0,0 +1,142 @@
+"""Thread-safe overlay state, applied once per render tick.
+
+Producers (the classifier consumer thread, the keyboard hook) never touch
+Tk.  They only record what the overlay should look like in a RenderState;
+the Tk thread calls ``take()`` at a fixed rate and applies the returned
+FrameUpdate, which holds only what changed since the previous tick.
+
+Repeated updates between two ticks collapse: a key bar toggled on and off
+again produces no update at all, only the newest shot result is drawn (a
+new shot's result counts as new even when its text repeats), and
+every ``flash_shot()`` just pushes back the one flash deadline.  While the
+overlay is hidden the Tk thread only asks ``wake_pending()``; the wanted
+state keeps being overwritten and the debug ring keeps only the newest
+``debug_tail`` entries, so the first ``take()`` after showing again redraws once
+from the latest state.
+"""
+
+import threading
+from collections import deque
+from typing import Any, NamedTuple, Optional
+
+from clock import NS_PER_MS, Clock, PerfCounterClock
+
+FLASH_MS = 150
+DEBUG_TAIL = 60
+
+
+class FrameUpdate(NamedTuple):
+    """Changes to apply in one tick; None / empty / zero means unchanged."""
+
+    left_held: Optional[bool] = None
+    right_held: Optional[bool] = None
+    flash: Optional[bool] = None
+    result: Optional[tuple[str, str]] = None  # (body text, background colour)
+    debug_lines: tuple[Any, ...] = ()  # raw log_debug entries, oldest first
+    toggle_visibility: bool = False
+    font_step: int = 0
+    terminate: bool = False
+
+
+class RenderState:
+    """
+    Pending overlay state.  Single-value fields are plain attribute stores
+    (atomic under the GIL); the accumulating ones take a short lock.
+    ``take()`` is called only from the Tk thread.
+    """
+
+    def __init__(
+        self,
+        clock: Optional[Clock] = None,
+        flash_ms: int = FLASH_MS,
+        debug_tail: int = DEBUG_TAIL,
+    ) -> None:
+        self._now_ns = (clock or PerfCounterClock()).now_ns
+        self._flash_ns = flash_ms * NS_PER_MS
+        self._lock = threading.Lock()
+        # Wanted state, written by producers.
+        self._left_held = False
+        self._right_held = False
+        self._flash_until = 0
+        # (sequence number, result): one store, so take() never pairs a
+        # number with another shot's result.
+        self._result: tuple[int, Optional[tuple[str, str]]] = (0, None)
+        self._debug_lines: deque[Any] = deque(maxlen=debug_tail)
+        self._toggles = 0
+        self._font_step = 0
+        self._terminate = False
+        # Applied state, owned by the Tk thread.
+        self._shown_left = False
+        self._shown_right = False
+        self._shown_flash = False
+        self._shown_result_seq = 0
+
+    # -- producers ---------------------------------------------------------
+
+    def set_left_key_held(self, held: bool) -> None:
+        self._left_held = held
+
+    def set_right_key_held(self, held: bool) -> None:
+        self._right_held = held
+
+    def flash_shot(self) -> None:
+        self._flash_until = self._now_ns() + self._flash_ns
+
+    def set_result(self, text: str, colour: str) -> None:
+        """Called from one producer thread at a time."""
+        self._result = (self._result[0] + 1, (text, colour))
+
+    def log_debug(self, entry: Any) -> None:
+        """Queue a raw debug entry; the Tk thread formats it, if it is ever shown."""
+        self._debug_lines.append(entry)  # deque.append is atomic
+
+    def toggle_visibility(self) -> None:
+        with self._lock:
+            self._toggles += 1
+
+    def resize(self, step: int) -> None:
+        with self._lock:
+            self._font_step += step
+
+    def terminate(self) -> None:
+        self._terminate = True
+
+    # -- Tk thread -------------------------------------------------------------
+
+    def wake_pending(self) -> bool:
+        """True when a hidden overlay must run ``take()``: shown again or terminating."""
+        return bool(self._toggles & 1) or self._terminate
+
+    def take(self) -> Optional[FrameUpdate]:
+        """Return what changed since the last call, or None if nothing did."""
+        with self._lock:
+            toggles, self._toggles = self._toggles, 0
+            font_step, self._font_step = self._font_step, 0
+        # Only this thread pops and producers only append, so the ring holds
+        # at least the length seen here for the whole drain.
+        ring = self._debug_lines
+        debug_lines = tuple([ring.popleft() for _ in range(len(ring))])
+        left = self._left_held
+        right = self._right_held
+        flash = self._now_ns() < self._flash_until
+        result_seq, result = self._result
+        update = FrameUpdate(
+            left_held=None if left == self._shown_left else left,
+            right_held=None if right == self._shown_right else right,
+            flash=None if flash == self._shown_flash else flash,
+            result=None if result_seq == self._shown_result_seq else result,
+            debug_lines=debug_lines,
+            toggle_visibility=bool(toggles & 1),
+            font_step=font_step,
+            terminate=self._terminate,
+        )
+        if update == _NO_CHANGE:
+            return None
+        self._shown_left = left
+        self._shown_right = right
+        self._shown_flash = flash
+        self._shown_result_seq = result_seq
+        return update
+
+
+_NO_CHANGE = FrameUpdate()
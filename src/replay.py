@@ -0,0 +1,325 @@
+"""Replay a recorded key/click trace through any classifier.
+
+Usage::
+
+    python replay.py TRACE [--classifier pp] [--check] [--shots]
+    python replay.py TRACE --realtime [--speed 2] [--renderer canvas]
+    python replay.py SESSION.bin --to-jsonl TRACE.jsonl
+    python replay.py TRACE --keyframes TRACE.cstk [--interval 256]
+    python replay.py TRACE.cstk --shot 4000
+
+TRACE is either a binary session log written by ``main.py --record`` or a
+JSONL trace.  A JSONL trace starts with an optional header line and then
+has one event per line::
+
+    {"trace": "cstrafe", "version": 1, "ticks_per_ms": 1000000}
+    {"t": 0, "event": "press", "key": "left"}
+    {"t": 100000000, "event": "release", "key": "left"}
+    {"t": 120000000, "event": "press", "key": "right"}
+    {"t": 220000000, "event": "shot"}
+
+``t`` is an integer tick count (nanoseconds unless the header says
+otherwise), ``event`` is press/release/shot and ``key`` is a key role --
+forward, backward, left, right, shift or ctrl -- so a trace does not depend
+on the player's bindings.
+
+By default the trace runs through the classifier's batched ``feed()`` as
+fast as possible; event timestamps come from the trace, so the results are
+the ones the live run produced.  ``--check`` compares them with the shot
+log recorded next to a binary session.  ``--realtime`` instead paces the
+events against the wall clock and drives the real Overlay, whose shot
+flash runs on a VirtualClock moved to each replayed event.  ``--keyframes``
+writes a seekable keyframed trace (see ``keyframe_trace``), and ``--shot``
+classifies a single shot of one without replaying the shots before it.
+"""
+
+import argparse
+import json
+import threading
+import time
+from collections import Counter
+from typing import Any, Callable, Iterable, NamedTuple, Optional
+
+from classifier import CLASSIFIERS, MovementClassifierInterface, ShotFilterInterface
+from classifier.events import EVENT_SHOT, pack_events
+from classifier.key_codes import KEY_NONE
+from clock import NS_PER_MS, VirtualClock
+from keyframe_trace import DEFAULT_INTERVAL, KEYFRAME_MAGIC, KeyframeTrace, write_keyframe_trace
+from session_log import (
+    LOG_MAGIC,
+    SHOT_CTRL_HELD,
+    SHOT_LOW_CONFIDENCE,
+    SHOT_SHIFT_HELD,
+    LogReader,
+    read_events,
+    read_shots,
+    shots_path,
+)
+
+TRACE_VERSION = 1
+
+EVENT_NAMES = ("press", "release", "shot")
+KEY_ROLES = ("forward", "backward", "left", "right", "shift", "ctrl")
+
+Event = tuple[int, int, int]
+
+
+class Trace(NamedTuple):
+    events: list[Event]  # (kind, key code, timestamp)
+    ticks_per_ms: int
+
+
+# ---------------------------------------------------------------------------
+# Trace files
+# ---------------------------------------------------------------------------
+
+def load_trace(path: str) -> Trace:
+    """Read a binary session log, a keyframed trace or a JSONL trace."""
+    with open(path, "rb") as f:
+        magic = f.read(len(LOG_MAGIC))
+    if magic == LOG_MAGIC:
+        with LogReader(path) as reader:
+            ticks_per_ms = reader.ticks_per_ms
+        return Trace(read_events(path), ticks_per_ms)
+    if magic == KEYFRAME_MAGIC:
+        with KeyframeTrace(path) as keyframed:
+            return Trace(list(keyframed.events()), keyframed.ticks_per_ms)
+    return _load_jsonl(path)
+
+
+def _load_jsonl(path: str) -> Trace:
+    events: list[Event] = []
+    ticks_per_ms = NS_PER_MS
+    with open(path, encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            if "trace" in record:
+                if record.get("version", TRACE_VERSION) != TRACE_VERSION:
+                    raise ValueError(f"{path}:{line_no}: unsupported trace version {record['version']}")
+                ticks_per_ms = int(record.get("ticks_per_ms", ticks_per_ms))
+                continue
+            try:
+                kind = EVENT_NAMES.index(record["event"])
+                key = KEY_NONE if kind == EVENT_SHOT else KEY_ROLES.index(record["key"])
+                events.append((kind, key, int(record["t"])))
+            except (KeyError, ValueError) as exc:
+                raise ValueError(f"{path}:{line_no}: bad trace event {line!r}") from exc
+    return Trace(events, ticks_per_ms)
+
+
+def write_trace(path: str, trace: Trace) -> None:
+    """Write ``trace`` as JSONL (see the module docstring)."""
+    with open(path, "w", encoding="utf-8") as f:
+        header = {"trace": "cstrafe", "version": TRACE_VERSION, "ticks_per_ms": trace.ticks_per_ms}
+        f.write(json.dumps(header) + "\n")
+        for kind, key, timestamp in trace.events:
+            record: dict[str, Any] = {"t": timestamp, "event": EVENT_NAMES[kind]}
+            if kind != EVENT_SHOT:
+                record["key"] = KEY_ROLES[key]
+            f.write(json.dumps(record) + "\n")
+
+
+# ---------------------------------------------------------------------------
+# Replay
+# ---------------------------------------------------------------------------
+
+def classify_trace(
+    trace: Trace,
+    classifier: MovementClassifierInterface,
+    shot_filter: ShotFilterInterface,
+) -> list[Any]:
+    """Final (filtered) result of every shot, run through ``feed()``."""
+    return [shot_filter.apply(result) for result in classifier.feed(pack_events(trace.events))]
+
+
+def replay_paced(
+    trace: Trace,
+    handler: Callable[[int, int, int], None],
+    clock: VirtualClock,
+    speed: float = 1.0,
+    stop: Optional[threading.Event] = None,
+) -> None:
+    """
+    Deliver events to ``handler(kind, key, timestamp)`` spaced out on the
+    wall clock, ``speed`` times faster than recorded.  ``clock`` is moved
+    to each event's time, in nanoseconds, before its handler runs.
+    """
+    if not trace.events:
+        return
+    ticks_per_ms = trace.ticks_per_ms
+    ns_per_tick = NS_PER_MS / ticks_per_ms / speed
+    first = trace.events[0][2]
+    start = time.perf_counter_ns()
+    for kind, key, timestamp in trace.events:
+        delay_ns = start + (timestamp - first) * ns_per_tick - time.perf_counter_ns()
+        if delay_ns > 0:
+            if stop is not None:
+                if stop.wait(delay_ns / 1e9):
+                    return
+            else:
+                time.sleep(delay_ns / 1e9)
+        clock.advance_to(timestamp * NS_PER_MS // ticks_per_ms)
+        handler(kind, key, timestamp)
+
+
+def _result_fields(result: Any) -> tuple:
+    return (
+        result.label_id,
+        getattr(result, "sub_label_id", 0),
+        (SHOT_SHIFT_HELD if getattr(result, "shift_held", False) else 0)
+        | (SHOT_CTRL_HELD if getattr(result, "ctrl_held", False) else 0),
+        result.cs_time,
+        result.shot_delay,
+        result.overlap_time,
+    )
+
+
+def compare_with_recording(path: str, trace: Trace, results: Iterable[Any]) -> list[int]:
+    """Indices of shots whose replayed result differs from ``path``'s shot log."""
+    recorded = read_shots(shots_path(path))
+    replayed = list(results)
+    shot_times = [t for kind, _, t in trace.events if kind == EVENT_SHOT]
+    # The live watchdog's low-confidence flag is not part of the result.
+    mismatches = [
+        i
+        for i, (shot, result, t) in enumerate(zip(recorded, replayed, shot_times))
+        if shot[0] != t
+        or (*shot[1:3], shot[3] & ~SHOT_LOW_CONFIDENCE, *shot[4:]) != _result_fields(result)
+    ]
+    shorter = min(len(recorded), len(replayed))
+    mismatches.extend(range(shorter, max(len(recorded), len(replayed))))
+    return mismatches
+
+
+# ---------------------------------------------------------------------------
+# Command line
+# ---------------------------------------------------------------------------
+
+def parse_args() -> argparse.Namespace:
+    # Imported here, like in _run_realtime, so loading replay never needs Tk.
+    from overlay import OVERLAYS
+
+    parser = argparse.ArgumentParser(description="Replay a recorded cStrafe trace")
+    parser.add_argument("trace", help="Binary session log (--record) or JSONL trace")
+    parser.add_argument(
+        "--classifier",
+        choices=list(CLASSIFIERS),
+        default="pp",
+        help="Classifier to use (default: pp)",
+    )
+    parser.add_argument("--shots", action="store_true", help="Print every shot result")
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Compare with the shot log recorded next to a binary session "
+        "(use the classifier the session was recorded with)",
+    )
+    parser.add_argument("--realtime", action="store_true", help="Pace events and show the overlay")
+    parser.add_argument("--speed", type=float, default=1.0, help="Playback speed for --realtime")
+    parser.add_argument(
+        "--renderer",
+        choices=list(OVERLAYS),
+        default="widgets",
+        help="Overlay implementation for --realtime (default: widgets)",
+    )
+    parser.add_argument("--to-jsonl", metavar="OUT", help="Write the trace as JSONL and exit")
+    parser.add_argument(
+        "--keyframes",
+        metavar="OUT",
+        help="Write a keyframed trace for --classifier and exit",
+    )
+    parser.add_argument(
+        "--interval",
+        type=int,
+        default=DEFAULT_INTERVAL,
+        help=f"Shots between keyframes (default: {DEFAULT_INTERVAL})",
+    )
+    parser.add_argument("--shot", type=int, metavar="N", help="Classify shot N of a keyframed trace")
+    return parser.parse_args()
+
+
+def _run_realtime(trace: Trace, classifier_name: str, speed: float, renderer: str) -> None:
+    from event_pipeline import ClassifierSink
+    from overlay import OVERLAYS
+
+    from render_state import FLASH_MS
+
+    MovementClassifier, ShotFilter = CLASSIFIERS[classifier_name]
+    # Replayed time, not the wall clock, decides how long a shot flashes.
+    clock = VirtualClock()
+    overlay = OVERLAYS[renderer](clock=clock)
+    sink = ClassifierSink(
+        overlay, MovementClassifier(ticks_per_ms=trace.ticks_per_ms), ShotFilter()
+    )
+    stop = threading.Event()
+
+    def play() -> None:
+        replay_paced(trace, sink.handle, clock, speed, stop)
+        # Nothing moves the clock after the last event; let its flash run out.
+        if not stop.wait(FLASH_MS / 1000 / speed):
+            clock.advance_to(clock.now_ns() + FLASH_MS * NS_PER_MS)
+
+    worker = threading.Thread(target=play, name="cstrafe-replay", daemon=True)
+    worker.start()
+    try:
+        overlay.run()
+    finally:
+        stop.set()
+
+
+def main() -> int:
+    args = parse_args()
+    if args.shot is not None:
+        with KeyframeTrace(args.trace) as keyframed:
+            (result,) = keyframed.classify_shots(args.shot)
+        print(result.to_display_string())
+        return 0
+    trace = load_trace(args.trace)
+    if args.keyframes:
+        write_keyframe_trace(
+            args.keyframes, trace.events, args.classifier, trace.ticks_per_ms, args.interval
+        )
+        return 0
+    if args.to_jsonl:
+        write_trace(args.to_jsonl, trace)
+        return 0
+    if args.realtime:
+        _run_realtime(trace, args.classifier, args.speed, args.renderer)
+        return 0
+
+    MovementClassifier, ShotFilter = CLASSIFIERS[args.classifier]
+    start = time.perf_counter()
+    results = classify_trace(
+        trace, MovementClassifier(ticks_per_ms=trace.ticks_per_ms), ShotFilter()
+    )
+    elapsed = time.perf_counter() - start
+
+    if args.shots:
+        for result in results:
+            print(result.to_display_string().replace("\n", " | "))
+    span_s = (trace.events[-1][2] - trace.events[0][2]) / trace.ticks_per_ms / 1000 if trace.events else 0.0
+    print(
+        f"{len(trace.events)} events, {len(results)} shots, {span_s:.1f} s of play "
+        f"replayed in {elapsed * 1000:.1f} ms"
+    )
+    for label, count in Counter(result.label for result in results).most_common():
+        print(f"  {label:<15} {count}")
+
+    if args.check:
+        try:
+            mismatches = compare_with_recording(args.trace, trace, results)
+        except FileNotFoundError:
+            print(f"no shot log at {shots_path(args.trace)} to check against")
+            return 2
+        if mismatches:
+            print(f"{len(mismatches)} shots differ from the recording (first: #{mismatches[0]})")
+            return 1
+        print("all shots match the recording")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
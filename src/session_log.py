@@ -0,0 +1,236 @@
+"""Append-only binary session logs written through ``mmap``.
+
+``--record PATH`` writes two logs: ``PATH`` holds every key/click event the
+classifier sees and ``PATH.shots`` (see ``shots_path``) holds the classified
+result of every shot.  Both share one layout: a fixed header followed by
+fixed-width little-endian records.
+
+The header stores the number of committed records, so a log cut short by a
+crash is still readable up to the last complete record.  Files grow in
+preallocated chunks; appending a record is a ``struct.pack_into`` into the
+mapping with no system call.  Readers decode straight from a read-only
+mapping with ``struct.iter_unpack`` over a ``memoryview``.
+"""
+
+import math
+import mmap
+import os
+import struct
+import threading
+from typing import Any, Iterator, Optional
+
+from classifier.key_codes import KEY_NONE
+from clock import NS_PER_MS
+
+LOG_MAGIC = b"CSTRAFE\x00"
+LOG_VERSION = 1
+
+STREAM_EVENTS = 0
+STREAM_SHOTS = 1
+
+# magic, version, stream, record size, ticks per ms, record count
+HEADER = struct.Struct("<8sHHHxxQQ")
+_COUNT_OFFSET = HEADER.size - 8
+
+# timestamp, event kind, key code
+EVENT_RECORD = struct.Struct("<qbb6x")
+# timestamp, label id, sub-label id, modifier flags, cs_time, shot_delay,
+# overlap_time (ms, NaN for None)
+SHOT_RECORD = struct.Struct("<qBBB5xddd")
+_RECORDS = {STREAM_EVENTS: EVENT_RECORD, STREAM_SHOTS: SHOT_RECORD}
+
+SHOT_SHIFT_HELD = 1
+SHOT_CTRL_HELD = 2
+SHOT_LOW_CONFIDENCE = 4  # timing overlapped a hook or Tk stall
+
+CHUNK_RECORDS = 65536
+
+
+def shots_path(path: str) -> str:
+    """Path of the shot-result side stream recorded alongside ``path``."""
+    return path + ".shots"
+
+
+class LogWriter:
+    """
+    One append-only log.  ``append()`` packs a record straight into the
+    mapping; when a chunk fills up the file and mapping grow by another
+    ``chunk_records`` records.  ``close()`` trims the preallocated tail.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        stream: int,
+        ticks_per_ms: int = NS_PER_MS,
+        chunk_records: int = CHUNK_RECORDS,
+    ) -> None:
+        self.path = path
+        self.record = _RECORDS[stream]
+        self.count = 0
+        self._chunk_bytes = chunk_records * self.record.size
+        self._end = HEADER.size
+        self._file = open(path, "w+b")
+        self._file.truncate(HEADER.size + self._chunk_bytes)
+        self._map: Optional[mmap.mmap] = mmap.mmap(self._file.fileno(), 0)
+        HEADER.pack_into(
+            self._map, 0, LOG_MAGIC, LOG_VERSION, stream, self.record.size, ticks_per_ms, 0
+        )
+
+    def append(self, *fields: Any) -> None:
+        end = self._end
+        size = self.record.size
+        m = self._map
+        assert m is not None, "log is closed"
+        if end + size > len(m):
+            m.resize(len(m) + self._chunk_bytes)
+        self.record.pack_into(m, end, *fields)
+        self._end = end + size
+        self.count += 1
+        # Publish the record only after it is fully written.
+        struct.pack_into("<Q", m, _COUNT_OFFSET, self.count)
+
+    def close(self) -> None:
+        m = self._map
+        if m is None:
+            return
+        self._map = None
+        m.flush()
+        m.close()
+        self._file.truncate(self._end)
+        self._file.close()
+
+
+class SessionRecorder:
+    """
+    Records a live session: raw classifier input to ``path`` and shot
+    results to ``shots_path(path)``.  Records come only from the consumer
+    thread, but ``close`` may run on another while the consumer is still
+    draining at shutdown; records that arrive after it are dropped.
+    """
+
+    def __init__(self, path: str, ticks_per_ms: int = NS_PER_MS) -> None:
+        self.path = path
+        self._events = LogWriter(path, STREAM_EVENTS, ticks_per_ms)
+        self._shots = LogWriter(shots_path(path), STREAM_SHOTS, ticks_per_ms)
+        # Uncontended except at shutdown; keeps close() from unmapping a
+        # log under an append.
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def record_event(self, kind: int, key: Optional[int], timestamp: int) -> None:
+        with self._lock:
+            if not self._closed:
+                self._events.append(timestamp, kind, KEY_NONE if key is None else key)
+
+    def record_shot(self, timestamp: int, result: Any, low_confidence: bool = False) -> None:
+        """Store a ShotClassification of either classifier."""
+        flags = SHOT_LOW_CONFIDENCE if low_confidence else 0
+        if getattr(result, "shift_held", False):
+            flags |= SHOT_SHIFT_HELD
+        if getattr(result, "ctrl_held", False):
+            flags |= SHOT_CTRL_HELD
+        with self._lock:
+            if self._closed:
+                return
+            self._shots.append(
+                timestamp,
+                result.label_id,
+                getattr(result, "sub_label_id", 0),
+                flags,
+                _nan_if_none(result.cs_time),
+                _nan_if_none(result.shot_delay),
+                _nan_if_none(result.overlap_time),
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            self._events.close()
+            self._shots.close()
+
+    def __enter__(self) -> "SessionRecorder":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+class LogReader:
+    """
+    Read-only view of a log written by LogWriter.  ``records()`` decodes
+    lazily from the mapping; close the reader (or use it as a context
+    manager) once the iterator is exhausted.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size < HEADER.size:
+                raise ValueError(f"{path}: not a session log (file too short)")
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, stream, record_size, ticks_per_ms, count = HEADER.unpack_from(self._map)
+        if magic != LOG_MAGIC:
+            self._map.close()
+            raise ValueError(f"{path}: not a session log")
+        if version != LOG_VERSION or stream not in _RECORDS:
+            self._map.close()
+            raise ValueError(f"{path}: unsupported log version {version} / stream {stream}")
+        self.version = version
+        self.stream = stream
+        self.record = _RECORDS[stream]
+        if record_size != self.record.size:
+            self._map.close()
+            raise ValueError(f"{path}: record size {record_size} != {self.record.size}")
+        self.ticks_per_ms = ticks_per_ms
+        # A crash can leave the count ahead of the data that reached disk.
+        self.count = min(count, (size - HEADER.size) // record_size)
+        self._view = memoryview(self._map)[HEADER.size: HEADER.size + self.count * record_size]
+
+    def __len__(self) -> int:
+        return self.count
+
+    def records(self) -> Iterator[tuple]:
+        return self.record.iter_unpack(self._view)
+
+    def close(self) -> None:
+        self._view.release()
+        self._map.close()
+
+    def __enter__(self) -> "LogReader":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+def read_events(path: str) -> list[tuple[int, int, int]]:
+    """All ``(kind, key, timestamp)`` events of a recorded session."""
+    with LogReader(path) as reader:
+        if reader.stream != STREAM_EVENTS:
+            raise ValueError(f"{path}: not an event log")
+        return [(kind, key, timestamp) for timestamp, kind, key in reader.records()]
+
+
+def read_shots(path: str) -> list[tuple]:
+    """
+    All shot results of a recorded session as ``(timestamp, label_id,
+    sub_label_id, flags, cs_time, shot_delay, overlap_time)`` with None for
+    missing durations; ``flags`` is a mask of SHOT_*_HELD.
+    """
+    with LogReader(path) as reader:
+        if reader.stream != STREAM_SHOTS:
+            raise ValueError(f"{path}: not a shot log")
+        return [
+            (timestamp, label, sub_label, flags, *map(_none_if_nan, durations))
+            for timestamp, label, sub_label, flags, *durations in reader.records()
+        ]
+
+
+def _none_if_nan(value: float) -> Optional[float]:
+    return None if math.isnan(value) else value
+
+
+def _nan_if_none(value: Optional[float]) -> float:
+    return math.nan if value is None else value
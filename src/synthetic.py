@@ -0,0 +1,264 @@
+"""Seeded synthetic strafing sessions for benchmarks, soak runs and tests.
+
+A session is a sequence of engagements, each drawn from a StrafeModel: a
+counter-strafe (optionally followed by a burst of shots), an overlap, a run
+of ADAD taps, or shots with no movement at all.  Durations come from
+log-normal distributions (median and spread in milliseconds), which is how
+human tap lengths and reaction times are usually modelled; the models'
+tails produce late counter-strafes and early shots without special cases.
+Shift / Ctrl can be held across an engagement, and keys held past the OS
+autorepeat delay can emit repeated presses like a real keyboard hook.
+
+Events are ``(kind, key, timestamp)`` with integer key codes from
+``classifier.key_codes`` and integer tick timestamps, strictly ordered in
+time.  ``generate`` streams any number of them in constant memory;
+``generate_packed`` yields the same stream as flat int64 chunks for
+``feed()`` and the batch classifiers; ``named_events`` converts keys to the
+names of a key layout.
+"""
+
+import math
+import random
+from array import array
+from typing import Iterator, NamedTuple, Optional, Union
+
+from classifier.events import EVENT_FIELDS, EVENT_PRESS, EVENT_RELEASE, EVENT_SHOT, EVENT_TYPECODE
+from classifier.key_codes import (
+    KEY_BACKWARD,
+    KEY_CTRL,
+    KEY_FORWARD,
+    KEY_LEFT,
+    KEY_NONE,
+    KEY_RIGHT,
+    KEY_SHIFT,
+    MODIFIER_NAMES,
+)
+
+Event = tuple[int, int, int]
+
+# (forward, backward, left, right): movement_keys.py's WASD defaults and the
+# ESDF layout key_config falls back to.
+LAYOUTS = {
+    "wasd": ("W", "S", "A", "D"),
+    "esdf": ("E", "D", "S", "F"),
+}
+
+PATTERN_COUNTER_STRAFE = "counter_strafe"
+PATTERN_OVERLAP = "overlap"
+PATTERN_ADAD = "adad"
+PATTERN_IDLE = "idle"
+
+AUTOREPEAT_DELAY_MS = 500.0
+AUTOREPEAT_INTERVAL_MS = 33.0
+
+
+class Spread(NamedTuple):
+    """Log-normal duration: ``median`` ms, ``sigma`` the log-space spread."""
+
+    median: float
+    sigma: float
+
+    def draw(self, rng: random.Random) -> float:
+        return self.median * math.exp(self.sigma * rng.gauss(0.0, 1.0))
+
+
+class StrafeModel(NamedTuple):
+    weights: tuple[tuple[str, float], ...] = (
+        (PATTERN_COUNTER_STRAFE, 0.55),
+        (PATTERN_OVERLAP, 0.15),
+        (PATTERN_ADAD, 0.2),
+        (PATTERN_IDLE, 0.1),
+    )
+    hold: Spread = Spread(260.0, 0.5)  # strafe key held before the stop
+    reaction: Spread = Spread(35.0, 0.6)  # release -> counter-press
+    shot_delay: Spread = Spread(110.0, 0.45)  # counter-press -> shot
+    overlap: Spread = Spread(30.0, 0.7)  # both keys held
+    tap: Spread = Spread(85.0, 0.35)  # one ADAD tap
+    gap: Spread = Spread(350.0, 0.8)  # between engagements
+    vertical: float = 0.15  # chance an engagement strafes on W/S
+    burst: float = 0.25  # chance of 2-5 shots after a counter-strafe
+    shift: float = 0.05  # chance Shift is held through an engagement
+    ctrl: float = 0.05  # same for Ctrl
+    autorepeat: bool = False  # repeat presses of keys held past the delay
+
+
+DEFAULT_MODEL = StrafeModel()
+
+# Single-pattern models: the canonical benchmark workloads.
+SCENARIOS = {
+    "clean": DEFAULT_MODEL._replace(weights=((PATTERN_COUNTER_STRAFE, 1.0),), burst=0.0, shift=0.0, ctrl=0.0),
+    "overlap": DEFAULT_MODEL._replace(weights=((PATTERN_OVERLAP, 1.0),), shift=0.0, ctrl=0.0),
+    "adad": DEFAULT_MODEL._replace(weights=((PATTERN_ADAD, 1.0),), shift=0.0, ctrl=0.0),
+    "idle": DEFAULT_MODEL._replace(weights=((PATTERN_IDLE, 1.0),)),
+    "mixed": DEFAULT_MODEL,
+}
+
+
+class _Session:
+    """Builds one engagement at a time as (ms, kind, key) tuples."""
+
+    def __init__(self, model: StrafeModel, rng: random.Random) -> None:
+        self.model = model
+        self.rng = rng
+        self.patterns = [name for name, _ in model.weights]
+        self.cum_weights = []
+        total = 0.0
+        for _, weight in model.weights:
+            total += weight
+            self.cum_weights.append(total)
+        self.builders = {
+            PATTERN_COUNTER_STRAFE: self._counter_strafe,
+            PATTERN_OVERLAP: self._overlap,
+            PATTERN_ADAD: self._adad,
+            PATTERN_IDLE: self._idle,
+        }
+
+    def _axis_keys(self) -> tuple[int, int]:
+        rng = self.rng
+        first, second = (
+            (KEY_FORWARD, KEY_BACKWARD) if rng.random() < self.model.vertical else (KEY_LEFT, KEY_RIGHT)
+        )
+        return (first, second) if rng.random() < 0.5 else (second, first)
+
+    def _hold(self, out: list, key: int, start: float, end: float) -> None:
+        out.append((start, EVENT_PRESS, key))
+        if self.model.autorepeat and end - start > AUTOREPEAT_DELAY_MS:
+            t = start + AUTOREPEAT_DELAY_MS
+            while t < end:
+                out.append((t, EVENT_PRESS, key))
+                t += AUTOREPEAT_INTERVAL_MS
+        out.append((end, EVENT_RELEASE, key))
+
+    def _counter_strafe(self, out: list, t: float) -> float:
+        m, rng = self.model, self.rng
+        first, second = self._axis_keys()
+        release = t + m.hold.draw(rng)
+        counter = release + m.reaction.draw(rng)
+        shot = counter + m.shot_delay.draw(rng)
+        self._hold(out, first, t, release)
+        out.append((shot, EVENT_SHOT, KEY_NONE))
+        if rng.random() < m.burst:
+            for _ in range(rng.randint(1, 4)):
+                shot += rng.uniform(90.0, 130.0)
+                out.append((shot, EVENT_SHOT, KEY_NONE))
+        end = shot + m.reaction.draw(rng)
+        self._hold(out, second, counter, end)
+        return end
+
+    def _overlap(self, out: list, t: float) -> float:
+        m, rng = self.model, self.rng
+        first, second = self._axis_keys()
+        counter = t + m.hold.draw(rng)
+        release = counter + m.overlap.draw(rng)
+        shot = counter + m.overlap.draw(rng)  # may land before or after the release
+        end = max(release, shot) + m.reaction.draw(rng)
+        self._hold(out, first, t, release)
+        self._hold(out, second, counter, end)
+        out.append((shot, EVENT_SHOT, KEY_NONE))
+        return end
+
+    def _adad(self, out: list, t: float) -> float:
+        m, rng = self.model, self.rng
+        first, second = self._axis_keys()
+        taps = rng.randint(3, 8)
+        shot_after = rng.randrange(taps)
+        for i in range(taps):
+            end = t + m.tap.draw(rng)
+            self._hold(out, first if i % 2 == 0 else second, t, end)
+            if i == shot_after:
+                out.append((end + m.reaction.draw(rng), EVENT_SHOT, KEY_NONE))
+            t = end + m.reaction.draw(rng)
+        return t
+
+    def _idle(self, out: list, t: float) -> float:
+        rng = self.rng
+        t += rng.uniform(500.0, 1500.0)
+        out.append((t, EVENT_SHOT, KEY_NONE))
+        for _ in range(rng.randint(0, 2)):
+            t += rng.uniform(90.0, 400.0)
+            out.append((t, EVENT_SHOT, KEY_NONE))
+        return t
+
+    def engagement(self, t: float) -> tuple[list, float]:
+        """Events of one engagement starting at ``t`` ms, sorted, and its end."""
+        m, rng = self.model, self.rng
+        out: list = []
+        pattern = rng.choices(self.patterns, cum_weights=self.cum_weights)[0]
+        start = t
+        modifiers = [key for key, p in ((KEY_SHIFT, m.shift), (KEY_CTRL, m.ctrl)) if rng.random() < p]
+        if modifiers:
+            t += m.reaction.draw(rng)
+        end = self.builders[pattern](out, t)
+        if modifiers:
+            end += m.reaction.draw(rng)
+            for key in modifiers:
+                self._hold(out, key, start, end)
+        out.sort(key=lambda event: event[0])
+        return out, end + m.gap.draw(rng)
+
+
+def generate(
+    count: Optional[int] = None,
+    seed: Union[int, str] = 0,
+    model: StrafeModel = DEFAULT_MODEL,
+    ticks_per_ms: int = 1,
+) -> Iterator[Event]:
+    """
+    Yield ``count`` events (forever when None) of a seeded session.
+
+    Timestamps are integer ticks and strictly increasing: events that round
+    to the same tick are nudged one tick apart.
+    """
+    session = _Session(model, random.Random(seed))
+    t = 0.0
+    last = -1
+    produced = 0
+    while count is None or produced < count:
+        events, t = session.engagement(t)
+        for ms, kind, key in events:
+            tick = int(ms * ticks_per_ms)
+            if tick <= last:
+                tick = last + 1
+            last = tick
+            yield kind, key, tick
+            produced += 1
+            if produced == count:
+                return
+
+
+def generate_packed(
+    count: int,
+    seed: Union[int, str] = 0,
+    model: StrafeModel = DEFAULT_MODEL,
+    ticks_per_ms: int = 1,
+    chunk_events: int = 1 << 20,
+) -> Iterator[array]:
+    """The ``generate`` stream packed as flat int64 arrays of up to ``chunk_events`` events."""
+    buf = array(EVENT_TYPECODE)
+    limit = chunk_events * EVENT_FIELDS
+    extend = buf.extend
+    for event in generate(count, seed, model, ticks_per_ms):
+        extend(event)
+        if len(buf) >= limit:
+            yield buf
+            buf = array(EVENT_TYPECODE)
+            extend = buf.extend
+    if buf:
+        yield buf
+
+
+def pack(count: int, seed: Union[int, str] = 0, model: StrafeModel = DEFAULT_MODEL, ticks_per_ms: int = 1) -> array:
+    """The first ``count`` events as one packed array."""
+    buf = array(EVENT_TYPECODE)
+    for chunk in generate_packed(count, seed, model, ticks_per_ms):
+        buf.extend(chunk)
+    return buf
+
+
+def named_events(
+    events: Iterator[Event], layout: Union[str, tuple[str, str, str, str]] = "wasd"
+) -> Iterator[tuple[int, Optional[str], int]]:
+    """Replace key codes with the names of ``layout``; shots get None."""
+    names = (*(LAYOUTS[layout] if isinstance(layout, str) else layout), *MODIFIER_NAMES)
+    for kind, key, t in events:
+        yield kind, None if key == KEY_NONE else names[key], t
@@ -0,0 +1,124 @@
+"""Stall watchdog for the pynput hook threads and the Tk main thread.
+
+A GC pause or a slow redraw shows up in two places: a hook callback that
+takes long to return (on Windows a slow low-level hook can be silently
+removed, and every event behind it is stamped late), and a Tk ``after``
+callback that runs late.  The watchdog times both against thresholds,
+counts and logs the stalls, and remembers the most recent ones so a shot
+whose timing window overlaps a stall can be flagged as low confidence.
+
+Every method may be called from any thread; stall intervals live in a
+fixed ring of slots (RecentIntervals) that readers can scan while writers
+fill it.
+"""
+
+from typing import Any, Callable, Optional
+
+from clock import NS_PER_MS
+
+HOOK_KEY_PRESS = 0
+HOOK_KEY_RELEASE = 1
+HOOK_CLICK = 2
+TK_TICK = 3
+
+SOURCE_NAMES = ("key press hook", "key release hook", "click hook", "Tk tick")
+
+HOOK_STALL_MS = 5.0
+TICK_STALL_MS = 50.0  # Windows timers alone jitter by ~16 ms
+RECENT_STALLS = 64
+
+
+class RecentIntervals:
+    """
+    The last ``size`` ``(start, end)`` intervals, in a fixed ring of slots.
+
+    Writers on different threads may race for a slot and overwrite each
+    other's interval, but a reader scanning the ring never sees a torn one.
+    """
+
+    __slots__ = ("_slots", "_next")
+
+    def __init__(self, size: int = RECENT_STALLS) -> None:
+        self._slots: list[tuple[int, int]] = [(0, 0)] * size
+        self._next = 0
+
+    def add(self, start_ns: int, end_ns: int) -> None:
+        slot = self._next
+        self._next = (slot + 1) % len(self._slots)
+        self._slots[slot] = (start_ns, end_ns)
+
+    def overlapping(self, start_ns: int, end_ns: int) -> Optional[tuple[int, int]]:
+        """A stored interval that overlaps ``[start_ns, end_ns]``, or None."""
+        for interval in self._slots:
+            interval_start, interval_end = interval
+            if interval_end and interval_start <= end_ns and start_ns <= interval_end:
+                return interval
+        return None
+
+
+class StallWatchdog:
+    """
+    ``hook_returned(source, entry_ns)`` is called as a hook callback
+    returns; ``tick_ran(due_ns, ran_ns)`` when a Tk ``after`` callback runs.
+    Stalls over the thresholds are counted per source and reported through
+    ``log`` (e.g. ``overlay.log_debug``).  With ``flag_shots`` the pipeline
+    marks shots whose timing window overlaps a stall as low confidence.
+    """
+
+    def __init__(
+        self,
+        now_ns: Callable[[], int],
+        hook_threshold_ms: float = HOOK_STALL_MS,
+        tick_threshold_ms: float = TICK_STALL_MS,
+        log: Optional[Callable[[str], None]] = None,
+        flag_shots: bool = False,
+    ) -> None:
+        self.now_ns = now_ns
+        self.flag_shots = flag_shots
+        self._hook_threshold = int(hook_threshold_ms * NS_PER_MS)
+        self._tick_threshold = int(tick_threshold_ms * NS_PER_MS)
+        self.log = log
+        self.counts = [0] * len(SOURCE_NAMES)
+        self.worst_ns = [0] * len(SOURCE_NAMES)
+        self._recent = RecentIntervals()
+
+    def hook_returned(self, source: int, entry_ns: int) -> None:
+        now = self.now_ns()
+        if now - entry_ns > self._hook_threshold:
+            self._stall(source, entry_ns, now)
+
+    def tick_ran(self, due_ns: int, ran_ns: int) -> None:
+        if ran_ns - due_ns > self._tick_threshold:
+            self._stall(TK_TICK, due_ns, ran_ns)
+
+    def _stall(self, source: int, start_ns: int, end_ns: int) -> None:
+        duration = end_ns - start_ns
+        self.counts[source] += 1
+        if duration > self.worst_ns[source]:
+            self.worst_ns[source] = duration
+        self._recent.add(start_ns, end_ns)
+        if self.log is not None:
+            self.log(f"[STALL] {SOURCE_NAMES[source]}: {duration / NS_PER_MS:.1f} ms")
+
+    def overlaps(self, start_ns: int, end_ns: int) -> bool:
+        """True if a recent stall overlaps ``[start_ns, end_ns]``."""
+        return self._recent.overlapping(start_ns, end_ns) is not None
+
+    def summary_lines(self) -> list[str]:
+        return [
+            f"[STALL] {name}: {count} stalls, worst {worst / NS_PER_MS:.1f} ms"
+            for name, count, worst in zip(SOURCE_NAMES, self.counts, self.worst_ns)
+        ]
+
+
+def timing_window_ns(result: Any, shot_ns: int) -> tuple[int, int]:
+    """
+    The span of input a shot's timing was measured over: the counter-strafe
+    and shot delay (or the overlap) before the shot, or just the shot.
+    """
+    span_ms = 0.0
+    if result.cs_time is not None and result.shot_delay is not None:
+        span_ms = result.cs_time + result.shot_delay
+    elif result.overlap_time is not None:
+        span_ms = result.overlap_time
+    return shot_ns - int(span_ms * NS_PER_MS), shot_ns
@@ -1,8 +1,71 @@
 import sys
+import threading
 from pathlib import Path
 
+import pytest
+
 # Ensure the project's `src` directory is on sys.path so imports like
 # `from classifier import ...` continue to work after the src-layout change.
 ROOT = Path(__file__).resolve().parents[1]
 SRC = ROOT / "src"
 sys.path.insert(0, str(SRC))
+
+
+class RecordingOverlay:
+    """
+    Stands in for Overlay: keeps every shot result (its display string and
+    low-confidence flag) and debug line, and the names of all other calls.
+    """
+
+    def __init__(self):
+        self.results = []
+        self.low_confidence = []
+        self.debug = []
+        self.calls = []
+
+    def update_result(self, classification, low_confidence=False):
+        self.results.append(classification.to_display_string())
+        self.low_confidence.append(low_confidence)
+
+    def log_debug(self, entry):
+        self.debug.append(entry)
+
+    def __getattr__(self, name):
+        def call(*args):
+            self.calls.append(name)
+
+        return call
+
+
+@pytest.fixture
+def overlay():
+    return RecordingOverlay()
+
+
+class Collector:
+    """
+    Input backend callbacks that keep what they are given and the threads
+    that called them.  With ``while_first_key_held`` set, the first key
+    calls it before returning, so events it injects queue behind that key.
+    """
+
+    def __init__(self):
+        self.keys = []
+        self.clicks = []
+        self.threads = set()
+        self.while_first_key_held = None
+
+    def on_key(self, kind, action, timestamp):
+        self.threads.add(threading.current_thread().name)
+        self.keys.append((kind, action, timestamp))
+        if self.while_first_key_held is not None and len(self.keys) == 1:
+            self.while_first_key_held()
+
+    def on_click(self, timestamp):
+        self.threads.add(threading.current_thread().name)
+        self.clicks.append(timestamp)
+
+
+@pytest.fixture
+def collector():
+    return Collector()
@@ -0,0 +1,13 @@
+"""
+Drop-in stand-in for the parts of pynput cStrafe UI uses, for headless runs.
+
+Put ``tests/fake_pynput`` first on ``sys.path`` (or ``PYTHONPATH``) and
+``from pynput import keyboard, mouse`` resolves here.  Listeners are real
+threads, one per listener like pynput's, but nothing is read from the OS:
+``_fake.inject`` schedules hook calls at a fixed rate and each running
+listener invokes its callbacks on its own thread when they fall due.
+"""
+
+from . import _fake, keyboard, mouse
+
+__all__ = ["keyboard", "mouse"]
@@ -0,0 +1,167 @@
+"""
+Scheduled callback injection shared by the fake keyboard and mouse listeners.
+
+Every injected call is dispatched as an event stamped with the OS time it
+was due -- ``time.perf_counter_ns`` in whole milliseconds, wrapped to 32
+bits like X server and Win32 message times -- the way the real listeners
+see it: passed to a ``win32_event_filter`` if there is one, then to
+``_handle_message``.  A listener with ``POSTS_EVENTS`` set and a filter
+behaves like pynput's Win32 keyboard listener instead: the hook runs the
+filter and posts the event to the thread's message loop, Windows runs the
+hook for every event already due before the loop gets its next message,
+and ``_process`` then calls the callback.
+"""
+
+import collections
+import queue
+import threading
+import time
+from typing import Any, Callable, Iterable, NamedTuple, Optional
+
+_running: list["FakeListener"] = []
+_running_lock = threading.Lock()
+_STOP = (0, "", ())
+
+
+class FakeEvent(NamedTuple):
+    """Stands in for both an X event and a Win32 hook struct: ``time`` is in ms."""
+
+    time: int
+    callback: str
+    args: tuple
+
+
+def os_time_ms(ns: int) -> int:
+    return ns // 1_000_000 & 0xFFFFFFFF
+
+
+class FakeListener(threading.Thread):
+    """
+    A listener thread that runs ``(due_ns, callback, args)`` items from its
+    queue, sleeping until each is due (``time.perf_counter_ns``).  An item
+    that is already late runs at once, so a schedule faster than the thread
+    can keep up with is replayed back to back.
+    """
+
+    POSTS_EVENTS = False
+
+    def __init__(
+        self, win32_event_filter: Optional[Callable[[int, Any], Any]] = None, **callbacks: Optional[Callable[..., Any]]
+    ) -> None:
+        super().__init__(name=f"fake-pynput-{type(self).__module__.rsplit('.', 1)[-1]}", daemon=True)
+        self.callbacks = {name: cb for name, cb in callbacks.items() if cb is not None}
+        self._event_filter = win32_event_filter
+        self.running = False
+        self._queue: "queue.Queue[tuple[int, str, tuple]]" = queue.Queue()
+
+    def start(self) -> None:
+        self.running = True
+        with _running_lock:
+            _running.append(self)
+        super().start()
+
+    def stop(self) -> None:
+        if self.running:
+            self.running = False
+            self._queue.put(_STOP)
+        with _running_lock:
+            if self in _running:
+                _running.remove(self)
+
+    def __enter__(self) -> "FakeListener":
+        self.start()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
+
+    def wait(self) -> None:
+        pass
+
+    def schedule(self, due_ns: int, callback: str, args: tuple) -> None:
+        self._queue.put((due_ns, callback, args))
+
+    def drained(self) -> None:
+        """Block until every scheduled call has run."""
+        self._queue.join()
+
+    def _handle_message(self, display: Any, event: FakeEvent, injected: bool) -> None:
+        self.callbacks[event.callback](*event.args)
+
+    def _process(self, callback: str, args: tuple) -> None:
+        self.callbacks[callback](*args)
+
+    def run(self) -> None:
+        get = self._queue.get
+        done = self._queue.task_done
+        now = time.perf_counter_ns
+        event_filter = self._event_filter
+        posted: "collections.deque[FakeEvent]" = collections.deque()
+        post = posted.append if self.POSTS_EVENTS and event_filter is not None else None
+        item = None
+        while True:
+            if item is None:
+                if not posted:
+                    item = get()
+                else:
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        pass
+            if item is _STOP:
+                for _ in range(len(posted) + 1):
+                    done()
+                return
+            if item is not None:
+                due_ns, callback, args = item
+                wait = due_ns - now()
+                if wait <= 0 or not posted:
+                    if wait > 0:
+                        time.sleep(wait / 1e9)
+                    item = None
+                    event = FakeEvent(os_time_ms(due_ns), callback, args)
+                    posting = False
+                    try:
+                        if event_filter is None or event_filter(0, event) is not False:
+                            if post is None:
+                                self._handle_message(None, event, False)
+                            else:
+                                post(event)
+                                posting = True
+                    finally:
+                        if not posting:
+                            done()
+                    continue
+            # Nothing else is due: the message loop takes the oldest post.
+            event = posted.popleft()
+            try:
+                self._process(event.callback, event.args)
+            finally:
+                done()
+
+
+def running() -> list[FakeListener]:
+    with _running_lock:
+        return list(_running)
+
+
+def inject(calls: Iterable[tuple[str, tuple]], rate_hz: float, start_ns: Optional[int] = None) -> int:
+    """
+    Schedule ``(callback_name, args)`` hook calls ``1 / rate_hz`` apart on
+    the running listener that has that callback (``on_press``,
+    ``on_release``, ``on_click``).  Returns how many were scheduled.
+    """
+    targets = {name: listener for listener in running() for name in listener.callbacks}
+    period_ns = 1e9 / rate_hz
+    if start_ns is None:
+        start_ns = time.perf_counter_ns()
+    count = 0
+    for count, (callback, args) in enumerate(calls, 1):
+        targets[callback].schedule(start_ns + int(count * period_ns), callback, args)
+    return count
+
+
+def drained() -> None:
+    """Block until every running listener has run all its scheduled calls."""
+    for listener in running():
+        listener.drained()
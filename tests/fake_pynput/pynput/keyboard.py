@@ -0,0 +1,62 @@
+"""Fake ``pynput.keyboard``: Key, KeyCode and a scheduled Listener."""
+
+import enum
+from typing import Any, Callable, Optional
+
+from ._fake import FakeListener
+
+
+class KeyCode:
+    __slots__ = ("char", "vk")
+
+    def __init__(self, vk: Optional[int] = None, char: Optional[str] = None) -> None:
+        self.vk = vk
+        self.char = char
+
+    @classmethod
+    def from_char(cls, char: str) -> "KeyCode":
+        return cls(char=char)
+
+    @classmethod
+    def from_vk(cls, vk: int) -> "KeyCode":
+        return cls(vk=vk)
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, KeyCode) and (self.char, self.vk) == (other.char, other.vk)
+
+    def __hash__(self) -> int:
+        return hash((self.char, self.vk))
+
+    def __repr__(self) -> str:
+        return repr(self.char) if self.char is not None else f"<{self.vk}>"
+
+
+class Key(enum.Enum):
+    # Windows virtual-key codes, as pynput's win32 backend uses.
+    alt = KeyCode.from_vk(0x12)
+    backspace = KeyCode.from_vk(0x08)
+    ctrl = KeyCode.from_vk(0x11)
+    ctrl_l = KeyCode.from_vk(0xA2)
+    ctrl_r = KeyCode.from_vk(0xA3)
+    enter = KeyCode.from_vk(0x0D)
+    esc = KeyCode.from_vk(0x1B)
+    f6 = KeyCode.from_vk(0x75)
+    f8 = KeyCode.from_vk(0x77)
+    shift = KeyCode.from_vk(0x10)
+    shift_l = KeyCode.from_vk(0xA0)
+    shift_r = KeyCode.from_vk(0xA1)
+    space = KeyCode.from_vk(0x20)
+    tab = KeyCode.from_vk(0x09)
+
+
+class Listener(FakeListener):
+    # pynput's Win32 keyboard hook posts its events to _process.
+    POSTS_EVENTS = True
+
+    def __init__(
+        self,
+        on_press: Optional[Callable[[Any], None]] = None,
+        on_release: Optional[Callable[[Any], None]] = None,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(kwargs.get("win32_event_filter"), on_press=on_press, on_release=on_release)
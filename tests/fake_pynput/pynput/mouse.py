@@ -0,0 +1,24 @@
+"""Fake ``pynput.mouse``: Button and a scheduled Listener."""
+
+import enum
+from typing import Any, Callable, Optional
+
+from ._fake import FakeListener
+
+
+class Button(enum.Enum):
+    unknown = 0
+    left = 1
+    middle = 2
+    right = 3
+
+
+class Listener(FakeListener):
+    def __init__(
+        self,
+        on_move: Optional[Callable[..., None]] = None,
+        on_click: Optional[Callable[..., None]] = None,
+        on_scroll: Optional[Callable[..., None]] = None,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(kwargs.get("win32_event_filter"), on_move=on_move, on_click=on_click, on_scroll=on_scroll)
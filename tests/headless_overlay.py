@@ -0,0 +1,76 @@
+"""
+Overlay without Tk, for headless tests and benchmarks.
+
+HeadlessOverlay is the real Overlay -- same RenderState, same render tick,
+same latency and watchdog hooks -- with the window replaced by HeadlessRoot,
+a single-threaded ``after()`` loop, and drawing replaced by a frame count.
+For the real renderers on a headless box, run under Xvfb instead
+(``xvfb-run python -m benchmarks.bench_pipeline --overlay canvas``).
+"""
+
+import heapq
+import itertools
+import time
+from typing import Callable, Optional
+
+from overlay import Overlay
+from render_state import FrameUpdate
+
+
+class HeadlessRoot:
+    """The part of ``tk.Tk`` the overlay uses: ``after``, ``mainloop``, ``destroy``."""
+
+    def __init__(self) -> None:
+        self._timers: list[tuple[float, int, Callable[[], None]]] = []
+        self._seq = itertools.count()
+        self._alive = True
+
+    def after(self, delay_ms: int, callback: Callable[[], None]) -> None:
+        heapq.heappush(self._timers, (time.perf_counter() + delay_ms / 1000, next(self._seq), callback))
+
+    def mainloop(self) -> None:
+        timers = self._timers
+        while self._alive and timers:
+            due, _, callback = heapq.heappop(timers)
+            wait = due - time.perf_counter()
+            if wait > 0:
+                time.sleep(wait)
+            callback()
+
+    def update(self) -> None:
+        pass
+
+    def destroy(self) -> None:
+        self._alive = False
+
+    def withdraw(self) -> None:
+        pass
+
+    def deiconify(self) -> None:
+        pass
+
+
+class HeadlessOverlay(Overlay):
+    def _build_window(self) -> None:
+        self.root = HeadlessRoot()
+        self.frames = 0
+        self.shown_result: Optional[tuple[str, str]] = None
+
+    def _apply(self, update: FrameUpdate) -> None:
+        self.frames += 1
+        super()._apply(update)
+
+    def _show_left_bar(self, shown: bool) -> None:
+        pass
+
+    def _show_right_bar(self, shown: bool) -> None:
+        pass
+
+    def _show_flash(self, shown: bool) -> None:
+        pass
+
+    def _show_result(self, text: str, bg_colour: str) -> None:
+        self.shown_result = (text, bg_colour)
+
+    def _apply_font_sizes(self) -> None:
+        pass
@@ -0,0 +1,138 @@
+"""
+Tests for classifier.axis_engine — transition tables and a differential
+harness against the pre-engine AxisState implementations.
+
+The harness replays seeded random press/release/shot sequences through the
+legacy and engine-based AxisState side by side and asserts identical
+results and observable state after every event, on both adversarial fuzz
+streams and realistic ``synthetic`` sessions.  Scale it up with e.g.
+``AXIS_DIFF_EVENTS=5000000 python -m pytest tests/test_axis_engine.py``.
+"""
+
+import os
+import random
+
+import pytest
+from classifier.axis_engine import (
+    PHASE_COUNTERED_0, PHASE_COUNTERED_1, PHASE_IDLE, PHASE_RELEASED_0, PHASE_RELEASED_1,
+    STAMP, AxisConfig, build_transition_tables,
+)
+from classifier.cs2KitchenClassifier import AxisState as CS2KitchenAxisState
+from classifier.ppClassifier import AxisState as PPAxisState
+from classifier.events import EVENT_PRESS, EVENT_RELEASE
+from legacy_axis_state import LegacyCS2KitchenAxisState, LegacyPPAxisState
+from synthetic import DEFAULT_MODEL, generate
+
+DIFF_EVENTS = int(os.environ.get("AXIS_DIFF_EVENTS", "200000"))
+KEYS = ("A", "D")
+
+
+def _observable(ax):
+    return (
+        frozenset(ax.held_keys),
+        dict(ax.press_times),
+        ax.cs_release_key,
+        ax.cs_release_time,
+        ax.cs_press_key,
+        ax.cs_press_time,
+        ax.overlap_start_time,
+        ax.micro_candidate_duration,
+    )
+
+
+def _replay_differential(legacy, engine, events: int, seed: int) -> int:
+    """Drive both axes with the same random stream; return shots compared."""
+    rng = random.Random(seed)
+    t = 0
+    shots = 0
+    for i in range(events):
+        # Gaps straddle the 80 ms micro threshold and include 0 so strict
+        # ">" comparisons on equal timestamps are exercised.
+        t += rng.choice((0, 1, 5, 20, 40, 79, 80, 81, 120, 300))
+        op = rng.random()
+        key = KEYS[rng.random() < 0.5]
+        if op < 0.42:
+            legacy.on_press(key, t)
+            engine.on_press(key, t)
+        elif op < 0.84:
+            legacy.on_release(key, t)
+            engine.on_release(key, t)
+        else:
+            expected = legacy.classify_shot(t)
+            actual = engine.classify_shot(t)
+            assert actual == expected, f"seed={seed} event={i}"
+            shots += 1
+        assert _observable(engine) == _observable(legacy), f"seed={seed} event={i}"
+    return shots
+
+
+def _replay_session(legacy, engine, events: int, seed: int) -> int:
+    """Same as _replay_differential on a horizontal-only synthetic session."""
+    model = DEFAULT_MODEL._replace(vertical=0.0, shift=0.0, ctrl=0.0)
+    shots = 0
+    for i, (kind, key, t) in enumerate(generate(events, seed, model)):
+        if kind == EVENT_PRESS:
+            legacy.on_press(KEYS[key & 1], t)
+            engine.on_press(KEYS[key & 1], t)
+        elif kind == EVENT_RELEASE:
+            legacy.on_release(KEYS[key & 1], t)
+            engine.on_release(KEYS[key & 1], t)
+        else:
+            assert engine.classify_shot(t) == legacy.classify_shot(t), f"seed={seed} event={i}"
+            shots += 1
+        assert _observable(engine) == _observable(legacy), f"seed={seed} event={i}"
+    return shots
+
+
+# ===========================================================================
+# Differential harness
+# ===========================================================================
+
+class TestDifferential:
+    @pytest.mark.parametrize(
+        "legacy_cls, engine_cls",
+        [(LegacyCS2KitchenAxisState, CS2KitchenAxisState), (LegacyPPAxisState, PPAxisState)],
+        ids=["cs2kitchen", "pp"],
+    )
+    def test_engine_matches_legacy(self, legacy_cls, engine_cls):
+        per_seed = 10_000
+        shots = 0
+        for seed in range(max(1, DIFF_EVENTS // per_seed)):
+            shots += _replay_differential(legacy_cls(KEYS), engine_cls(KEYS), per_seed, seed)
+        assert shots > 0
+
+    @pytest.mark.parametrize(
+        "legacy_cls, engine_cls",
+        [(LegacyCS2KitchenAxisState, CS2KitchenAxisState), (LegacyPPAxisState, PPAxisState)],
+        ids=["cs2kitchen", "pp"],
+    )
+    def test_engine_matches_legacy_on_sessions(self, legacy_cls, engine_cls):
+        assert _replay_session(legacy_cls(KEYS), engine_cls(KEYS), DIFF_EVENTS // 4, seed=0) > 0
+
+
+# ===========================================================================
+# Transition tables
+# ===========================================================================
+
+class TestTransitionTables:
+    def test_counter_press_only_from_opposite_release(self):
+        press, _ = build_transition_tables(AxisConfig())
+        assert press[PHASE_RELEASED_0 << 1 | 1] == PHASE_COUNTERED_1 | STAMP
+        assert press[PHASE_RELEASED_1 << 1 | 0] == PHASE_COUNTERED_0 | STAMP
+        assert press[PHASE_RELEASED_0 << 1 | 0] == PHASE_RELEASED_0
+        assert press[PHASE_IDLE << 1 | 0] == PHASE_IDLE
+        assert press[PHASE_COUNTERED_1 << 1 | 0] == PHASE_COUNTERED_1
+
+    def test_release_always_restarts_cycle_by_default(self):
+        _, release = build_transition_tables(AxisConfig())
+        assert release[PHASE_COUNTERED_1 << 1 | 1] == PHASE_RELEASED_1 | STAMP
+        assert release[PHASE_IDLE << 1 | 0] == PHASE_RELEASED_0 | STAMP
+
+    def test_keep_cs_press_on_release(self):
+        _, release = build_transition_tables(AxisConfig(keep_cs_press_on_release=True))
+        assert release[PHASE_COUNTERED_1 << 1 | 1] == PHASE_COUNTERED_1
+        assert release[PHASE_COUNTERED_1 << 1 | 0] == PHASE_RELEASED_0 | STAMP
+
+    def test_axis_state_has_no_instance_dict(self):
+        assert not hasattr(PPAxisState(KEYS), "__dict__")
+        assert not hasattr(CS2KitchenAxisState(KEYS), "__dict__")
@@ -0,0 +1,160 @@
+"""
+Tests for classifier.batch: the vectorised session classifiers must agree
+with MovementClassifier.classify_shot + ShotFilter.apply shot for shot.
+"""
+
+import math
+import random
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from classifier import batch  # noqa: E402
+from classifier import (  # noqa: E402
+    CS2KitchenMovementClassifier,
+    CS2KitchenShotFilter,
+    PPMovementClassifier,
+    PPShotFilter,
+    ShotLabel,
+    SubLabel,
+)
+from classifier.batch import classify_cs2kitchen, classify_pp, unpack_events  # noqa: E402
+from classifier.events import EVENT_PRESS, EVENT_RELEASE, EVENT_SHOT, pack_events  # noqa: E402
+from classifier.key_codes import KEY_CTRL, KEY_FORWARD, KEY_LEFT, KEY_NONE, KEY_RIGHT  # noqa: E402
+
+PAIRS = [
+    pytest.param(CS2KitchenMovementClassifier, CS2KitchenShotFilter, classify_cs2kitchen, id="cs2kitchen"),
+    pytest.param(PPMovementClassifier, PPShotFilter, classify_pp, id="pp"),
+]
+
+
+def _per_event(mc, sf, events):
+    results = []
+    for kind, key, t in events:
+        if kind == EVENT_PRESS:
+            mc.on_press(key, t)
+        elif kind == EVENT_RELEASE:
+            mc.on_release(key, t)
+        else:
+            results.append(_fields(sf.apply(mc.classify_shot(t))))
+    return results
+
+
+def _fields(r):
+    return (
+        r.label_id,
+        getattr(r, "sub_label_id", SubLabel.NONE),
+        r.cs_time,
+        r.shot_delay,
+        r.overlap_time,
+        getattr(r, "shift_held", False),
+        getattr(r, "ctrl_held", False),
+    )
+
+
+def _optional(value):
+    return None if math.isnan(value) else float(value)
+
+
+def _batch(classify, events, **kwargs):
+    batch = classify(*unpack_events(pack_events(events)), **kwargs)
+    return [
+        (
+            batch.label[i],
+            batch.sub_label[i],
+            _optional(batch.cs_time[i]),
+            _optional(batch.shot_delay[i]),
+            _optional(batch.overlap_time[i]),
+            bool(batch.shift_held[i]),
+            bool(batch.ctrl_held[i]),
+        )
+        for i in range(len(batch.label))
+    ]
+
+
+def _random_events(
+    seed, count=1500, keys=KEY_CTRL + 1, shot_rate=0.2, gaps=(0, 1, 10, 30, 60, 120, 400, 700), scale=1
+):
+    rng = random.Random(seed)
+    t = 0
+    events = []
+    for _ in range(count):
+        t += rng.choice(gaps) * scale
+        if rng.random() < shot_rate:
+            events.append((EVENT_SHOT, None, t))
+        else:
+            events.append((rng.choice((EVENT_PRESS, EVENT_RELEASE)), rng.randrange(keys), t))
+    return events
+
+
+@pytest.mark.parametrize("mc_cls, sf_cls, classify", PAIRS)
+class TestMatchesPerEventPath:
+    @pytest.mark.parametrize("seed", range(20))
+    def test_random_sessions(self, mc_cls, sf_cls, classify, seed):
+        events = _random_events(seed)
+        assert _batch(classify, events) == _per_event(mc_cls(), sf_cls(), events)
+
+    @pytest.mark.parametrize("seed", range(10))
+    def test_dense_single_axis(self, mc_cls, sf_cls, classify, seed):
+        # Two keys and tiny gaps: long chains of releases, repeats and ties.
+        events = _random_events(seed, keys=2, shot_rate=0.1, gaps=(0, 0, 1, 3))
+        assert _batch(classify, events) == _per_event(mc_cls(), sf_cls(), events)
+
+    @pytest.mark.parametrize("seed", range(10))
+    def test_nanosecond_ticks(self, mc_cls, sf_cls, classify, seed):
+        events = _random_events(seed, scale=1_000_000)
+        expected = _per_event(mc_cls(ticks_per_ms=1_000_000), sf_cls(), events)
+        assert _batch(classify, events, ticks_per_ms=1_000_000) == expected
+
+    @pytest.mark.parametrize("seed", range(10))
+    def test_small_chunks(self, mc_cls, sf_cls, classify, seed, monkeypatch):
+        # Held keys, modifiers and the last movement press carry across cuts.
+        monkeypatch.setattr(batch, "_CHUNK_EVENTS", 7)
+        events = _random_events(seed)
+        assert _batch(classify, events) == _per_event(mc_cls(), sf_cls(), events)
+
+    def test_counter_strafe_then_overlap(self, mc_cls, sf_cls, classify):
+        events = [
+            (EVENT_PRESS, KEY_LEFT, 0),
+            (EVENT_RELEASE, KEY_LEFT, 100),
+            (EVENT_PRESS, KEY_RIGHT, 120),
+            (EVENT_SHOT, None, 220),
+            (EVENT_PRESS, KEY_LEFT, 300),
+            (EVENT_SHOT, None, 350),
+            (EVENT_RELEASE, KEY_LEFT, 400),
+            (EVENT_RELEASE, KEY_RIGHT, 410),
+            (EVENT_SHOT, None, 5000),
+        ]
+        assert _batch(classify, events) == _per_event(mc_cls(), sf_cls(), events)
+
+    def test_empty_session(self, mc_cls, sf_cls, classify):
+        assert _batch(classify, []) == []
+
+    def test_no_shots(self, mc_cls, sf_cls, classify):
+        assert _batch(classify, [(EVENT_PRESS, KEY_LEFT, 0), (EVENT_RELEASE, KEY_LEFT, 50)]) == []
+
+
+class TestColumns:
+    def test_unpack_events(self):
+        kinds, keys, timestamps = unpack_events(pack_events([(EVENT_PRESS, KEY_FORWARD, 5), (EVENT_SHOT, None, 9)]))
+        assert kinds.tolist() == [EVENT_PRESS, EVENT_SHOT]
+        assert keys.tolist() == [0, KEY_NONE]
+        assert timestamps.tolist() == [5, 9]
+
+    def test_mismatched_columns_raise(self):
+        with pytest.raises(ValueError):
+            classify_pp([EVENT_SHOT], [KEY_NONE, KEY_NONE], [0])
+
+    def test_pp_labels(self):
+        events = [
+            (EVENT_PRESS, KEY_LEFT, 0),
+            (EVENT_RELEASE, KEY_LEFT, 100),
+            (EVENT_PRESS, KEY_RIGHT, 120),
+            (EVENT_SHOT, None, 220),
+        ]
+        batch = classify_pp(*unpack_events(pack_events(events)))
+        assert batch.label.tolist() == [ShotLabel.PERFECT]
+        assert batch.cs_time.tolist() == [20.0]
+        assert batch.shot_delay.tolist() == [100.0]
+        assert batch.shot_time.tolist() == [220]
@@ -9,8 +9,12 @@ Covers:
     axis-priority logic (Overlap > Counter-strafe > Bad), tie-breaking
 """
 
+import random
+
 import pytest
-from classifier import AxisState, MovementClassifier, ShotClassification
+from classifier import AxisState, DebugLogger, MovementClassifier, ShotClassification
+from classifier.events import EVENT_PRESS, EVENT_RELEASE, EVENT_SHOT, pack_events
+from classifier.key_codes import KEY_BACKWARD, KEY_FORWARD, KEY_LEFT, KEY_RIGHT, KEY_SHIFT
 
 
 # ---------------------------------------------------------------------------
@@ -437,3 +441,119 @@ class TestEndToEnd:
         text = result.to_display_string()
         assert "50 ms" in text   # cs_time
         assert "50 ms" in text   # shot_delay (both happen to be 50 here)
+
+
+# ===========================================================================
+# Integer nanosecond timestamps
+# ===========================================================================
+
+NS = 1_000_000
+
+
+class TestNanosecondTicks:
+    def test_counter_strafe_reports_ms(self):
+        mc = MovementClassifier(ticks_per_ms=NS)
+        mc.on_press("A", 0)
+        mc.on_release("A", 100 * NS)
+        mc.on_press("D", 101 * NS + 500_000)   # cs_time = 1.5 ms
+        result = mc.classify_shot(200 * NS)
+        assert result.label == "Counter-strafe"
+        assert result.cs_time == pytest.approx(1.5)
+        assert result.shot_delay == pytest.approx(98.5)
+
+    def test_overlap_reports_ms(self):
+        mc = MovementClassifier(ticks_per_ms=NS)
+        mc.on_press("A", 0)
+        mc.on_press("D", 20 * NS)
+        result = mc.classify_shot(100 * NS)
+        assert result.label == "Overlap"
+        assert result.overlap_time == pytest.approx(80.0)
+
+    def test_micro_candidate_threshold_scaled(self):
+        ax = AxisState(keys=("A", "D"), ticks_per_ms=NS)
+        ax.on_press("A", 0)
+        ax.on_release("A", 50 * NS)
+        assert ax.micro_candidate_duration == 50 * NS
+
+
+# ===========================================================================
+# Integer key codes
+# ===========================================================================
+
+class TestIntegerKeyCodes:
+    def test_codes_route_to_axes(self):
+        mc = MovementClassifier(vertical_keys=("E", "D"), horizontal_keys=("S", "F"))
+        mc.on_press(KEY_FORWARD, 0.0)
+        mc.on_press(KEY_RIGHT, 0.0)
+        assert mc.vertical.held_keys == {"E"}
+        assert mc.horizontal.held_keys == {"F"}
+
+    def test_counter_strafe_by_code(self):
+        mc = MovementClassifier()
+        mc.on_press(KEY_FORWARD, 0.0)
+        mc.on_release(KEY_FORWARD, 100.0)
+        mc.on_press(KEY_BACKWARD, 130.0)
+        result = mc.classify_shot(200.0)
+        assert result.label == "Counter-strafe"
+        assert result.cs_time == pytest.approx(30.0)
+
+    def test_modifier_code_ignored(self):
+        mc = MovementClassifier()
+        mc.on_press(KEY_SHIFT, 0.0)
+        mc.on_press(KEY_LEFT, 10.0)
+        assert mc.horizontal.held_keys == {"A"}
+        assert not mc.vertical.held_keys
+
+
+# ===========================================================================
+# MovementClassifier.feed — packed event buffers
+# ===========================================================================
+
+def _random_events(seed, count=2000):
+    rng = random.Random(seed)
+    t = 0
+    events = []
+    for _ in range(count):
+        t += rng.choice((1, 10, 30, 60, 120, 400, 700))
+        kind = rng.choice((EVENT_PRESS, EVENT_PRESS, EVENT_RELEASE, EVENT_RELEASE, EVENT_SHOT))
+        events.append((kind, None if kind == EVENT_SHOT else rng.randrange(KEY_SHIFT + 1), t))
+    return events
+
+
+def _fields(r):
+    return (r.label, r.cs_time, r.shot_delay, r.overlap_time)
+
+
+class TestFeed:
+    @pytest.mark.parametrize("seed", range(5))
+    def test_matches_per_event_calls(self, seed):
+        events = _random_events(seed)
+        by_event = MovementClassifier()
+        expected = []
+        for kind, key, t in events:
+            if kind == EVENT_SHOT:
+                expected.append(_fields(by_event.classify_shot(t)))
+            elif kind == EVENT_PRESS:
+                by_event.on_press(key, t)
+            else:
+                by_event.on_release(key, t)
+        fed = MovementClassifier().feed(pack_events(events))
+        assert [_fields(r) for r in fed] == expected
+
+    def test_accepts_memoryview(self):
+        buf = pack_events([(EVENT_PRESS, KEY_LEFT, 0), (EVENT_RELEASE, KEY_LEFT, 100),
+                           (EVENT_PRESS, KEY_RIGHT, 120), (EVENT_SHOT, None, 220)])
+        (result,) = MovementClassifier().feed(memoryview(buf))
+        assert result.cs_time == pytest.approx(20.0)
+        assert result.shot_delay == pytest.approx(100.0)
+
+    def test_results_are_distinct(self):
+        buf = pack_events([(EVENT_SHOT, None, 0), (EVENT_SHOT, None, 10)])
+        first, second = MovementClassifier().feed(buf)
+        assert first is not second
+
+    def test_debug_logger_still_logs(self):
+        lines = []
+        mc = MovementClassifier(debug_logger=DebugLogger(lines.append))
+        mc.feed(pack_events([(EVENT_PRESS, KEY_LEFT, 0), (EVENT_SHOT, None, 50)]))
+        assert any("KEY PRESS" in str(line) for line in lines)
@@ -0,0 +1,190 @@
+"""
+Tests for input_backends.evdev_backend, fed ``input_event`` records through
+a FIFO standing in for /dev/input/event*.
+"""
+
+import errno
+import os
+import select
+import time
+
+import pytest
+
+if not hasattr(select, "epoll"):
+    pytest.skip("evdev backend is Linux-only", allow_module_level=True)
+
+from classifier import CLASSIFIERS  # noqa: E402
+from classifier.events import EVENT_PRESS, EVENT_RELEASE  # noqa: E402
+from classifier.key_codes import KEY_BACKWARD, KEY_FORWARD, KEY_LEFT, KEY_RIGHT, KEY_SHIFT  # noqa: E402
+from clock import NS_PER_MS  # noqa: E402
+from input_backends import ACTION_EXIT, ACTION_IGNORE, ACTION_TOGGLE, InputBackendError  # noqa: E402
+from input_backends.evdev_backend import (  # noqa: E402
+    BTN_LEFT,
+    EV_KEY,
+    INPUT_EVENT,
+    KEY_F6,
+    KEY_F8,
+    KEY_LEFTSHIFT,
+    EvdevBackend,
+    _open_error,
+    build_code_table,
+    find_devices,
+)
+from input_events import InputListener  # noqa: E402
+
+EV_SYN = 0
+KEY_A, KEY_D, KEY_Q = 30, 32, 16
+BASE_NS = 1_000 * 1_000_000_000
+
+
+def _record(ns, code, value, type_=EV_KEY):
+    return INPUT_EVENT.pack(ns // 1_000_000_000, ns % 1_000_000_000 // 1000, type_, code, value)
+
+
+@pytest.fixture
+def fifo(tmp_path):
+    path = str(tmp_path / "event0")
+    os.mkfifo(path)
+    return path
+
+
+def _started(collector, *devices, now_ns=lambda: BASE_NS):
+    # A pipeline clock frozen at BASE_NS maps kernel time t to t + BASE_NS - now.
+    backend = EvdevBackend(("W", "S", "A", "D"), devices)
+    backend.start(collector.on_key, collector.on_click, now_ns)
+    return backend
+
+
+def _wait(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline
+        time.sleep(0.001)
+
+
+class TestCodeTable:
+    def test_layouts(self):
+        wasd = build_code_table(("W", "S", "A", "D"))
+        assert [wasd[c] for c in (17, 31, 30, 32)] == [KEY_FORWARD, KEY_BACKWARD, KEY_LEFT, KEY_RIGHT]
+        esdf = build_code_table(("E", "D", "S", "F"))
+        assert [esdf[c] for c in (18, 32, 31, 33)] == [KEY_FORWARD, KEY_BACKWARD, KEY_LEFT, KEY_RIGHT]
+        assert esdf[KEY_A] == ACTION_IGNORE
+        assert wasd[KEY_F6] == ACTION_TOGGLE and wasd[KEY_F8] == ACTION_EXIT
+
+    def test_unmappable_key(self):
+        with pytest.raises(ValueError):
+            build_code_table(("W", "S", "A", "~"))
+
+
+def test_find_devices(tmp_path):
+    proc = tmp_path / "devices"
+    proc.write_text(
+        "I: Bus=0019 Vendor=0000 Product=0001 Version=0000\n"
+        'N: Name="Power Button"\n'
+        "H: Handlers=kbd event0 \n\n"
+        'N: Name="Logitech USB Receiver"\n'
+        "H: Handlers=sysrq kbd leds event3 \n\n"
+        'N: Name="Logitech USB Receiver Mouse"\n'
+        "H: Handlers=mouse0 event4 \n\n"
+        'N: Name="HDA Intel PCH Headphone"\n'
+        "H: Handlers=event7 \n"
+    )
+    assert find_devices(str(proc)) == ["/dev/input/event0", "/dev/input/event3", "/dev/input/event4"]
+
+
+class TestEvdevBackend:
+    def test_decodes_records_with_kernel_timestamps(self, fifo, collector):
+        backend = _started(collector, fifo)
+        t0 = time.clock_gettime_ns(time.CLOCK_MONOTONIC)
+        with open(fifo, "wb") as device:
+            device.write(
+                _record(t0, KEY_A, 1)
+                + _record(t0, 0, 0, type_=EV_SYN)
+                + _record(t0 + 300_000_000, KEY_A, 2)  # autorepeat
+                + _record(t0 + 400_000_000, KEY_Q, 1)  # unbound
+                + _record(t0 + 401_000_000, KEY_LEFTSHIFT, 1)
+                + _record(t0 + 402_000_000, KEY_A, 0)
+                + _record(t0 + 450_000_000, BTN_LEFT, 1)
+                + _record(t0 + 460_000_000, BTN_LEFT, 0)
+            )
+        assert backend.finished.wait(2.0)
+        backend.stop()
+        first = collector.keys[0][2]
+        assert [(kind, action, t - first) for kind, action, t in collector.keys] == [
+            (EVENT_PRESS, KEY_LEFT, 0),
+            (EVENT_PRESS, KEY_SHIFT, 401 * NS_PER_MS),
+            (EVENT_RELEASE, KEY_LEFT, 402 * NS_PER_MS),
+        ]
+        assert collector.clicks == [first + 450 * NS_PER_MS]
+        # t0 was read after the backend sampled the monotonic clock against BASE_NS.
+        assert 0 <= first - BASE_NS < 1_000 * NS_PER_MS
+        assert collector.threads == {"cstrafe-evdev"}
+        assert backend.time_skew().count == 4
+
+    def test_records_split_across_reads(self, fifo, collector):
+        backend = _started(collector, fifo)
+        record = _record(BASE_NS, KEY_D, 1)
+        with open(fifo, "wb", buffering=0) as device:
+            device.write(record[:10])
+            time.sleep(0.02)
+            device.write(record[10:] + _record(BASE_NS + 5, KEY_D, 0))
+        _wait(lambda: len(collector.keys) == 2)
+        backend.stop()
+        assert [(kind, action) for kind, action, _ in collector.keys] == [
+            (EVENT_PRESS, KEY_RIGHT), (EVENT_RELEASE, KEY_RIGHT),
+        ]
+
+    def test_multiplexes_devices_on_one_thread(self, tmp_path, collector):
+        paths = [str(tmp_path / name) for name in ("kbd", "mouse")]
+        for path in paths:
+            os.mkfifo(path)
+        backend = _started(collector, *paths)
+        with open(paths[0], "wb", buffering=0) as kbd, open(paths[1], "wb", buffering=0) as mouse:
+            kbd.write(_record(BASE_NS, KEY_A, 1))
+            mouse.write(_record(BASE_NS + 1000, BTN_LEFT, 1))
+            _wait(lambda: collector.keys and collector.clicks)
+        backend.stop()
+        assert collector.threads == {"cstrafe-evdev"}
+
+    def test_stop_closes_every_fd(self, fifo, collector):
+        before = set(os.listdir("/proc/self/fd"))
+        backend = _started(collector, fifo)
+        backend.stop()
+        assert not backend._fds
+        assert set(os.listdir("/proc/self/fd")) <= before
+
+
+def test_f8_stops_listener_from_backend_thread(fifo, overlay):
+    mc_cls, sf_cls = CLASSIFIERS["pp"]
+    backend = EvdevBackend(("W", "S", "A", "D"), [fifo])
+    listener = InputListener(
+        overlay, mc_cls(ticks_per_ms=NS_PER_MS), sf_cls(), ("W", "S", "A", "D"), backend=backend
+    )
+    listener.start()
+    with open(fifo, "wb", buffering=0) as device:
+        device.write(_record(BASE_NS, KEY_F8, 1))
+        assert backend.finished.wait(2.0)
+    assert "terminate" in overlay.calls
+
+
+class TestStartErrors:
+    def test_unopenable_device_closes_the_ones_already_open(self, fifo, tmp_path, collector):
+        missing = str(tmp_path / "event9")
+        before = set(os.listdir("/proc/self/fd"))
+        backend = EvdevBackend(("W", "S", "A", "D"), [fifo, missing])
+        with pytest.raises(InputBackendError, match="event9"):
+            backend.start(collector.on_key, collector.on_click, time.perf_counter_ns)
+        assert not backend._fds
+        assert set(os.listdir("/proc/self/fd")) <= before
+        backend.stop()
+
+    def test_permission_error_names_the_requirement(self):
+        message = _open_error("/dev/input/event3", PermissionError(errno.EACCES, "Permission denied"))
+        assert "/dev/input/event3" in message and "'input' group" in message
+
+    def test_no_devices(self, tmp_path):
+        proc = tmp_path / "devices"
+        proc.write_text('N: Name="HDA Intel PCH Headphone"\nH: Handlers=event7 \n')
+        assert find_devices(str(proc)) == []
+        with pytest.raises(InputBackendError, match="no keyboard or mouse"):
+            EvdevBackend(("W", "S", "A", "D"), [])
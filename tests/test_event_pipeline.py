@@ -0,0 +1,79 @@
+"""
+Tests for event_pipeline — EventRing and EventConsumer draining.
+
+The consumer is driven synchronously through drain(); no thread is started.
+"""
+
+import pytest
+from classifier.events import EVENT_PRESS, EVENT_RELEASE, EVENT_SHOT
+from event_pipeline import EventConsumer, EventRing
+
+
+# ===========================================================================
+# EventRing
+# ===========================================================================
+
+class TestEventRing:
+    def test_fifo_order(self):
+        ring = EventRing(capacity=4)
+        ring.push(EVENT_PRESS, "A", 10)
+        ring.push(EVENT_RELEASE, "A", 20)
+        assert ring.pop() == (EVENT_PRESS, "A", 10)
+        assert ring.pop() == (EVENT_RELEASE, "A", 20)
+        assert len(ring) == 0
+
+    def test_peek_time_empty_is_none(self):
+        assert EventRing(capacity=2).peek_time() is None
+
+    def test_full_ring_drops_and_counts(self):
+        ring = EventRing(capacity=2)
+        assert ring.push(EVENT_PRESS, "A", 1)
+        assert ring.push(EVENT_PRESS, "D", 2)
+        assert not ring.push(EVENT_SHOT, None, 3)
+        assert ring.drops == 1
+        assert len(ring) == 2
+
+    def test_wraps_around(self):
+        ring = EventRing(capacity=2)
+        for t in range(10):
+            ring.push(EVENT_PRESS, "A", t)
+            assert ring.pop()[2] == t
+
+    def test_capacity_must_be_power_of_two(self):
+        with pytest.raises(ValueError):
+            EventRing(capacity=3)
+
+
+# ===========================================================================
+# EventConsumer.drain
+# ===========================================================================
+
+class TestEventConsumerDrain:
+    def _make(self, *rings):
+        seen = []
+        consumer = EventConsumer(rings, lambda k, key, t: seen.append((k, key, t)), lambda: 100)
+        return consumer, seen
+
+    def test_merges_rings_in_timestamp_order(self):
+        keyboard, mouse = EventRing(8), EventRing(8)
+        keyboard.push(EVENT_PRESS, "A", 10)
+        keyboard.push(EVENT_RELEASE, "A", 30)
+        mouse.push(EVENT_SHOT, None, 20)
+        mouse.push(EVENT_SHOT, None, 40)
+        consumer, seen = self._make(keyboard, mouse)
+        assert consumer.drain() == 4
+        assert [t for _, _, t in seen] == [10, 20, 30, 40]
+
+    def test_snapshot_counters(self):
+        ring = EventRing(2)
+        ring.push(EVENT_PRESS, "A", 90)
+        ring.push(EVENT_PRESS, "D", 95)
+        ring.push(EVENT_PRESS, "W", 96)   # dropped
+        consumer, _ = self._make(ring)
+        consumer.drain()
+        stats = consumer.snapshot()
+        assert stats["events"] == 2
+        assert stats["drops"] == 1
+        assert stats["max_depth"] == 2
+        assert stats["depth"] == 0
+        assert stats["latency_max_ms"] == pytest.approx(10 / 1_000_000)
@@ -0,0 +1,51 @@
+"""
+Tests for gc_monitor — collection timing, shot overlap and threshold tuning.
+"""
+
+import gc
+
+import pytest
+from clock import NS_PER_MS, VirtualClock
+from gc_monitor import PLAY_THRESHOLDS, GCMonitor
+
+
+@pytest.fixture
+def monitored():
+    clock = VirtualClock()
+    lines = []
+    monitor = GCMonitor(clock.now_ns, log=lines.append)
+    yield monitor, clock, lines
+    monitor.close()
+
+
+def test_collections_are_timed_per_generation(monitored):
+    monitor, _, _ = monitored
+    gc.collect(0)
+    gc.collect(2)
+    assert monitor.pauses[0].count >= 1
+    assert monitor.pauses[2].count >= 1
+
+
+def test_pause_inside_shot_timing_is_reported(monitored):
+    monitor, clock, lines = monitored
+    monitor._on_gc("start", {"generation": 2})
+    clock.advance_to(4 * NS_PER_MS)
+    monitor._on_gc("stop", {"generation": 2})
+    assert monitor.pauses[2].max == 4 * NS_PER_MS
+    assert not monitor.check_shot(5 * NS_PER_MS, 9 * NS_PER_MS)
+    assert monitor.check_shot(3 * NS_PER_MS, 9 * NS_PER_MS)
+    assert monitor.overlapped_shots == 1
+    assert lines == ["[GC] 4.00 ms pause inside shot timing"]
+    assert monitor.report_lines()[-1].endswith(": 1")
+
+
+def test_tune_and_close_restore_gc_settings():
+    before = gc.get_threshold()
+    monitor = GCMonitor(VirtualClock().now_ns)
+    monitor.tune()
+    assert gc.get_threshold() == PLAY_THRESHOLDS
+    assert gc.get_freeze_count() > 0
+    monitor.close()
+    assert gc.get_threshold() == before
+    assert gc.get_freeze_count() == 0
+    assert monitor._on_gc not in gc.callbacks
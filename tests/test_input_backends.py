@@ -0,0 +1,220 @@
+"""
+Tests for input_backends — the trace backend, the pynput backend's key
+parsing and OS event times (through tests/fake_pynput) and InputListener
+fed by a backend.
+"""
+
+import itertools
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent / "fake_pynput"))
+
+from classifier import CLASSIFIERS  # noqa: E402
+from classifier.events import EVENT_PRESS, EVENT_RELEASE, EVENT_SHOT  # noqa: E402
+from classifier.key_codes import KEY_LEFT, KEY_NONE, KEY_RIGHT, KEY_SHIFT  # noqa: E402
+from clock import NS_PER_MS, Clock, PerfCounterClock, VirtualClock  # noqa: E402
+from headless_overlay import HeadlessOverlay  # noqa: E402
+from input_backends import ACTION_TOGGLE  # noqa: E402
+from input_backends.pynput_backend import PynputBackend, detect_event_time  # noqa: E402
+from input_backends.trace_backend import TraceBackend  # noqa: E402
+from input_events import InputListener  # noqa: E402
+from pynput import _fake, keyboard, mouse  # noqa: E402
+from replay import Trace, classify_trace  # noqa: E402
+from synthetic import SCENARIOS, generate  # noqa: E402
+
+
+class _SteppingClock(Clock):
+    """A clock that moves ``step_ns`` on from one reading to the next."""
+
+    def __init__(self, step_ns):
+        self._readings = itertools.count(1)
+        self._step_ns = step_ns
+
+    def now_ns(self):
+        return next(self._readings) * self._step_ns
+
+
+class TestTraceBackend:
+    TRACE = Trace(
+        [
+            (EVENT_PRESS, KEY_LEFT, 0),
+            (EVENT_RELEASE, KEY_LEFT, 10),
+            (EVENT_PRESS, KEY_RIGHT, 15),
+            (EVENT_SHOT, KEY_NONE, 20),
+            (EVENT_RELEASE, KEY_RIGHT, 30),
+        ],
+        ticks_per_ms=1,
+    )
+
+    def test_delivers_keys_and_clicks_paced(self, collector):
+        backend = TraceBackend(self.TRACE, speed=2.0)
+        clock = PerfCounterClock()
+        start = clock.now_ns()
+        backend.start(collector.on_key, collector.on_click, clock.now_ns)
+        assert backend.finished.wait(2.0)
+        assert [(kind, key) for kind, key, _ in collector.keys] == [
+            (EVENT_PRESS, KEY_LEFT), (EVENT_RELEASE, KEY_LEFT), (EVENT_PRESS, KEY_RIGHT), (EVENT_RELEASE, KEY_RIGHT),
+        ]
+        first = collector.keys[0][2]
+        # Timestamps are the due times: the trace's spacing at 2x speed.
+        assert [t - first for _, _, t in collector.keys] == [0, 5 * NS_PER_MS, 7_500_000, 15 * NS_PER_MS]
+        assert collector.clicks == [first + 10 * NS_PER_MS]
+        assert first >= start
+        assert clock.now_ns() - first >= 15 * NS_PER_MS
+
+    def test_stop_interrupts_delivery(self, collector):
+        trace = Trace([(EVENT_PRESS, KEY_LEFT, 0), (EVENT_RELEASE, KEY_LEFT, 10_000)], ticks_per_ms=1)
+        backend = TraceBackend(trace)
+        backend.start(collector.on_key, collector.on_click, time.perf_counter_ns)
+        time.sleep(0.01)
+        backend.stop()
+        assert backend.finished.is_set()
+        assert len(collector.keys) == 1
+
+    def test_live_pipeline_matches_offline_replay(self, overlay):
+        events = list(generate(400, seed=1, model=SCENARIOS["mixed"], ticks_per_ms=NS_PER_MS))
+        mc_cls, sf_cls = CLASSIFIERS["pp"]
+        expected = classify_trace(Trace(events, NS_PER_MS), mc_cls(ticks_per_ms=NS_PER_MS), sf_cls())
+
+        # Every event is already due when the backend checks, so it is
+        # delivered at once, stamped with its trace time shifted to start.
+        clock = _SteppingClock(events[-1][2] - events[0][2] + 1)
+        backend = TraceBackend(Trace(events, NS_PER_MS))
+        listener = InputListener(
+            overlay, mc_cls(ticks_per_ms=NS_PER_MS), sf_cls(), ("W", "S", "A", "D"), clock=clock, backend=backend
+        )
+        listener.start()
+        try:
+            assert backend.finished.wait(10.0)
+            deadline = time.monotonic() + 10.0
+            while listener.pipeline_stats()["events"] < len(events):
+                assert time.monotonic() < deadline
+                time.sleep(0.001)
+        finally:
+            listener.stop()
+        assert overlay.results == [r.to_display_string() for r in expected]
+        assert listener.time_skew_lines()[0].startswith(f"[CLOCK] callback - event time, {len(events)} events:")
+
+
+@pytest.mark.parametrize("debug_mode", [False, True])
+def test_time_skew_reported_on_the_render_tick(debug_mode):
+    mc_cls, sf_cls = CLASSIFIERS["pp"]
+    overlay = HeadlessOverlay(debug_mode=debug_mode)
+    listener = InputListener(overlay, mc_cls(), sf_cls(), ("W", "S", "A", "D"), backend=TraceBackend(Trace([], 1)))
+    reports = []
+
+    def report():
+        reports.append(listener.time_skew_lines())
+        return reports[-1]
+
+    overlay.add_debug_report(report)
+    result = mc_cls().classify_shot(0)
+    for _ in range(50):
+        overlay.update_result(result)
+        overlay._tick()
+    # Every 25th drawn shot, and only with the debug panel on.
+    assert len(reports) == (2 if debug_mode else 0)
+    assert all(lines[0].startswith("[CLOCK]") for lines in reports)
+
+
+class TestPynputBackend:
+    def test_parses_keys_once_and_drops_unmapped(self, collector):
+        backend = PynputBackend(("W", "S", "A", "D"))
+        backend.start(collector.on_key, collector.on_click, time.perf_counter_ns)
+        try:
+            _fake.inject(
+                [
+                    ("on_press", (keyboard.KeyCode.from_char("a"),)),
+                    ("on_press", (keyboard.KeyCode.from_char("q"),)),
+                    ("on_press", (keyboard.Key.shift_r,)),
+                    ("on_press", (keyboard.Key.f6,)),
+                    ("on_release", (keyboard.KeyCode.from_vk(ord("D")),)),
+                    ("on_click", (0, 0, mouse.Button.left, True)),
+                    ("on_click", (0, 0, mouse.Button.left, False)),
+                    ("on_click", (0, 0, mouse.Button.right, True)),
+                ],
+                rate_hz=100_000,
+            )
+            _fake.drained()
+        finally:
+            backend.stop()
+        assert [(kind, action) for kind, action, _ in collector.keys] == [
+            (EVENT_PRESS, KEY_LEFT), (EVENT_PRESS, KEY_SHIFT), (EVENT_PRESS, ACTION_TOGGLE), (EVENT_RELEASE, KEY_RIGHT),
+        ]
+        assert len(collector.clicks) == 1
+        assert _fake.running() == []
+
+    def test_fake_listeners_fall_back_to_callback_time(self):
+        assert detect_event_time() == "callback"
+        assert PynputBackend(("W", "S", "A", "D")).time_skew() is None
+        with pytest.raises(ValueError):
+            PynputBackend(("W", "S", "A", "D"), event_time="darwin")
+
+    @staticmethod
+    def _stall_first_key(event_time, collector, queued):
+        """
+        Start a backend on a clock 1 ms behind the first key's OS time
+        (10 ms), then, while that key holds up the hook thread, move the
+        clock on to 111 ms and inject ``queued`` at OS times 20, 30, ...
+        """
+        clock = VirtualClock(11 * NS_PER_MS)
+
+        def while_held():
+            clock.advance_to(111 * NS_PER_MS)
+            _fake.inject(queued, rate_hz=100, start_ns=10 * NS_PER_MS)
+
+        collector.while_first_key_held = while_held
+        backend = PynputBackend(("W", "S", "A", "D"), event_time=event_time)
+        backend.start(collector.on_key, collector.on_click, clock.now_ns)
+        try:
+            _fake.inject([("on_press", (keyboard.KeyCode.from_char("a"),))], rate_hz=100, start_ns=0)
+            _fake.drained()
+        finally:
+            backend.stop()
+        return backend
+
+    @pytest.mark.parametrize("event_time", ["xorg", "win32"])
+    def test_os_event_times_survive_a_stalled_hook(self, event_time, collector):
+        a, d = keyboard.KeyCode.from_char("a"), keyboard.KeyCode.from_char("d")
+        backend = self._stall_first_key(
+            event_time,
+            collector,
+            [
+                ("on_release", (a,)),
+                ("on_click", (0, 0, mouse.Button.left, True)),
+                ("on_press", (d,)),
+                ("on_release", (d,)),
+            ],
+        )
+        # The queued events ran 60-90 ms late, yet keep the times the OS
+        # stamped them with, on the offset the first key calibrated.
+        assert [t for _, _, t in collector.keys] == [ms * NS_PER_MS for ms in (11, 21, 41, 51)]
+        assert collector.clicks == [31 * NS_PER_MS]
+        skew = backend.time_skew()
+        assert skew.count == 5
+        assert skew.max == 90 * NS_PER_MS
+
+    def test_win32_keys_posted_behind_a_stalled_hook_keep_their_own_times(self, collector):
+        # Both keys' hooks run before either is processed, as on Windows.
+        self._stall_first_key(
+            "win32",
+            collector,
+            [("on_press", (keyboard.KeyCode.from_char("d"),)), ("on_press", (keyboard.Key.shift,))],
+        )
+        assert collector.keys == [
+            (EVENT_PRESS, KEY_LEFT, 11 * NS_PER_MS),
+            (EVENT_PRESS, KEY_RIGHT, 21 * NS_PER_MS),
+            (EVENT_PRESS, KEY_SHIFT, 31 * NS_PER_MS),
+        ]
+
+
+def test_hotkeys_act_on_press_only(overlay):
+    mc_cls, sf_cls = CLASSIFIERS["pp"]
+    listener = InputListener(overlay, mc_cls(), sf_cls(), ("W", "S", "A", "D"), backend=TraceBackend(Trace([], 1)))
+    listener._on_key(EVENT_PRESS, ACTION_TOGGLE, 0)
+    listener._on_key(EVENT_RELEASE, ACTION_TOGGLE, 1)
+    assert overlay.calls == ["toggle_visibility"]
@@ -0,0 +1,99 @@
+"""
+Tests for classifier snapshot/restore and keyframe_trace seeking.
+"""
+
+import random
+
+import pytest
+from classifier import CLASSIFIERS
+from classifier.events import EVENT_PRESS, EVENT_RELEASE, EVENT_SHOT
+from classifier.key_codes import KEY_CTRL, KEY_NONE
+from keyframe_trace import KeyframeTrace, write_keyframe_trace
+
+
+def _random_events(seed, count=3000):
+    rng = random.Random(seed)
+    t = 0
+    events = []
+    for _ in range(count):
+        t += rng.choice((1, 10, 30, 60, 120, 400, 700))
+        kind = rng.choice((EVENT_PRESS, EVENT_PRESS, EVENT_RELEASE, EVENT_RELEASE, EVENT_SHOT))
+        events.append((kind, KEY_NONE if kind == EVENT_SHOT else rng.randrange(KEY_CTRL + 1), t))
+    return events
+
+
+def _display(results):
+    return [r.to_display_string() for r in results]
+
+
+def _replay(name, events, classifier=None):
+    mc_cls, sf_cls = CLASSIFIERS[name]
+    mc = classifier or mc_cls()
+    sf = sf_cls()
+    results = []
+    for kind, key, t in events:
+        if kind == EVENT_PRESS:
+            mc.on_press(key, t)
+        elif kind == EVENT_RELEASE:
+            mc.on_release(key, t)
+        else:
+            results.append(sf.apply(mc.classify_shot(t)))
+    return results
+
+
+@pytest.mark.parametrize("name", list(CLASSIFIERS))
+class TestSnapshotRestore:
+    def test_restored_classifier_continues_identically(self, name):
+        events = _random_events(1)
+        mc_cls, _ = CLASSIFIERS[name]
+        for cut in (0, 1, 500, 1777):
+            live = mc_cls()
+            _replay(name, events[:cut], live)
+            copy = mc_cls()
+            copy.restore(live.snapshot())
+            assert copy.snapshot() == live.snapshot()
+            assert _display(_replay(name, events[cut:], copy)) == _display(_replay(name, events[cut:], live))
+
+    def test_snapshot_is_flat_and_hashable(self, name):
+        mc = CLASSIFIERS[name][0]()
+        mc.on_press("A", 10)
+        state = mc.snapshot()
+        hash(state)
+        assert all(value is None or isinstance(value, int) for value in state)
+
+
+@pytest.mark.parametrize("name", list(CLASSIFIERS))
+class TestKeyframeTrace:
+    def test_every_shot_matches_full_replay(self, tmp_path, name):
+        events = _random_events(2)
+        path = str(tmp_path / "trace.cstk")
+        write_keyframe_trace(path, events, name, ticks_per_ms=1, interval=7)
+        expected = _display(_replay(name, events))
+        with KeyframeTrace(path) as trace:
+            assert trace.shot_count == len(expected)
+            assert trace.keyframe_count == (len(expected) + 6) // 7
+            for shot in range(trace.shot_count):
+                assert _display(trace.classify_shots(shot)) == [expected[shot]]
+
+    def test_classify_run_of_shots(self, tmp_path, name):
+        events = _random_events(3)
+        path = str(tmp_path / "trace.cstk")
+        write_keyframe_trace(path, events, name, ticks_per_ms=1, interval=16)
+        expected = _display(_replay(name, events))
+        with KeyframeTrace(path) as trace:
+            assert _display(trace.classify_shots(40, 30)) == expected[40:70]
+            assert list(trace.events()) == events
+
+    def test_out_of_range_shot(self, tmp_path, name):
+        path = str(tmp_path / "trace.cstk")
+        write_keyframe_trace(path, _random_events(4, count=50), name, ticks_per_ms=1)
+        with KeyframeTrace(path) as trace:
+            with pytest.raises(IndexError):
+                trace.seek(trace.shot_count)
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "other.bin"
+    path.write_bytes(b"\x00" * 128)
+    with pytest.raises(ValueError):
+        KeyframeTrace(str(path))
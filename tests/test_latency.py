@@ -0,0 +1,96 @@
+"""
+Tests for latency — log-linear histograms and the per-shot stage tracker.
+"""
+
+import random
+
+import pytest
+from classifier import CLASSIFIERS
+from classifier.events import EVENT_SHOT
+from clock import VirtualClock
+from event_pipeline import ClassifierSink
+from headless_overlay import HeadlessOverlay
+from latency import STAGES, SUB_BITS, LatencyHistogram, LatencyTracker
+
+
+class TestLatencyHistogram:
+    def test_buckets_are_contiguous(self):
+        previous_high = -1
+        for index in range(LatencyHistogram._SIZE):
+            low, high = LatencyHistogram.bucket_range(index)
+            assert low == previous_high + 1
+            assert LatencyHistogram.bucket_index(low) == index
+            assert LatencyHistogram.bucket_index(high) == index
+            previous_high = high
+
+    def test_relative_error_is_bounded(self):
+        rng = random.Random(0)
+        for _ in range(10_000):
+            value = rng.randrange(1, 10**10)
+            low, high = LatencyHistogram.bucket_range(LatencyHistogram.bucket_index(value))
+            assert low <= value <= high
+            assert (high - low) / value <= 2**-SUB_BITS
+
+    def test_percentiles(self):
+        hist = LatencyHistogram()
+        for value in range(1, 1001):
+            hist.record(value * 1000)
+        assert hist.count == 1000
+        assert hist.max == 1_000_000
+        assert hist.percentile(50) == pytest.approx(500_000, rel=2**-SUB_BITS)
+        assert hist.percentile(99) == pytest.approx(990_000, rel=2**-SUB_BITS)
+        assert hist.percentile(100) == 1_000_000
+        assert LatencyHistogram().percentile(50) == 0
+
+    def test_huge_and_negative_values_are_clamped(self):
+        hist = LatencyHistogram()
+        hist.record(-5)
+        hist.record(1 << 60)
+        assert hist.counts[0] == 1
+        assert hist.counts[-1] == 1
+
+    def test_merge(self):
+        a, b = LatencyHistogram(), LatencyHistogram()
+        a.record(10)
+        b.record(5000)
+        a.merge(b)
+        assert a.count == 2
+        assert a.max == 5000
+        assert a.percentile(100) == 5000
+
+
+class TestLatencyTracker:
+    def test_sink_and_render_fill_every_stage(self, overlay):
+        clock = VirtualClock(1_000)
+        tracker = LatencyTracker(clock.now_ns)
+        mc_cls, sf_cls = CLASSIFIERS["pp"]
+        sink = ClassifierSink(overlay, mc_cls(ticks_per_ms=1_000_000), sf_cls(), latency=tracker)
+        sink.handle(EVENT_SHOT, None, 400)
+        clock.advance_to(5_000)
+        assert tracker.record_render(5_000, 7_000)
+        assert not tracker.record_render(8_000, 9_000)
+        hists = tracker.histograms
+        assert all(hists[stage].count == 1 for stage in STAGES)
+        assert hists["queue"].max == 600
+        assert hists["dispatch"].max == 4_000
+        assert hists["render"].max == 2_000
+        assert hists["total"].max == 6_600
+        assert len(tracker.report_lines()) == len(STAGES) + 1
+
+    def test_identical_consecutive_shots_are_both_sampled(self):
+        tracker = LatencyTracker(VirtualClock().now_ns)
+        overlay = HeadlessOverlay(latency=tracker)
+        mc_cls, sf_cls = CLASSIFIERS["pp"]
+        sink = ClassifierSink(overlay, mc_cls(ticks_per_ms=1_000_000), sf_cls(), latency=tracker)
+        for t in (100, 200):
+            sink.handle(EVENT_SHOT, None, t)  # "Not detected" both times
+            overlay._tick()
+        assert tracker.shots == 2
+        assert tracker.histograms["total"].count == 2
+
+    def test_discarded_shot_is_not_rendered(self):
+        tracker = LatencyTracker(VirtualClock().now_ns)
+        tracker.record_shot(0, 1, 2, 3)
+        tracker.discard_pending()
+        assert not tracker.record_render(10, 20)
+        assert tracker.shots == 0
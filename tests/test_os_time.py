@@ -0,0 +1,86 @@
+"""Tests for input_backends.os_time.OSClockMap."""
+
+import random
+
+from clock import NS_PER_MS
+from input_backends import OSClockMap
+from input_backends.os_time import RECALIBRATE_NS
+
+BASE_NS = 7_000 * NS_PER_MS  # pipeline clock at OS time 0
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0
+
+    def now_ns(self):
+        return self.now
+
+
+def _map(clock_map, clock, os_ms, lag_ns):
+    clock.now = BASE_NS + os_ms * NS_PER_MS + lag_ns
+    return clock_map(os_ms & 0xFFFFFFFF)
+
+
+def test_offset_is_the_least_delayed_event():
+    clock = _Clock()
+    clock_map = OSClockMap(clock.now_ns)
+    mapped = [
+        _map(clock_map, clock, 1000, 5 * NS_PER_MS),
+        _map(clock_map, clock, 1010, 1 * NS_PER_MS),
+        _map(clock_map, clock, 1020, 30 * NS_PER_MS),  # queued behind a stall
+    ]
+    assert mapped == [BASE_NS + ms * NS_PER_MS for ms in (1005, 1011, 1021)]
+    assert clock_map.offset_ns == BASE_NS + NS_PER_MS
+    assert clock_map.skew.count == 3
+    assert clock_map.skew.max == 29 * NS_PER_MS
+
+
+def test_streams_sharing_a_map_share_the_offset():
+    # A click delivered late calibrates nothing once a key came in faster.
+    clock = _Clock()
+    clock_map = OSClockMap(clock.now_ns)
+    _map(clock_map, clock, 1000, 6 * NS_PER_MS)  # click
+    _map(clock_map, clock, 1100, 1 * NS_PER_MS)  # key
+    assert _map(clock_map, clock, 1200, 6 * NS_PER_MS) == BASE_NS + 1201 * NS_PER_MS  # click
+
+
+def test_counter_wraparound():
+    clock = _Clock()
+    clock_map = OSClockMap(clock.now_ns)
+    first = _map(clock_map, clock, 0xFFFFFFFE, 0)
+    assert _map(clock_map, clock, 0x1_0000_0001, 0) - first == 3 * NS_PER_MS
+
+
+def test_late_older_event_steps_back():
+    clock = _Clock()
+    clock_map = OSClockMap(clock.now_ns)
+    _map(clock_map, clock, 5000, 0)
+    clock.now += NS_PER_MS
+    assert clock_map(4990) == BASE_NS + 4990 * NS_PER_MS
+
+
+def test_follows_drift_after_two_windows():
+    clock = _Clock()
+    clock_map = OSClockMap(clock.now_ns)
+    _map(clock_map, clock, 0, 0)
+    # The OS clock falls 2 ms behind; the old minimum ages out.
+    step_ms = 100
+    for os_ms in range(step_ms, 3 * RECALIBRATE_NS // NS_PER_MS, step_ms):
+        _map(clock_map, clock, os_ms, 2 * NS_PER_MS)
+    assert clock_map.offset_ns == BASE_NS + 2 * NS_PER_MS
+
+
+def test_never_later_than_callback_and_in_order():
+    rng = random.Random(3)
+    clock = _Clock()
+    clock_map = OSClockMap(clock.now_ns)
+    os_ms = 0xFFFF0000
+    previous = None
+    for _ in range(5000):
+        os_ms += rng.randrange(0, 40)
+        mapped = _map(clock_map, clock, os_ms, int(rng.lognormvariate(13, 1.5)))
+        assert mapped <= clock.now
+        if previous is not None:
+            assert mapped >= previous
+        previous = mapped
@@ -1,11 +1,18 @@
 """
 Tests for ppClassifier — AxisState, ShotClassification, MovementClassifier.
 
-All timestamps are in milliseconds.
+All timestamps are in milliseconds except in TestNanosecondTicks.
 """
 
+import random
+
 import pytest
+from classifier import DebugLogger
 from classifier.ppClassifier import AxisState, MovementClassifier, ShotClassification
+from classifier.events import EVENT_PRESS, EVENT_RELEASE, EVENT_SHOT, pack_events
+from classifier.key_codes import (
+    KEY_BACKWARD, KEY_CTRL, KEY_FORWARD, KEY_LEFT, KEY_NONE, KEY_RIGHT, KEY_SHIFT, KeyMap,
+)
 
 
 # ---------------------------------------------------------------------------
@@ -593,3 +600,150 @@ class TestEndToEnd:
         result = mc.classify_shot(230.0)
         text = result.to_display_string()
         assert "Perfect" in text
+
+
+# ===========================================================================
+# Integer nanosecond timestamps
+# ===========================================================================
+
+NS = 1_000_000
+
+
+class TestNanosecondTicks:
+    def test_perfect_counter_strafe_reports_ms(self):
+        mc = MovementClassifier(ticks_per_ms=NS)
+        mc.on_press("A", 0)
+        mc.on_release("A", 100 * NS)
+        mc.on_press("D", 130 * NS + 250_000)   # cs_time = 30.25 ms
+        result = mc.classify_shot(230 * NS)
+        assert result.label == "Perfect"
+        assert result.cs_time == pytest.approx(30.25)
+        assert result.shot_delay == pytest.approx(99.75)
+
+    def test_not_detected_window_scaled(self):
+        mc = MovementClassifier(ticks_per_ms=NS)
+        mc.on_press("A", 0)
+        assert mc.classify_shot(500 * NS - 1).label != "Not detected"
+        mc.on_press("A", 1000 * NS)
+        assert mc.classify_shot(1500 * NS).label == "Not detected"
+
+    def test_micro_candidate_threshold_scaled(self):
+        ax = AxisState(keys=("A", "D"), ticks_per_ms=NS)
+        ax.on_press("A", 0)
+        ax.on_release("A", 79 * NS)
+        assert ax.micro_candidate_duration == 79 * NS
+        ax.on_press("A", 100 * NS)
+        ax.on_release("A", 180 * NS)
+        assert ax.micro_candidate_duration is None
+
+    def test_large_monotonic_timestamps_keep_sub_ms_precision(self):
+        base = 9_876_543_210_123_456   # ~114 days of uptime in ns
+        mc = MovementClassifier(ticks_per_ms=NS)
+        mc.on_press("A", base)
+        mc.on_release("A", base + 100 * NS)
+        mc.on_press("D", base + 101 * NS + 1)
+        result = mc.classify_shot(base + 201 * NS + 1)
+        assert result.cs_time == pytest.approx(1.000001, abs=1e-9)
+
+
+# ===========================================================================
+# Integer key codes
+# ===========================================================================
+
+class TestIntegerKeyCodes:
+    def test_key_map_round_trip(self):
+        km = KeyMap(("E", "D"), ("S", "F"))
+        assert km.code("e") == KEY_FORWARD
+        assert km.code("F") == KEY_RIGHT
+        assert km.code("shift") == KEY_SHIFT
+        assert km.code("X") == KEY_NONE
+        assert km.name(KEY_BACKWARD) == "D"
+
+    def test_codes_route_to_axes(self):
+        mc = MovementClassifier()
+        mc.on_press(KEY_LEFT, 0.0)
+        mc.on_press(KEY_FORWARD, 0.0)
+        assert mc.horizontal.held_keys == {"A"}
+        assert mc.vertical.held_keys == {"W"}
+
+    def test_codes_and_names_classify_identically(self):
+        by_code = MovementClassifier()
+        by_name = MovementClassifier()
+        for mc, (a, d, ctrl) in ((by_code, (KEY_LEFT, KEY_RIGHT, KEY_CTRL)), (by_name, ("A", "D", "CTRL"))):
+            mc.on_press(ctrl, 0.0)
+            mc.on_release(ctrl, 5.0)
+            mc.on_press(a, 10.0)
+            mc.on_release(a, 100.0)
+            mc.on_press(d, 130.0)
+        r1, r2 = by_code.classify_shot(230.0), by_name.classify_shot(230.0)
+        assert (r1.label, r1.cs_time, r1.shot_delay) == (r2.label, r2.cs_time, r2.shot_delay)
+
+    def test_modifier_codes(self):
+        mc = MovementClassifier()
+        mc.on_press(KEY_SHIFT, 0.0)
+        assert mc._shift_held is True
+        mc.on_release(KEY_SHIFT, 1.0)
+        assert mc._shift_held is False
+
+    def test_axis_accepts_side_index(self):
+        ax = make_axis()
+        ax.on_press(0, 100.0)
+        ax.on_release(0, 150.0)
+        ax.on_press(1, 170.0)
+        assert ax.cs_release_key == "A"
+        assert ax.cs_press_key == "D"
+        assert ax.classify_shot(300.0)[0] == "Counter-strafe"
+
+
+# ===========================================================================
+# MovementClassifier.feed — packed event buffers
+# ===========================================================================
+
+def _random_events(seed, count=2000):
+    rng = random.Random(seed)
+    t = 0
+    events = []
+    for _ in range(count):
+        t += rng.choice((1, 10, 30, 60, 120, 400, 700))
+        kind = rng.choice((EVENT_PRESS, EVENT_PRESS, EVENT_RELEASE, EVENT_RELEASE, EVENT_SHOT))
+        events.append((kind, None if kind == EVENT_SHOT else rng.randrange(KEY_CTRL + 1), t))
+    return events
+
+
+def _fields(r):
+    return (r.label, r.sub_label, r.cs_time, r.shot_delay, r.overlap_time)
+
+
+class TestFeed:
+    @pytest.mark.parametrize("seed", range(5))
+    def test_matches_per_event_calls(self, seed):
+        events = _random_events(seed)
+        by_event = MovementClassifier()
+        expected = []
+        for kind, key, t in events:
+            if kind == EVENT_SHOT:
+                expected.append(_fields(by_event.classify_shot(t)))
+            elif kind == EVENT_PRESS:
+                by_event.on_press(key, t)
+            else:
+                by_event.on_release(key, t)
+        fed = MovementClassifier().feed(pack_events(events))
+        assert [_fields(r) for r in fed] == expected
+
+    def test_accepts_memoryview(self):
+        buf = pack_events([(EVENT_PRESS, KEY_LEFT, 0), (EVENT_RELEASE, KEY_LEFT, 100),
+                           (EVENT_PRESS, KEY_RIGHT, 120), (EVENT_SHOT, None, 220)])
+        (result,) = MovementClassifier().feed(memoryview(buf))
+        assert result.cs_time == pytest.approx(20.0)
+        assert result.shot_delay == pytest.approx(100.0)
+
+    def test_results_are_distinct(self):
+        buf = pack_events([(EVENT_SHOT, None, 0), (EVENT_SHOT, None, 10)])
+        first, second = MovementClassifier().feed(buf)
+        assert first is not second
+
+    def test_debug_logger_still_logs(self):
+        lines = []
+        mc = MovementClassifier(debug_logger=DebugLogger(lines.append))
+        mc.feed(pack_events([(EVENT_PRESS, KEY_LEFT, 0), (EVENT_SHOT, None, 50)]))
+        assert any("KEY PRESS" in str(line) for line in lines)
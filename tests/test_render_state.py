@@ -0,0 +1,143 @@
+"""
+Tests for render_state — dirty-state collapsing between overlay ticks.
+"""
+
+import threading
+
+from clock import NS_PER_MS, VirtualClock
+from render_state import FrameUpdate, RenderState
+
+
+def make_state():
+    clock = VirtualClock()
+    return RenderState(clock=clock, flash_ms=150), clock
+
+
+class TestRenderState:
+    def test_nothing_changed_is_none(self):
+        state, _ = make_state()
+        assert state.take() is None
+
+    def test_key_bars_report_only_changes(self):
+        state, _ = make_state()
+        state.set_left_key_held(True)
+        assert state.take() == FrameUpdate(left_held=True)
+        state.set_left_key_held(True)  # autorepeat
+        assert state.take() is None
+        state.set_left_key_held(False)
+        state.set_right_key_held(True)
+        assert state.take() == FrameUpdate(left_held=False, right_held=True)
+
+    def test_toggle_within_one_tick_collapses(self):
+        state, _ = make_state()
+        state.set_right_key_held(True)
+        state.set_right_key_held(False)
+        assert state.take() is None
+
+    def test_repeated_flashes_extend_one_deadline(self):
+        state, clock = make_state()
+        state.flash_shot()
+        assert state.take() == FrameUpdate(flash=True)
+        clock.advance_to(100 * NS_PER_MS)
+        state.flash_shot()
+        clock.advance_to(200 * NS_PER_MS)
+        assert state.take() is None  # still lit from the second flash
+        clock.advance_to(250 * NS_PER_MS)
+        assert state.take() == FrameUpdate(flash=False)
+
+    def test_only_newest_result_is_drawn(self):
+        state, _ = make_state()
+        state.set_result("Bad", "#cc0000")
+        state.set_result("Perfect", "#228b22")
+        assert state.take() == FrameUpdate(result=("Perfect", "#228b22"))
+        assert state.take() is None
+
+    def test_repeated_result_is_a_new_result(self):
+        # Two shots in a row can classify the same; both are drawn.
+        state, _ = make_state()
+        state.set_result("Perfect", "#228b22")
+        assert state.take() == FrameUpdate(result=("Perfect", "#228b22"))
+        state.set_result("Perfect", "#228b22")
+        assert state.take() == FrameUpdate(result=("Perfect", "#228b22"))
+
+    def test_debug_lines_are_batched(self):
+        state, _ = make_state()
+        state.log_debug("one")
+        state.log_debug("two")
+        assert state.take().debug_lines == ("one", "two")
+        assert state.take() is None
+
+    def test_visibility_toggles_pair_off(self):
+        state, _ = make_state()
+        state.toggle_visibility()
+        state.toggle_visibility()
+        assert state.take() is None
+        state.toggle_visibility()
+        assert state.take() == FrameUpdate(toggle_visibility=True)
+
+    def test_resize_steps_accumulate(self):
+        state, _ = make_state()
+        state.resize(1)
+        state.resize(1)
+        state.resize(-1)
+        assert state.take() == FrameUpdate(font_step=1)
+
+    def test_terminate(self):
+        state, _ = make_state()
+        state.terminate()
+        assert state.take().terminate
+
+    def test_concurrent_debug_lines_are_not_lost(self):
+        state = RenderState(clock=VirtualClock(), debug_tail=4000)
+
+        def produce(tag):
+            for i in range(2000):
+                state.log_debug(f"{tag}{i}")
+
+        threads = [threading.Thread(target=produce, args=(tag,)) for tag in "ab"]
+        for t in threads:
+            t.start()
+        seen = []
+        while any(t.is_alive() for t in threads):
+            update = state.take()
+            if update is not None:
+                seen.extend(update.debug_lines)
+        for t in threads:
+            t.join()
+        update = state.take()
+        if update is not None:
+            seen.extend(update.debug_lines)
+        assert len(seen) == 4000
+
+    def test_hidden_overlay_wakes_only_for_show_or_terminate(self):
+        state, _ = make_state()
+        state.toggle_visibility()
+        state.take()  # hidden now
+        state.set_result("Bad", "#cc0000")
+        state.set_left_key_held(True)
+        assert not state.wake_pending()
+        state.toggle_visibility()
+        assert state.wake_pending()
+        state.toggle_visibility()
+        assert not state.wake_pending()
+        state.terminate()
+        assert state.wake_pending()
+
+    def test_catch_up_after_hidden_is_latest_state(self):
+        state = RenderState(clock=VirtualClock(), debug_tail=3)
+        for i in range(100):
+            state.set_result(f"r{i}", "#cc0000")
+            state.set_right_key_held(i % 2 == 0)
+            state.log_debug(f"line {i}")
+        state.toggle_visibility()
+        update = state.take()
+        assert update.result == ("r99", "#cc0000")
+        assert update.right_held is None  # ended released, as last drawn
+        assert update.debug_lines == ("line 97", "line 98", "line 99")
+        assert update.toggle_visibility
+
+    def test_debug_entries_pass_through_unformatted(self):
+        state, _ = make_state()
+        entry = (1.5, "[KEY PRESS] A")
+        state.log_debug(entry)
+        assert state.take().debug_lines == (entry,)
@@ -0,0 +1,143 @@
+"""
+Tests for replay — trace files, accelerated replay and recording checks.
+"""
+
+import json
+
+import pytest
+from classifier import CLASSIFIERS
+from classifier.events import EVENT_PRESS, EVENT_RELEASE, EVENT_SHOT
+from classifier.key_codes import KEY_LEFT, KEY_NONE, KEY_RIGHT, KEY_SHIFT
+from clock import NS_PER_MS, VirtualClock
+from event_pipeline import ClassifierSink
+from headless_overlay import HeadlessOverlay
+from render_state import FLASH_MS
+from replay import (
+    Trace,
+    classify_trace,
+    compare_with_recording,
+    load_trace,
+    replay_paced,
+    write_trace,
+)
+from session_log import SessionRecorder
+
+EVENTS = [
+    (EVENT_PRESS, KEY_LEFT, 0),
+    (EVENT_RELEASE, KEY_LEFT, 100),
+    (EVENT_PRESS, KEY_RIGHT, 120),
+    (EVENT_SHOT, KEY_NONE, 220),
+    (EVENT_PRESS, KEY_SHIFT, 300),
+    (EVENT_RELEASE, KEY_RIGHT, 310),
+    (EVENT_PRESS, KEY_LEFT, 330),
+    (EVENT_SHOT, KEY_NONE, 400),
+]
+
+
+def _per_event(mc, sf, events):
+    results = []
+    for kind, key, t in events:
+        if kind == EVENT_PRESS:
+            mc.on_press(key, t)
+        elif kind == EVENT_RELEASE:
+            mc.on_release(key, t)
+        else:
+            results.append(sf.apply(mc.classify_shot(t)).to_display_string())
+    return results
+
+
+class TestVirtualClock:
+    def test_only_moves_forward(self):
+        clock = VirtualClock(10)
+        clock.advance_to(50)
+        clock.advance_to(20)
+        assert clock.now_ns() == 50
+
+
+class TestTraceFiles:
+    def test_jsonl_round_trip(self, tmp_path):
+        path = str(tmp_path / "trace.jsonl")
+        write_trace(path, Trace(EVENTS, 1))
+        assert load_trace(path) == Trace(EVENTS, 1)
+
+    def test_jsonl_uses_key_roles(self, tmp_path):
+        path = str(tmp_path / "trace.jsonl")
+        write_trace(path, Trace(EVENTS[:1], 1))
+        lines = [json.loads(line) for line in open(path, encoding="utf-8")]
+        assert lines[1] == {"t": 0, "event": "press", "key": "left"}
+
+    def test_header_is_optional(self, tmp_path):
+        path = tmp_path / "trace.jsonl"
+        path.write_text('{"t": 5, "event": "shot"}\n\n')
+        trace = load_trace(str(path))
+        assert trace.events == [(EVENT_SHOT, KEY_NONE, 5)]
+        assert trace.ticks_per_ms == 1_000_000
+
+    def test_bad_event_names_line(self, tmp_path):
+        path = tmp_path / "trace.jsonl"
+        path.write_text('{"t": 5, "event": "press", "key": "jump"}\n')
+        with pytest.raises(ValueError, match="trace.jsonl:1"):
+            load_trace(str(path))
+
+    def test_loads_binary_session(self, tmp_path):
+        path = str(tmp_path / "session.bin")
+        with SessionRecorder(path, ticks_per_ms=1) as recorder:
+            for kind, key, t in EVENTS:
+                recorder.record_event(kind, key, t)
+        assert load_trace(path) == Trace(EVENTS, 1)
+
+
+@pytest.mark.parametrize("name", list(CLASSIFIERS))
+class TestReplay:
+    def test_classify_trace_matches_per_event_path(self, name):
+        mc_cls, sf_cls = CLASSIFIERS[name]
+        results = classify_trace(Trace(EVENTS, 1), mc_cls(ticks_per_ms=1), sf_cls())
+        assert [r.to_display_string() for r in results] == _per_event(mc_cls(), sf_cls(), EVENTS)
+
+    def test_paced_replay_advances_clock(self, name):
+        clock = VirtualClock()
+        seen = []
+
+        def handler(kind, key, t):
+            seen.append((kind, key, t, clock.now_ns()))
+
+        replay_paced(Trace(EVENTS, 1), handler, clock, speed=1000.0)
+        assert [s[:3] for s in seen] == EVENTS
+        assert all(s[2] * NS_PER_MS == s[3] for s in seen)
+
+    def test_paced_replay_drives_overlay_flash(self, name):
+        mc_cls, sf_cls = CLASSIFIERS[name]
+        clock = VirtualClock()
+        overlay = HeadlessOverlay(clock=clock)
+        sink = ClassifierSink(overlay, mc_cls(ticks_per_ms=1), sf_cls())
+        flashing = []
+
+        def handler(kind, key, t):
+            sink.handle(kind, key, t)
+            flashing.append(overlay._state.take().flash if kind == EVENT_SHOT else None)
+
+        shot_ms = EVENTS[3][2]
+        replay_paced(Trace(EVENTS[:4] + [(EVENT_PRESS, KEY_SHIFT, shot_ms + FLASH_MS)], 1), handler, clock, 1000.0)
+        # On at the shot, off once replayed time passes the flash.
+        assert flashing[3] is True
+        assert overlay._state.take().flash is False
+
+    def test_check_against_recording(self, tmp_path, name):
+        mc_cls, sf_cls = CLASSIFIERS[name]
+        path = str(tmp_path / "session.bin")
+        mc, sf = mc_cls(ticks_per_ms=1), sf_cls()
+        with SessionRecorder(path, ticks_per_ms=1) as recorder:
+            for kind, key, t in EVENTS:
+                recorder.record_event(kind, key, t)
+                if kind == EVENT_PRESS:
+                    mc.on_press(key, t)
+                elif kind == EVENT_RELEASE:
+                    mc.on_release(key, t)
+                else:
+                    # The live low-confidence flag must not count as a mismatch.
+                    recorder.record_shot(t, sf.apply(mc.classify_shot(t)), low_confidence=True)
+
+        trace = load_trace(path)
+        results = classify_trace(trace, mc_cls(ticks_per_ms=1), sf_cls())
+        assert compare_with_recording(path, trace, results) == []
+        assert compare_with_recording(path, trace, results[:1]) == [1]
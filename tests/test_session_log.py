@@ -0,0 +1,127 @@
+"""
+Tests for session_log — mmap-backed event and shot logs.
+"""
+
+import struct
+
+import pytest
+from classifier import PPMovementClassifier, PPShotFilter
+from classifier.events import EVENT_PRESS, EVENT_RELEASE, EVENT_SHOT
+from classifier.key_codes import KEY_LEFT, KEY_NONE, KEY_RIGHT
+from classifier.labels import ShotLabel
+from session_log import (
+    EVENT_RECORD,
+    HEADER,
+    STREAM_EVENTS,
+    LogReader,
+    LogWriter,
+    SessionRecorder,
+    read_events,
+    read_shots,
+    shots_path,
+)
+
+
+class TestLogWriter:
+    def test_round_trip_across_chunk_growth(self, tmp_path):
+        path = str(tmp_path / "events.bin")
+        writer = LogWriter(path, STREAM_EVENTS, chunk_records=4)
+        events = [(EVENT_PRESS, i % 4, i * 10) for i in range(25)]
+        for kind, key, t in events:
+            writer.append(t, kind, key)
+        writer.close()
+        assert read_events(path) == events
+
+    def test_close_trims_preallocated_tail(self, tmp_path):
+        path = tmp_path / "events.bin"
+        writer = LogWriter(str(path), STREAM_EVENTS)
+        writer.append(5, EVENT_SHOT, KEY_NONE)
+        writer.close()
+        assert path.stat().st_size == HEADER.size + EVENT_RECORD.size
+
+    def test_unclosed_log_reads_committed_records(self, tmp_path):
+        path = str(tmp_path / "events.bin")
+        writer = LogWriter(path, STREAM_EVENTS)
+        writer.append(1, EVENT_PRESS, KEY_LEFT)
+        writer.append(2, EVENT_RELEASE, KEY_LEFT)
+        writer._map.flush()
+        with LogReader(path) as reader:
+            assert len(reader) == 2
+            assert [r for r in reader.records()] == [(1, EVENT_PRESS, KEY_LEFT), (2, EVENT_RELEASE, KEY_LEFT)]
+        writer.close()
+
+    def test_header(self, tmp_path):
+        path = str(tmp_path / "events.bin")
+        LogWriter(path, STREAM_EVENTS, ticks_per_ms=1000).close()
+        with LogReader(path) as reader:
+            assert reader.stream == STREAM_EVENTS
+            assert reader.ticks_per_ms == 1000
+            assert len(reader) == 0
+
+
+class TestLogReaderErrors:
+    def test_rejects_foreign_file(self, tmp_path):
+        path = tmp_path / "other.bin"
+        path.write_bytes(b"x" * 64)
+        with pytest.raises(ValueError):
+            LogReader(str(path))
+
+    def test_rejects_short_file(self, tmp_path):
+        path = tmp_path / "short.bin"
+        path.write_bytes(b"CS")
+        with pytest.raises(ValueError):
+            LogReader(str(path))
+
+    def test_rejects_future_version(self, tmp_path):
+        path = tmp_path / "events.bin"
+        LogWriter(str(path), STREAM_EVENTS).close()
+        data = bytearray(path.read_bytes())
+        struct.pack_into("<H", data, 8, 99)
+        path.write_bytes(bytes(data))
+        with pytest.raises(ValueError):
+            LogReader(str(path))
+
+    def test_read_shots_rejects_event_log(self, tmp_path):
+        path = str(tmp_path / "events.bin")
+        LogWriter(path, STREAM_EVENTS).close()
+        with pytest.raises(ValueError):
+            read_shots(path)
+
+
+class TestSessionRecorder:
+    def test_records_events_and_shot_results(self, tmp_path):
+        path = str(tmp_path / "session.bin")
+        mc = PPMovementClassifier()
+        sf = PPShotFilter()
+        events = [
+            (EVENT_PRESS, KEY_LEFT, 0),
+            (EVENT_RELEASE, KEY_LEFT, 100),
+            (EVENT_PRESS, KEY_RIGHT, 120),
+            (EVENT_SHOT, None, 220),
+        ]
+        with SessionRecorder(path, ticks_per_ms=1) as recorder:
+            for kind, key, t in events:
+                recorder.record_event(kind, key, t)
+                if kind == EVENT_PRESS:
+                    mc.on_press(key, t)
+                elif kind == EVENT_RELEASE:
+                    mc.on_release(key, t)
+                else:
+                    recorder.record_shot(t, sf.apply(mc.classify_shot(t)))
+
+        assert read_events(path) == [(k, KEY_NONE if key is None else key, t) for k, key, t in events]
+        assert read_shots(shots_path(path)) == [
+            (220, ShotLabel.PERFECT, 0, 0, 20.0, 100.0, None)
+        ]
+
+    def test_records_after_close_are_dropped(self, tmp_path):
+        # main() closes the recorder while the consumer may still be draining.
+        path = str(tmp_path / "session.bin")
+        recorder = SessionRecorder(path, ticks_per_ms=1)
+        recorder.record_event(EVENT_PRESS, KEY_LEFT, 0)
+        recorder.close()
+        recorder.record_event(EVENT_RELEASE, KEY_LEFT, 100)
+        recorder.record_shot(120, PPMovementClassifier().classify_shot(120))
+        recorder.close()
+        assert read_events(path) == [(EVENT_PRESS, KEY_LEFT, 0)]
+        assert read_shots(shots_path(path)) == []
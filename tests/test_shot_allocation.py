@@ -0,0 +1,139 @@
+"""
+Tests for reusable ShotClassification results and the interned label enums.
+
+The allocation test drives each classifier through many shots with
+preallocated result objects and checks with tracemalloc that a block of
+steady-state shots -- key events, ``classify_shot(t, out)`` and
+``apply(result, out)`` -- raises peak traced memory no higher than the same
+loop with no shots in it, so nothing is allocated even transiently.  Ticks
+are milliseconds and every duration stays inside CPython's small-int cache:
+at nanosecond ticks each duration is a new int (ints have no free list),
+the one allocation per shot the classifier cannot avoid.
+"""
+
+import tracemalloc
+
+import pytest
+from classifier import (
+    CS2KitchenMovementClassifier,
+    CS2KitchenShotFilter,
+    PPMovementClassifier,
+    PPShotFilter,
+    ShotClassification,
+    ShotLabel,
+    SubLabel,
+)
+from classifier.key_codes import KEY_LEFT, KEY_RIGHT
+from classifier.labels import label_id, sub_label_id
+from classifier.ppClassifier.shot_classification import ShotClassification as PPShotClassification
+
+
+def _shot_times(start, count):
+    """
+    Timestamps for ``count`` counter-strafes left→right, then a shot, from tick
+    ``start``; built up front so the loop itself does no int arithmetic.
+    """
+    return [(t, t + 100, t + 120, t + 200, t + 250) for t in range(start, start + 300 * count, 300)]
+
+
+def _run_shots(mc, sf, base, final, times):
+    press, release, classify, apply = mc.on_press, mc.on_release, mc.classify_shot, sf.apply
+    for press_a, release_a, press_d, shot, release_d in times:
+        press(KEY_LEFT, press_a)
+        release(KEY_LEFT, release_a)
+        press(KEY_RIGHT, press_d)
+        apply(classify(shot, base), final)
+        release(KEY_RIGHT, release_d)
+
+
+def _transient_bytes(run):
+    """How far ``run()`` raises peak traced memory above where it started."""
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        start, _ = tracemalloc.get_traced_memory()
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak - start
+
+
+@pytest.mark.parametrize(
+    "mc_cls, sf_cls, result_cls",
+    [
+        (CS2KitchenMovementClassifier, CS2KitchenShotFilter, ShotClassification),
+        (PPMovementClassifier, PPShotFilter, PPShotClassification),
+    ],
+)
+def test_steady_state_shot_allocates_nothing(mc_cls, sf_cls, result_cls):
+    mc = mc_cls()
+    sf = sf_cls()
+    base = result_cls(ShotLabel.NOT_DETECTED)
+    final = result_cls(ShotLabel.NOT_DETECTED)
+    warm_up = _shot_times(1000, 50)
+    shots = _shot_times(warm_up[-1][0] + 300, 500)
+    no_shots = []
+    _run_shots(mc, sf, base, final, warm_up)
+
+    harness = _transient_bytes(lambda: _run_shots(mc, sf, base, final, no_shots))
+    allocated = _transient_bytes(lambda: _run_shots(mc, sf, base, final, shots)) - harness
+
+    assert allocated == 0
+    assert final.label_id in (ShotLabel.COUNTER_STRAFE, ShotLabel.PERFECT)
+    assert final.cs_time is not None and final.shot_delay is not None
+
+
+class TestResultReuse:
+    def test_cs2k_classify_shot_fills_out(self):
+        mc = CS2KitchenMovementClassifier()
+        out = ShotClassification("Bad")
+        mc.on_press("A", 0)
+        mc.on_release("A", 100)
+        mc.on_press("D", 120)
+        result = mc.classify_shot(200, out)
+        assert result is out
+        assert out.label == "Counter-strafe"
+        assert out.cs_time == pytest.approx(20)
+
+    def test_pp_not_detected_fills_out(self):
+        mc = PPMovementClassifier()
+        out = PPShotClassification("Perfect", cs_time=10, shot_delay=100)
+        result = mc.classify_shot(1000, out)
+        assert result is out
+        assert out.label == "Not detected"
+        assert out.cs_time is None and out.shot_delay is None
+
+    def test_pp_filter_can_write_over_raw(self):
+        raw = PPShotClassification("Counter-strafe", cs_time=20, shot_delay=150)
+        result = PPShotFilter().apply(raw, raw)
+        assert result is raw
+        assert raw.label == "Perfect"
+        assert raw.shot_delay == 150
+
+    def test_fill_clears_previous_fields(self):
+        r = PPShotClassification("Bad", overlap_time=40, sub_label="Overlapping movement", shift_held=True)
+        r.fill(ShotLabel.GOOD, cs_time=10, shot_delay=350)
+        assert r.label == "Good"
+        assert r.overlap_time is None
+        assert r.sub_label is None
+        assert r.shift_held is False
+
+    def test_results_have_no_instance_dict(self):
+        assert not hasattr(ShotClassification("Bad"), "__dict__")
+        assert not hasattr(PPShotClassification("Bad"), "__dict__")
+
+
+class TestLabels:
+    def test_names_round_trip(self):
+        for label in ShotLabel:
+            assert label_id(ShotClassification(label).label) == label
+
+    def test_unknown_name_maps_to_unknown(self):
+        assert ShotClassification("Mystery").label_id == ShotLabel.UNKNOWN
+
+    def test_sub_label_names(self):
+        assert sub_label_id(None) == SubLabel.NONE
+        assert sub_label_id("Holding Ctrl") == SubLabel.HOLDING_CTRL
+        with pytest.raises(ValueError):
+            sub_label_id("Holding Alt")
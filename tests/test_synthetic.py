@@ -0,0 +1,123 @@
+"""
+Tests for synthetic — seeded session generation, packing and layouts.
+"""
+
+import pytest
+from classifier import CLASSIFIERS
+from classifier.events import EVENT_PRESS, EVENT_RELEASE, EVENT_SHOT, pack_events
+from classifier.key_codes import KEY_CTRL, KEY_LEFT, KEY_NONE, KEY_RIGHT, KEY_SHIFT
+from classifier.labels import ShotLabel
+from synthetic import (
+    AUTOREPEAT_INTERVAL_MS,
+    DEFAULT_MODEL,
+    LAYOUTS,
+    SCENARIOS,
+    generate,
+    generate_packed,
+    named_events,
+    pack,
+)
+
+
+def _held_keys_are_consistent(events) -> bool:
+    held = set()
+    for kind, key, _ in events:
+        if kind == EVENT_PRESS:
+            held.add(key)
+        elif kind == EVENT_RELEASE:
+            if key not in held:
+                return False
+            held.discard(key)
+    return True
+
+
+class TestGenerate:
+    def test_same_seed_same_stream(self):
+        assert list(generate(5000, seed=7)) == list(generate(5000, seed=7))
+        assert list(generate(5000, seed=7)) != list(generate(5000, seed=8))
+
+    def test_count_and_prefix(self):
+        events = list(generate(1000, seed=1))
+        assert len(events) == 1000
+        assert list(generate(400, seed=1)) == events[:400]
+
+    @pytest.mark.parametrize("scenario", sorted(SCENARIOS))
+    def test_timestamps_strictly_increase(self, scenario):
+        times = [t for _, _, t in generate(20_000, seed=scenario, model=SCENARIOS[scenario])]
+        assert all(a < b for a, b in zip(times, times[1:]))
+
+    @pytest.mark.parametrize("scenario", sorted(SCENARIOS))
+    def test_releases_follow_presses(self, scenario):
+        assert _held_keys_are_consistent(generate(20_000, seed=3, model=SCENARIOS[scenario]))
+
+    def test_shots_carry_no_key(self):
+        for kind, key, _ in generate(5000, seed=2):
+            assert (kind == EVENT_SHOT) == (key == KEY_NONE)
+
+    def test_ticks_per_ms_scales_timestamps(self):
+        ms = [t for _, _, t in generate(2000, seed=4)]
+        ticks = [t for _, _, t in generate(2000, seed=4, ticks_per_ms=1000)]
+        assert all(abs(tick / 1000 - m) <= 1 for m, tick in zip(ms, ticks))
+
+    def test_mixed_session_covers_every_key(self):
+        keys = {key for _, key, _ in generate(50_000, seed=5)}
+        assert keys == {0, 1, 2, 3, KEY_SHIFT, KEY_CTRL, KEY_NONE}
+
+    def test_single_pattern_scenarios(self):
+        assert {key for _, key, _ in generate(5000, seed=6, model=SCENARIOS["idle"])} <= {
+            KEY_NONE, KEY_SHIFT, KEY_CTRL,
+        }
+        clean = SCENARIOS["clean"]._replace(vertical=0.0)
+        assert {key for _, key, _ in generate(5000, seed=6, model=clean)} == {KEY_LEFT, KEY_RIGHT, KEY_NONE}
+
+    def test_autorepeat_repeats_long_holds(self):
+        model = DEFAULT_MODEL._replace(autorepeat=True, hold=DEFAULT_MODEL.hold._replace(median=1500.0, sigma=0.0))
+        events = list(generate(5000, seed=9, model=model))
+        assert _held_keys_are_consistent(events)
+        held = set()
+        repeats = []
+        for kind, key, t in events:
+            if kind == EVENT_PRESS and key in held:
+                repeats.append(t)
+            elif kind == EVENT_PRESS:
+                held.add(key)
+            elif kind == EVENT_RELEASE:
+                held.discard(key)
+        assert repeats
+        assert min(b - a for a, b in zip(repeats, repeats[1:])) <= AUTOREPEAT_INTERVAL_MS + 1
+
+    def test_counter_strafes_classify_as_counter_strafes(self):
+        mc_cls, _ = CLASSIFIERS["cs2kitchen"]
+        mc = mc_cls()
+        labels = set()
+        for kind, key, t in generate(5000, seed=10, model=SCENARIOS["clean"]):
+            if kind == EVENT_PRESS:
+                mc.on_press(key, t)
+            elif kind == EVENT_RELEASE:
+                mc.on_release(key, t)
+            else:
+                labels.add(mc.classify_shot(t).label_id)
+        assert ShotLabel.NOT_DETECTED not in labels
+
+
+class TestPacked:
+    def test_packed_matches_stream(self):
+        assert pack(3000, seed=11) == pack_events(generate(3000, seed=11))
+
+    def test_chunks_concatenate_to_the_stream(self):
+        chunks = list(generate_packed(2500, seed=12, chunk_events=1000))
+        assert [len(c) for c in chunks] == [3000, 3000, 1500]
+        assert sum(chunks[1:], chunks[0]) == pack(2500, seed=12)
+
+
+class TestNamedEvents:
+    @pytest.mark.parametrize("layout", sorted(LAYOUTS))
+    def test_layout_names(self, layout):
+        forward, backward, left, right = LAYOUTS[layout]
+        named = list(named_events(generate(5000, seed=13), layout))
+        names = {key for _, key, _ in named}
+        assert names == {forward, backward, left, right, "SHIFT", "CTRL", None}
+
+    def test_custom_layout(self):
+        named = named_events(generate(1000, seed=14), ("UP", "DOWN", "LEFT", "RIGHT"))
+        assert {key for _, key, _ in named} >= {"LEFT", "RIGHT"}
@@ -0,0 +1,73 @@
+"""
+Tests for classifier.trace — structured debug events and their rendering.
+"""
+
+import pytest
+from classifier import CLASSIFIERS, DebugLogger
+from classifier.key_codes import KEY_LEFT, KEY_NONE, KEY_RIGHT, KEY_SHIFT
+from classifier.trace import (
+    TRACE_AXIS_H,
+    TRACE_KEY_PRESS,
+    TRACE_MODIFIERS,
+    TRACE_SHOT,
+    TRACE_SHOT_IDLE,
+    TraceEvent,
+)
+
+
+def _traced(name, ticks_per_ms=1):
+    events = []
+    mc = CLASSIFIERS[name][0](debug_logger=DebugLogger(events.append), ticks_per_ms=ticks_per_ms)
+    return mc, events
+
+
+@pytest.mark.parametrize("name", list(CLASSIFIERS))
+class TestClassifierTrace:
+    def test_events_are_raw_records(self, name):
+        mc, events = _traced(name, ticks_per_ms=1_000_000)
+        mc.on_press(KEY_LEFT, 5_000_000)
+        (event,) = events
+        assert isinstance(event, TraceEvent)
+        assert event[:4] == (TRACE_KEY_PRESS, KEY_LEFT, 5_000_000, None)
+        assert str(event) == "[KEY PRESS] A @ 5 ms"
+
+    def test_counter_strafe_shot(self, name):
+        mc, events = _traced(name)
+        mc.on_press(KEY_LEFT, 0)
+        mc.on_release(KEY_LEFT, 300)
+        mc.on_press(KEY_RIGHT, 320)
+        mc.classify_shot(400)
+        axis = next(e for e in events if e.event == TRACE_AXIS_H)
+        assert axis.data == ("Counter-strafe", 20.0, 80.0)
+        assert str(axis) == "[AXIS:H] Counter-strafe | CS: 20 ms | Delay: 80 ms"
+        assert events[-1].event == TRACE_SHOT
+        assert str(events[-1]).startswith("[SHOT] → ")
+
+
+class TestPPTrace:
+    def test_idle_shot(self):
+        mc, events = _traced("pp")
+        mc.classify_shot(100)
+        mc.on_press(KEY_LEFT, 200)
+        mc.classify_shot(900)
+        idle = [e for e in events if e.event == TRACE_SHOT_IDLE]
+        assert [str(e) for e in idle] == [
+            "[SHOT] → Not detected (last move: never)",
+            "[SHOT] → Not detected (last move: 700 ms ago)",
+        ]
+
+    def test_modifiers(self):
+        mc, events = _traced("pp")
+        mc.on_press(KEY_SHIFT, 0)
+        mc.on_press(KEY_LEFT, 10)
+        mc.classify_shot(50)
+        (mods,) = [e for e in events if e.event == TRACE_MODIFIERS]
+        assert mods.key == KEY_NONE
+        assert mods.data == (True, False)
+        assert str(mods) == "[MOD] SHIFT"
+
+
+def test_plain_messages_pass_through():
+    lines = []
+    DebugLogger(lines.append).log("hello")
+    assert lines == ["hello"]
@@ -0,0 +1,92 @@
+"""
+Tests for watchdog — stall detection and low-confidence shot flagging.
+"""
+
+from classifier import CLASSIFIERS
+from classifier.events import EVENT_PRESS, EVENT_RELEASE, EVENT_SHOT
+from classifier.key_codes import KEY_LEFT, KEY_RIGHT
+from clock import NS_PER_MS, VirtualClock
+from event_pipeline import ClassifierSink
+from session_log import SHOT_LOW_CONFIDENCE, SessionRecorder, read_shots, shots_path
+from watchdog import HOOK_CLICK, HOOK_KEY_PRESS, TK_TICK, StallWatchdog, timing_window_ns
+
+MS = NS_PER_MS
+
+
+def make_watchdog(**kwargs):
+    clock = VirtualClock()
+    lines = []
+    return StallWatchdog(clock.now_ns, log=lines.append, **kwargs), clock, lines
+
+
+class TestStallWatchdog:
+    def test_fast_hook_is_not_a_stall(self):
+        watchdog, clock, lines = make_watchdog(hook_threshold_ms=5)
+        clock.advance_to(4 * MS)
+        watchdog.hook_returned(HOOK_KEY_PRESS, 0)
+        assert watchdog.counts[HOOK_KEY_PRESS] == 0
+        assert lines == []
+
+    def test_slow_hook_is_counted_and_logged(self):
+        watchdog, clock, lines = make_watchdog(hook_threshold_ms=5)
+        clock.advance_to(17 * MS)
+        watchdog.hook_returned(HOOK_CLICK, 2 * MS)
+        assert watchdog.counts[HOOK_CLICK] == 1
+        assert watchdog.worst_ns[HOOK_CLICK] == 15 * MS
+        assert lines == ["[STALL] click hook: 15.0 ms"]
+
+    def test_late_tick(self):
+        watchdog, _, _ = make_watchdog(tick_threshold_ms=20)
+        watchdog.tick_ran(100 * MS, 110 * MS)
+        watchdog.tick_ran(200 * MS, 230 * MS)
+        assert watchdog.counts[TK_TICK] == 1
+        assert watchdog.overlaps(190 * MS, 205 * MS)
+        assert not watchdog.overlaps(100 * MS, 199 * MS)
+
+    def test_recent_stalls_are_bounded(self):
+        watchdog, _, _ = make_watchdog(tick_threshold_ms=1)
+        for i in range(1000):
+            watchdog.tick_ran(i * 100 * MS, i * 100 * MS + 2 * MS)
+        assert watchdog.counts[TK_TICK] == 1000
+        assert watchdog.overlaps(99_900 * MS, 99_901 * MS)
+        assert not watchdog.overlaps(0, 1 * MS)
+
+
+def test_timing_window_of_counter_strafe():
+    mc_cls, sf_cls = CLASSIFIERS["cs2kitchen"]
+    mc = mc_cls(ticks_per_ms=MS)
+    mc.on_press(KEY_LEFT, 0)
+    mc.on_release(KEY_LEFT, 300 * MS)
+    mc.on_press(KEY_RIGHT, 320 * MS)
+    result = sf_cls().apply(mc.classify_shot(400 * MS))
+    assert timing_window_ns(result, 400 * MS) == (300 * MS, 400 * MS)
+
+
+def test_sink_flags_shots_timed_across_a_stall(tmp_path, overlay):
+    watchdog, _, _ = make_watchdog(flag_shots=True, tick_threshold_ms=20)
+    watchdog.tick_ran(305 * MS, 340 * MS)  # the Tk thread stalled mid counter-strafe
+    path = str(tmp_path / "session.bin")
+    mc_cls, sf_cls = CLASSIFIERS["pp"]
+    with SessionRecorder(path, ticks_per_ms=MS) as recorder:
+        sink = ClassifierSink(overlay, mc_cls(ticks_per_ms=MS), sf_cls(), recorder, watchdog=watchdog)
+        for kind, key, t in (
+            (EVENT_PRESS, KEY_LEFT, 0),
+            (EVENT_RELEASE, KEY_LEFT, 300),
+            (EVENT_PRESS, KEY_RIGHT, 320),
+            (EVENT_SHOT, None, 400),
+            (EVENT_SHOT, None, 2000),
+        ):
+            sink.handle(kind, key, t * MS)
+    assert overlay.low_confidence == [True, False]
+    flags = [shot[3] for shot in read_shots(shots_path(path))]
+    assert flags[0] & SHOT_LOW_CONFIDENCE
+    assert not flags[1] & SHOT_LOW_CONFIDENCE
+
+
+def test_watchdog_without_flagging_leaves_shots_alone(overlay):
+    watchdog, _, _ = make_watchdog(tick_threshold_ms=1)
+    watchdog.tick_ran(0, 1000 * MS)
+    mc_cls, sf_cls = CLASSIFIERS["pp"]
+    sink = ClassifierSink(overlay, mc_cls(ticks_per_ms=MS), sf_cls(), watchdog=watchdog)
+    sink.handle(EVENT_SHOT, None, 500 * MS)
+    assert overlay.low_confidence == [False]